@@ -0,0 +1,427 @@
+"""
+Streaming Anomaly Ingestion — Cybersecurity Domain
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Runs AnomalyParser + SignatureGenerator continuously over a Falco/network log
+instead of over a prebuilt list of anomalies:
+
+    tail file / stdin → batches of lines → parsed Anomaly objects
+        → clusters keyed by features, bounded by a time window
+        → SignatureGenerator as soon as a cluster reaches min_support
+
+Memory stays bounded however long the stream runs: at most max_clusters open
+clusters, each holding at most min_support anomalies, and clusters older
+than window_seconds (event time) are dropped.
+
+Run:
+    python algorithms/anomaly_stream.py /var/log/falco/events.log --follow
+    tail -F falco.log | python algorithms/anomaly_stream.py - --min-support 5
+
+SELF-CORRECTION BLOCK:
+    What Could Break:
+      1. Log lines without timestamps — window falls back to ingestion time
+      2. Log rotated/truncated while tailing — file is reopened from the start
+      3. Too many distinct feature keys — oldest clusters evicted (clusters_evicted)
+      4. Slow stdin stream — read_stream polls with select and yields idle
+         markers, and batched flushes after max_latency, so signatures are
+         not held back until batch_size lines arrive
+      5. Followed file not created yet — follow waits for it to appear
+    How to Test:
+      pytest tests/test_anomaly_stream.py -v
+"""
+
+import codecs
+import json
+import os
+import re
+import select
+import sys
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Generator, Hashable, Iterable, Iterator, Optional, TextIO
+
+try:
+    from algorithms.anomaly_to_signature import (
+        Anomaly, AnomalyParser, Signature, SignatureDatabase, SignatureGenerator
+    )
+except ImportError:  # run as a script: python algorithms/anomaly_stream.py
+    from anomaly_to_signature import (
+        Anomaly, AnomalyParser, Signature, SignatureDatabase, SignatureGenerator
+    )
+
+
+TIMESTAMP_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2}(?:\.\d+)?)")
+FALCO_PRIORITY_SEVERITY = {
+    "emergency": 1.0, "alert": 0.95, "critical": 0.9, "error": 0.8,
+    "warning": 0.6, "notice": 0.4, "informational": 0.2, "debug": 0.1,
+}
+
+
+# ─── Line sources ────────────────────────────────────────────────────────────
+
+def _open_when_present(
+    path: Path, poll_interval: float, stop: threading.Event
+) -> Generator[None, None, Optional[TextIO]]:
+    """Open path, yielding idle markers while it does not exist; returns None if stopped first."""
+    while not stop.is_set():
+        try:
+            return open(path, errors="replace")
+        except FileNotFoundError:
+            yield None
+            stop.wait(poll_interval)
+    return None
+
+
+def follow(
+    path: Path,
+    poll_interval: float = 0.5,
+    from_end: bool = False,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[Optional[str]]:
+    """
+    Yield lines appended to a file, like `tail -F`, until stop is set.
+
+    Yields None whenever no new data arrived during a poll so consumers can
+    flush partial batches. A file that does not exist yet is waited for; a
+    rotated (new inode) or truncated file is reopened from the start.
+    """
+    stop = stop or threading.Event()
+    f = yield from _open_when_present(path, poll_interval, stop)
+    if f is None:
+        return
+    try:
+        if from_end:
+            f.seek(0, os.SEEK_END)
+        inode = os.fstat(f.fileno()).st_ino
+        partial = ""
+        while not stop.is_set():
+            line = f.readline()
+            if line.endswith("\n"):
+                yield partial + line[:-1]
+                partial = ""
+                continue
+            partial += line  # incomplete last line: wait for the rest
+
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+            if stat is not None and (stat.st_ino != inode or stat.st_size < f.tell()):
+                f.close()
+                f = yield from _open_when_present(path, poll_interval, stop)
+                if f is None:
+                    return
+                inode, partial = os.fstat(f.fileno()).st_ino, ""
+                continue
+            yield None
+            stop.wait(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+def read_stream(
+    stream,
+    poll_interval: float = 0.5,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[Optional[str]]:
+    """
+    Yield lines from a pipe such as stdin until EOF (or until stop is set).
+
+    Yields None whenever no data arrived for poll_interval so consumers can
+    flush partial batches. Streams without a selectable file descriptor
+    (StringIO, Windows consoles) are read with plain blocking iteration.
+    """
+    try:
+        fd = stream.fileno()
+        select.select([fd], [], [], 0)
+    except (AttributeError, OSError, ValueError):
+        for line in stream:
+            yield line.rstrip("\n")
+        return
+
+    stop = stop or threading.Event()
+    encoding = getattr(stream, "encoding", None) or "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    partial = ""
+    while not stop.is_set():
+        ready, _, _ = select.select([fd], [], [], poll_interval)
+        if not ready:
+            yield None
+            continue
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        *lines, partial = (partial + decoder.decode(chunk)).split("\n")
+        yield from lines
+    partial += decoder.decode(b"", final=True)
+    if partial:
+        yield partial
+
+
+def read_lines(source: str, follow_file: bool = False, **follow_options) -> Iterator[Optional[str]]:
+    """Lines from a file path, or from stdin when source is "-"."""
+    if source == "-":
+        yield from read_stream(
+            sys.stdin, follow_options.get("poll_interval", 0.5), follow_options.get("stop")
+        )
+    elif follow_file:
+        yield from follow(Path(source), **follow_options)
+    else:
+        with open(source, errors="replace") as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+
+def batched(
+    lines: Iterable[Optional[str]],
+    batch_size: int,
+    max_latency: Optional[float] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> Iterator[list[str]]:
+    """
+    Group lines into batches; an idle marker (None) flushes a partial batch.
+
+    With max_latency, a partial batch is also flushed once its first line has
+    waited that many seconds, so a steady trickle that never goes idle is not
+    held until batch_size lines arrive (checked whenever a line or marker arrives).
+    """
+    batch: list[str] = []
+    started = 0.0
+    for line in lines:
+        if line is None:
+            if batch:
+                yield batch
+                batch = []
+            continue
+        late = False
+        if max_latency is not None:
+            now = clock()
+            if not batch:
+                started = now
+            late = now - started >= max_latency
+        batch.append(line)
+        if late or len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ─── Clustering ──────────────────────────────────────────────────────────────
+
+def default_cluster_key(anomaly: Anomaly) -> Hashable:
+    """Anomalies with the same source and identifying features share a cluster."""
+    features = anomaly.features
+    if anomaly.source == "network":
+        return ("network", features.get("protocol"), tuple(sorted(set(features.get("ports", [])))))
+    return (
+        anomaly.source,
+        features.get("rule"),
+        tuple(sorted(set(features.get("syscalls", [])))),
+        tuple(sorted(set(features.get("processes", [])))),
+    )
+
+
+@dataclass
+class Cluster:
+    """Anomalies sharing a feature key within one time window."""
+    first_seen: float
+    count: int = 0
+    emitted: bool = False
+    anomalies: list[Anomaly] = field(default_factory=list)
+
+
+class AnomalyStreamPipeline:
+    """
+    Incremental anomaly → signature pipeline over an unbounded stream of log lines.
+
+    Each line is parsed into an Anomaly and added to the cluster for its
+    feature key. When a cluster reaches min_support anomalies inside
+    window_seconds, SignatureGenerator runs on it once and the resulting
+    signatures are yielded (and added to database, if given). A cluster's
+    window starts at its first anomaly; expired clusters are dropped, so a
+    recurring pattern can produce a new signature in a later window.
+    """
+
+    def __init__(
+        self,
+        source: str = "falco",
+        min_support: int = 3,
+        window_seconds: float = 60.0,
+        max_clusters: int = 10000,
+        batch_size: int = 1000,
+        max_latency: Optional[float] = 1.0,
+        confidence_threshold: float = 0.6,
+        key_fn: Callable[[Anomaly], Hashable] = default_cluster_key,
+        database: Optional[SignatureDatabase] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.source = source
+        self.min_support = min_support
+        self.window_seconds = window_seconds
+        self.max_clusters = max_clusters
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.confidence_threshold = confidence_threshold
+        self.key_fn = key_fn
+        self.database = database
+        self.clock = clock
+        self.parser = AnomalyParser()
+        self.generator = SignatureGenerator()
+        # Insertion order == first_seen order, so expiry pops from the front
+        self.clusters: "OrderedDict[Hashable, Cluster]" = OrderedDict()
+        self.stats = {
+            "lines": 0, "anomalies": 0, "skipped": 0, "batches": 0,
+            "clusters_expired": 0, "clusters_evicted": 0, "signatures": 0, "seconds": 0.0,
+        }
+
+    @property
+    def lines_per_sec(self) -> float:
+        return self.stats["lines"] / self.stats["seconds"] if self.stats["seconds"] else 0.0
+
+    # ─── Parsing ──────────────────────────────────────────────────────────
+
+    def parse_line(self, line: str) -> Optional[tuple[Anomaly, float]]:
+        """Parse one log line into (anomaly, event time); None if it has no features."""
+        line, severity = self._unwrap(line)
+        return self._to_anomaly(line, severity, self.parser.parse(line, source=self.source))
+
+    def parse_lines(self, lines: list[str]) -> list[Optional[tuple[Anomaly, float]]]:
+        """parse_line over a batch, extracting features with AnomalyParser.parse_batch."""
+        unwrapped = [self._unwrap(line) for line in lines]
+        features = self.parser.parse_batch([line for line, _ in unwrapped], source=self.source)
+        return [self._to_anomaly(line, severity, f) for (line, severity), f in zip(unwrapped, features)]
+
+    def _unwrap(self, line: str) -> tuple[str, float]:
+        """Flatten Falco JSON output into a text line; return (line, severity)."""
+        severity = 0.5
+        if line.startswith("{"):
+            # Falco JSON output: {"time": ..., "rule": ..., "priority": ..., "output": ...}
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                event = None
+            if isinstance(event, dict):
+                text = event.get("output", "")
+                if event.get("rule"):
+                    text += f" rule={str(event['rule']).replace(' ', '_')}"
+                severity = FALCO_PRIORITY_SEVERITY.get(str(event.get("priority", "")).lower(), severity)
+                line = f"{event.get('time', '')} {text}"
+        return line, severity
+
+    def _to_anomaly(self, line: str, severity: float, features: dict) -> Optional[tuple[Anomaly, float]]:
+        if not any(features.get(k) for k in ("syscalls", "processes", "ports", "ips")):
+            return None
+
+        match = TIMESTAMP_PATTERN.search(line)
+        event_time = None
+        if match:
+            try:
+                event_time = datetime.fromisoformat(f"{match.group(1)}T{match.group(2)[:15]}").timestamp()
+            except ValueError:
+                pass
+        if event_time is None:
+            event_time = self.clock()
+        timestamp = datetime.fromtimestamp(event_time).isoformat()
+
+        anomaly = Anomaly(timestamp=timestamp, source=self.source, raw_log=line, features=features,
+                          severity=severity)
+        return anomaly, event_time
+
+    # ─── Windowed clustering ──────────────────────────────────────────────
+
+    def _expire(self, now: float):
+        while self.clusters:
+            key, cluster = next(iter(self.clusters.items()))
+            if now - cluster.first_seen <= self.window_seconds:
+                break
+            del self.clusters[key]
+            self.stats["clusters_expired"] += 1
+
+    def ingest(self, anomaly: Anomaly, event_time: float) -> list[Signature]:
+        """Add one anomaly; return the signatures its cluster produced, if any."""
+        self._expire(event_time)
+        key = self.key_fn(anomaly)
+        cluster = self.clusters.get(key)
+        if cluster is None:
+            if len(self.clusters) >= self.max_clusters:
+                self.clusters.popitem(last=False)
+                self.stats["clusters_evicted"] += 1
+            cluster = self.clusters[key] = Cluster(first_seen=event_time)
+
+        cluster.count += 1
+        if cluster.emitted:
+            return []
+        cluster.anomalies.append(anomaly)
+        if cluster.count < self.min_support:
+            return []
+
+        signatures = self.generator.generate_from_anomalies(
+            cluster.anomalies, self.min_support, self.confidence_threshold
+        )
+        cluster.emitted = True
+        cluster.anomalies = []  # keep only the count once emitted
+        if self.database is not None:
+            signatures = [s for s in signatures if self.database.add(s)["added"]]
+        self.stats["signatures"] += len(signatures)
+        return signatures
+
+    def process_batch(self, lines: list[str]) -> list[Signature]:
+        """Parse and cluster one batch of lines; return the signatures emitted."""
+        start = time.perf_counter()
+        emitted = []
+        for parsed in self.parse_lines(lines):
+            if parsed is None:
+                self.stats["skipped"] += 1
+                continue
+            self.stats["anomalies"] += 1
+            emitted.extend(self.ingest(*parsed))
+        self.stats["lines"] += len(lines)
+        self.stats["batches"] += 1
+        self.stats["seconds"] += time.perf_counter() - start
+        return emitted
+
+    def process_lines(self, lines: Iterable[Optional[str]]) -> Iterator[Signature]:
+        """Yield signatures as they are emitted from a (possibly endless) line stream."""
+        for batch in batched(lines, self.batch_size, self.max_latency):
+            yield from self.process_batch(batch)
+
+    def run(self, source: str, follow_file: bool = False, **follow_options) -> Iterator[Signature]:
+        """Stream a log file (or "-" for stdin) through the pipeline."""
+        return self.process_lines(read_lines(source, follow_file, **follow_options))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    cli = argparse.ArgumentParser(description="Stream a Falco/network log into signatures")
+    cli.add_argument("log", help="log file path, or - for stdin")
+    cli.add_argument("--follow", action="store_true", help="keep tailing the file for new lines")
+    cli.add_argument("--source", default="falco", choices=["falco", "network", "system"])
+    cli.add_argument("--min-support", type=int, default=3)
+    cli.add_argument("--window", type=float, default=60.0, help="cluster window in seconds")
+    cli.add_argument("--batch-size", type=int, default=1000)
+    cli.add_argument("--max-latency", type=float, default=1.0,
+                     help="seconds a partial batch may wait before it is processed")
+    cli.add_argument("--save", action="store_true", help="add signatures to the SignatureDatabase")
+    args = cli.parse_args()
+
+    pipeline = AnomalyStreamPipeline(
+        source=args.source,
+        min_support=args.min_support,
+        window_seconds=args.window,
+        batch_size=args.batch_size,
+        max_latency=args.max_latency,
+        database=SignatureDatabase() if args.save else None,
+    )
+    try:
+        for signature in pipeline.run(args.log, follow_file=args.follow):
+            print(json.dumps(asdict(signature)), flush=True)
+    except KeyboardInterrupt:
+        pass
+    print(f"{pipeline.stats} — {pipeline.lines_per_sec:,.0f} lines/sec", file=sys.stderr)
@@ -22,13 +22,22 @@ SELF-CORRECTION BLOCK:
 """
 
 import json
+import math
 import re
+import multiprocessing
+import concurrent.futures
+from itertools import chain
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from collections import Counter
 
+try:
+    from algorithms.log_writer import iter_jsonl
+except ImportError:  # run as a script: python algorithms/anomaly_to_signature.py
+    from log_writer import iter_jsonl
+
 
 @dataclass
 class Anomaly:
@@ -61,9 +70,13 @@ class AnomalyParser:
     """Extracts structured features from raw log entries."""
 
     SYSCALL_PATTERN = re.compile(r'syscall=([a-z_]+)')
-    IP_PATTERN = re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b')
+    # ASCII mode: digits and \b are ASCII-only, which skips the Unicode
+    # word-boundary lookups that made this the slowest scan of a line
+    IP_PATTERN = re.compile(r'\b[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\b', re.ASCII)
     PORT_PATTERN = re.compile(r'port=(\d+)')
     PROCESS_PATTERN = re.compile(r'proc\.name=([^\s]+)')
+    RULE_PATTERN = re.compile(r'rule=([^\s]+)')
+    PROTOCOLS = [("TCP", "tcp"), ("UDP", "udp"), ("ICMP", "icmp"), ("HTTP", "http"), ("HTTPS", "https")]
 
     def parse(self, raw_log: str, source: str = "falco") -> dict:
         """Extract structured features from raw log."""
@@ -82,17 +95,97 @@ class AnomalyParser:
 
         return features
 
+    def parse_batch(self, raw_logs: Iterable[str], source: str = "falco") -> list[dict]:
+        """
+        parse() over many lines; same result as [parse(l, source) for l in raw_logs].
+
+        Pattern methods are bound once per batch rather than looked up per
+        line, which is most of the per-line overhead left once the patterns
+        themselves are tuned.
+        """
+        syscalls = self.SYSCALL_PATTERN.findall
+        ips = self.IP_PATTERN.findall
+        ports = self.PORT_PATTERN.findall
+        processes = self.PROCESS_PATTERN.findall
+        if source == "falco":
+            rule = self.RULE_PATTERN.search
+        elif source == "network":
+            protocol = self._extract_protocol
+
+        parsed = []
+        append = parsed.append
+        for raw_log in raw_logs:
+            features = {
+                "syscalls": syscalls(raw_log),
+                "ips": ips(raw_log),
+                "ports": ports(raw_log),
+                "processes": processes(raw_log),
+            }
+            if source == "falco":
+                match = rule(raw_log)
+                features["rule"] = match.group(1) if match else None
+            elif source == "network":
+                features["protocol"] = protocol(raw_log)
+            append(features)
+        return parsed
+
     def _extract_falco_rule(self, log: str) -> Optional[str]:
-        match = re.search(r'rule=([^\s]+)', log)
+        match = self.RULE_PATTERN.search(log)
         return match.group(1) if match else None
 
     def _extract_protocol(self, log: str) -> Optional[str]:
-        for proto in ["TCP", "UDP", "ICMP", "HTTP", "HTTPS"]:
-            if proto.lower() in log.lower():
+        lowered = log.lower()
+        for proto, needle in self.PROTOCOLS:
+            if needle in lowered:
                 return proto
         return None
 
 
+@dataclass
+class FeatureCounts:
+    """Feature occurrence counts over a set of anomalies; partial counts merge."""
+    anomalies: int = 0
+    syscalls: Counter = field(default_factory=Counter)
+    processes: Counter = field(default_factory=Counter)
+    ports: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def from_features(cls, features_list: list[dict]) -> "FeatureCounts":
+        counts = cls(anomalies=len(features_list))
+        counts.syscalls.update(chain.from_iterable(f.get("syscalls", ()) for f in features_list))
+        counts.processes.update(chain.from_iterable(f.get("processes", ()) for f in features_list))
+        counts.ports.update(chain.from_iterable(f.get("ports", ()) for f in features_list))
+        return counts
+
+    def merge(self, other: "FeatureCounts") -> "FeatureCounts":
+        self.anomalies += other.anomalies
+        self.syscalls.update(other.syscalls)
+        self.processes.update(other.processes)
+        self.ports.update(other.ports)
+        return self
+
+    def common(self) -> dict:
+        """Syscalls/processes in 50%+ of anomalies, ports seen at least twice."""
+        common = {}
+        threshold = self.anomalies * 0.5  # appear in 50%+ of logs
+        if self.syscalls:
+            common["syscalls"] = [sc for sc, cnt in self.syscalls.items() if cnt >= threshold]
+        if self.processes:
+            common["processes"] = [p for p, cnt in self.processes.items() if cnt >= threshold]
+        if self.ports:
+            common["ports"] = [p for p, cnt in self.ports.items() if cnt >= 2]
+        return common
+
+
+# Corpus being counted by count_features; forked workers inherit it
+_shard_source: Optional[list[dict]] = None
+
+
+def _count_shard(bounds: tuple[int, int]) -> FeatureCounts:
+    start, end = bounds
+    return FeatureCounts.from_features(_shard_source[start:end])
+
+
 class SignatureGenerator:
     """
     Generates defense signatures from clustered anomalies.
@@ -109,19 +202,24 @@ class SignatureGenerator:
         anomalies: list[Anomaly],
         min_support: int = 3,
         confidence_threshold: float = 0.6,
+        workers: int = 1,
     ) -> list[Signature]:
         """
         Generate signatures from a set of related anomalies.
 
         min_support: Minimum number of anomalies needed to form a signature
         confidence_threshold: Minimum confidence to generate signature
+        workers: Processes used to count features (see count_features)
         """
         if len(anomalies) < min_support:
             return []
 
         # Find common patterns
         all_features = [a.features for a in anomalies]
-        common = self._find_common_features(all_features)
+        if workers > 1:
+            common = self.count_features(all_features, workers).common()
+        else:
+            common = self._find_common_features(all_features)
 
         if not common:
             return []
@@ -145,29 +243,45 @@ class SignatureGenerator:
 
     def _find_common_features(self, features_list: list[dict]) -> dict:
         """Find features that appear in majority of anomalies."""
-        common = {}
+        return FeatureCounts.from_features(features_list).common()
 
-        # Syscalls
-        all_syscalls = [sc for f in features_list for sc in f.get("syscalls", [])]
-        if all_syscalls:
-            syscall_counts = Counter(all_syscalls)
-            threshold = len(features_list) * 0.5  # appear in 50%+ of logs
-            common["syscalls"] = [sc for sc, cnt in syscall_counts.items() if cnt >= threshold]
-
-        # Processes
-        all_processes = [p for f in features_list for p in f.get("processes", [])]
-        if all_processes:
-            proc_counts = Counter(all_processes)
-            threshold = len(features_list) * 0.5
-            common["processes"] = [p for p, cnt in proc_counts.items() if cnt >= threshold]
-
-        # Ports
-        all_ports = [p for f in features_list for p in f.get("ports", [])]
-        if all_ports:
-            port_counts = Counter(all_ports)
-            common["ports"] = [p for p, cnt in port_counts.items() if cnt >= 2]
+    def count_features(
+        self, features_list: list[dict], workers: int = 1, shards: Optional[int] = None
+    ) -> FeatureCounts:
+        """
+        Count syscalls/processes/ports over features_list, map-reduce style.
 
-        return common
+        With workers > 1 the list is cut into contiguous shards counted in a
+        process pool; the partial counts are merged in shard order, so the
+        result (including first-seen key order) equals the serial count.
+        Forked workers read features_list from inherited memory and only
+        receive shard bounds; other start methods pickle each shard.
+        """
+        if workers <= 1 or len(features_list) < 2:
+            return FeatureCounts.from_features(features_list)
+
+        global _shard_source
+        shards = max(1, min(shards or workers * 4, len(features_list)))
+        size = math.ceil(len(features_list) / shards)
+        bounds = [(i, i + size) for i in range(0, len(features_list), size)]
+        fork = "fork" in multiprocessing.get_all_start_methods()
+
+        totals = FeatureCounts()
+        _shard_source = features_list
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork") if fork else None,
+            ) as pool:
+                if fork:
+                    partials = pool.map(_count_shard, bounds)
+                else:
+                    partials = pool.map(FeatureCounts.from_features, [features_list[a:b] for a, b in bounds])
+                for partial in partials:
+                    totals.merge(partial)
+        finally:
+            _shard_source = None
+        return totals
 
     def _generate_falco_rule(self, common: dict, anomalies: list[Anomaly]) -> Optional[Signature]:
         """Generate a Falco YAML rule from common features."""
@@ -235,31 +349,104 @@ class SignatureGenerator:
         )
 
 
+OVERLAP_THRESHOLD = 0.7  # > 70% word overlap = conflict
+
+
+def pattern_tokens(pattern: str) -> frozenset[str]:
+    """The word set that conflict detection compares."""
+    return frozenset(pattern.lower().split())
+
+
+class SignatureIndex:
+    """
+    In-memory token -> row postings of stored signatures, one table per rule_type.
+
+    Two patterns conflict when they share more than OVERLAP_THRESHOLD of the
+    larger word set, so a conflicting signature must contain at least one of
+    the new pattern's (m - ceil(0.7 * m) + 1) rarest words (m = its word
+    count). Only those postings are probed; the few candidates they yield
+    are then checked exactly.
+    """
+
+    def __init__(self):
+        self.ids: dict[str, list[str]] = {}
+        self.tokens: dict[str, list[frozenset[str]]] = {}
+        self.postings: dict[str, dict[str, list[int]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.ids.values())
+
+    def add(self, rule_type: str, signature_id: str, tokens: frozenset[str]):
+        rows = self.ids.setdefault(rule_type, [])
+        postings = self.postings.setdefault(rule_type, {})
+        row = len(rows)
+        rows.append(signature_id)
+        self.tokens.setdefault(rule_type, []).append(tokens)
+        for token in tokens:
+            postings.setdefault(token, []).append(row)
+
+    def find_conflicts(self, rule_type: str, tokens: frozenset[str]) -> list[str]:
+        """Signature ids of the same rule_type that overlap tokens, in insertion order."""
+        postings = self.postings.get(rule_type)
+        if not postings or not tokens:
+            return []
+
+        min_shared = max(1, math.ceil(OVERLAP_THRESHOLD * len(tokens)))
+        probe = sorted(tokens, key=lambda t: len(postings.get(t, ())))[:len(tokens) - min_shared + 1]
+        candidates = set()
+        for token in probe:
+            candidates.update(postings.get(token, ()))
+
+        stored = self.tokens[rule_type]
+        conflicts = []
+        for row in sorted(candidates):
+            overlap = len(tokens & stored[row]) / max(len(tokens), len(stored[row]), 1)
+            if overlap > OVERLAP_THRESHOLD:
+                conflicts.append(self.ids[rule_type][row])
+        return conflicts
+
+
 class SignatureDatabase:
-    """Stores and manages generated signatures with conflict detection."""
+    """
+    Stores and manages generated signatures with conflict detection.
+
+    Conflict checks use a SignatureIndex instead of re-reading the store. The
+    index is persisted as generated_signatures.index.jsonl, one line of words
+    per stored signature (plus the store's byte offset after it), so each add
+    appends one line and a restart rebuilds the postings without re-parsing
+    the signatures. Signatures appended by another writer are picked up from
+    the last indexed offset; a store that shrank is re-indexed from scratch.
+    """
 
     def __init__(self):
         self.db_file = SIGNATURES_DIR / "generated_signatures.jsonl"
         self.conflict_log = SIGNATURES_DIR / "signature_conflicts.jsonl"
+        self.index_file = SIGNATURES_DIR / "generated_signatures.index.jsonl"
+        self._index: Optional[SignatureIndex] = None
+        self._indexed_bytes = 0  # prefix of db_file covered by the index
 
     def add(self, signature: Signature) -> dict:
         """Add signature to database after conflict check."""
-        existing = self.load_all()
-
-        # Check for conflicts
-        conflicts = self._check_conflicts(signature, existing)
+        index = self._sync_index()
+        tokens = pattern_tokens(signature.pattern)
+        conflicts = index.find_conflicts(signature.rule_type, tokens)
 
         if conflicts:
             self._log_conflict(signature, conflicts)
             return {
                 "added": False,
                 "reason": "conflict",
-                "conflicts": [c.signature_id for c in conflicts],
+                "conflicts": conflicts,
             }
 
         # Save signature
         with open(self.db_file, "a") as f:
+            start = f.tell()
             f.write(json.dumps(asdict(signature)) + "\n")
+            end = f.tell()
+        # If another writer appended since the sync, the next sync indexes both from disk
+        if start == self._indexed_bytes:
+            self._index_signature(signature, tokens, end)
 
         return {
             "added": True,
@@ -267,22 +454,80 @@ class SignatureDatabase:
             "confidence": signature.confidence,
         }
 
+    def iter_all(self) -> Iterator[Signature]:
+        """Stream stored signatures one at a time, skipping corrupt lines."""
+        for data in iter_jsonl(self.db_file):
+            try:
+                yield Signature(**data)
+            except TypeError:
+                continue
+
     def load_all(self) -> list[Signature]:
         """Load all stored signatures."""
-        if not self.db_file.exists():
-            return []
-        signatures = []
-        with open(self.db_file) as f:
+        return list(self.iter_all())
+
+    # ─── Conflict index ───────────────────────────────────────────────────
+
+    def _sync_index(self) -> SignatureIndex:
+        """Bring the in-memory index up to date with the store on disk."""
+        size = self.db_file.stat().st_size if self.db_file.exists() else 0
+        if self._index is None:
+            self._load_index(size)
+        if size < self._indexed_bytes:
+            # Store truncated or rewritten: the persisted index no longer describes it
+            self._index, self._indexed_bytes = SignatureIndex(), 0
+            self.index_file.unlink(missing_ok=True)
+        if size > self._indexed_bytes:
+            self._index_tail()
+        return self._index
+
+    def _load_index(self, store_size: int):
+        self._index, self._indexed_bytes = SignatureIndex(), 0
+        for entry in iter_jsonl(self.index_file):
+            try:
+                end, rule_type, signature_id, tokens = (
+                    entry["end"], entry["rule_type"], entry["signature_id"], entry["tokens"]
+                )
+            except (KeyError, TypeError):
+                continue
+            if end <= self._indexed_bytes:
+                continue
+            if end > store_size:
+                # Index describes a longer store than exists: rebuild it from the store
+                self._index, self._indexed_bytes = SignatureIndex(), 0
+                self.index_file.unlink(missing_ok=True)
+                return
+            self._index.add(rule_type, signature_id, frozenset(tokens))
+            self._indexed_bytes = end
+
+    def _index_tail(self):
+        """Index signatures stored after the last indexed offset."""
+        with open(self.db_file, "rb") as f:
+            f.seek(self._indexed_bytes)
             for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written; picked up by a later sync
+                end = self._indexed_bytes + len(line)
                 try:
-                    data = json.loads(line.strip())
-                    signatures.append(Signature(**data))
-                except Exception:
-                    pass
-        return signatures
-
-    def _check_conflicts(self, new_sig: Signature, existing: list[Signature]) -> list[Signature]:
-        """Check if new signature conflicts with existing ones."""
+                    signature = Signature(**json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError, TypeError):
+                    self._indexed_bytes = end
+                    continue
+                self._index_signature(signature, pattern_tokens(signature.pattern), end)
+
+    def _index_signature(self, signature: Signature, tokens: frozenset[str], end: int):
+        self._index.add(signature.rule_type, signature.signature_id, tokens)
+        self._indexed_bytes = end
+        with open(self.index_file, "a") as f:
+            f.write(json.dumps({
+                "end": end,
+                "rule_type": signature.rule_type,
+                "signature_id": signature.signature_id,
+                "tokens": sorted(tokens),
+            }) + "\n")
+
+    def _check_conflicts(self, new_sig: Signature, existing: Iterable[Signature]) -> list[Signature]:
+        """Pairwise conflict check against explicit signatures (the index does this for add)."""
         conflicts = []
         for sig in existing:
             if sig.rule_type != new_sig.rule_type:
@@ -294,17 +539,17 @@ class SignatureDatabase:
 
     def _patterns_overlap(self, p1: str, p2: str) -> bool:
         """Simple overlap check — upgrade to semantic similarity later."""
-        words1 = set(p1.lower().split())
-        words2 = set(p2.lower().split())
+        words1 = pattern_tokens(p1)
+        words2 = pattern_tokens(p2)
         overlap = len(words1 & words2) / max(len(words1), len(words2), 1)
-        return overlap > 0.7  # 70% word overlap = conflict
+        return overlap > OVERLAP_THRESHOLD
 
-    def _log_conflict(self, new_sig: Signature, conflicts: list[Signature]):
-        """Log signature conflicts for review."""
+    def _log_conflict(self, new_sig: Signature, conflicts: list[str]):
+        """Log signature conflicts (ids of the stored signatures) for review."""
         conflict_record = {
             "timestamp": datetime.utcnow().isoformat(),
             "new_signature": new_sig.signature_id,
-            "conflicts_with": [c.signature_id for c in conflicts],
+            "conflicts_with": conflicts,
             "new_pattern": new_sig.pattern,
         }
         with open(self.conflict_log, "a") as f:
@@ -312,7 +557,7 @@ class SignatureDatabase:
 
     def export_rules(self, rule_type: str = "falco") -> Path:
         """Export all rules of a specific type to a deployable file."""
-        signatures = [s for s in self.load_all() if s.rule_type == rule_type]
+        signatures = (s for s in self.iter_all() if s.rule_type == rule_type)
         output_file = SIGNATURES_DIR / f"{rule_type}_rules_generated.yaml"
 
         with open(output_file, "w") as f:
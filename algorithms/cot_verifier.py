@@ -22,11 +22,14 @@ SELF-CORRECTION BLOCK:
 """
 
 import json
+import os
 import re
+import time
+import concurrent.futures
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Iterable, Iterator, Optional, Literal
 
 
 @dataclass
@@ -70,17 +73,84 @@ class CitationParser:
         return bool(self.CITATION_PATTERN.search(text))
 
 
+def index_rules(data) -> dict[str, dict]:
+    """
+    Map every citable rule name in a parsed JSON file to its payload.
+
+    Covers top-level keys ({name: value}), keys and "name" fields anywhere
+    inside a top-level dict value (that whole value), and "name" fields of
+    list items (the item). Direct keys win, then the first match in file order.
+    """
+    rules: dict[str, dict] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            rules.setdefault(key, {key: value})
+        for value in data.values():
+            if isinstance(value, dict):
+                for name in _nested_names(value):
+                    rules.setdefault(name, value)
+            elif isinstance(value, list):
+                _index_named_items(value, rules)
+    elif isinstance(data, list):
+        _index_named_items(data, rules)
+    return rules
+
+
+def _index_named_items(items: list, rules: dict):
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get("name"), str):
+            rules.setdefault(item["name"], item)
+
+
+def _nested_names(value) -> Iterator[str]:
+    """Keys and "name" field values at any depth of a JSON value."""
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, child in node.items():
+                yield key
+                if key == "name" and isinstance(child, str):
+                    yield child
+                if isinstance(child, (dict, list)):
+                    stack.append(child)
+        elif isinstance(node, list):
+            stack.extend(child for child in node if isinstance(child, (dict, list)))
+
+
 class DatabaseRuleChecker:
     """
     Verifies that cited database rules actually exist.
 
-    In production: Load all JSON rules into memory at startup.
-    For now: Check file existence and parse JSON.
+    Rule registry: (normalized source path, rule name) → rule payload, built
+    per file with index_rules() — for every JSON file under db_root at
+    startup when preload=True, otherwise on a file's first citation. Results
+    are cached per citation, so a repeated check is a dict lookup.
+
+    Source files are re-stat'ed at most every check_interval seconds
+    (check_for_changes); changed files are re-indexed, deleted ones dropped.
+    check_interval=0 re-checks on every citation.
     """
 
-    def __init__(self, db_root: Path):
+    def __init__(self, db_root: Path, preload: bool = False, check_interval: float = 1.0):
         self.db_root = db_root
-        self._rule_cache: dict[str, dict] = {}
+        self.check_interval = check_interval
+        # normalized path -> (stat signature, rules | None, load error | None)
+        self._registry: dict[str, tuple[Optional[tuple], Optional[dict], Optional[str]]] = {}
+        self._paths: dict[str, str] = {}  # cited source_file -> normalized path
+        self._results: dict[tuple[str, str], dict] = {}
+        self._last_check = time.monotonic()
+        if preload:
+            self.preload()
+
+    def preload(self, pattern: str = "**/*.json") -> int:
+        """Index every matching file under db_root; return how many were loaded."""
+        loaded = 0
+        for path in sorted(Path(self.db_root).glob(pattern)):
+            key = os.path.normpath(path)
+            self._register(key)
+            loaded += self._registry[key][1] is not None
+        return loaded
 
     def verify_citation(self, citation: dict) -> dict:
         """
@@ -91,69 +161,100 @@ class DatabaseRuleChecker:
         source_file = citation["source_file"]
         rule_name = citation["rule_name"]
 
-        # Construct full path
-        if not source_file.startswith("/"):
-            full_path = self.db_root / source_file
-        else:
-            full_path = Path(source_file)
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.check_for_changes()
+
+        result = self._results.get((source_file, rule_name))
+        if result is None:
+            result = self._results[(source_file, rule_name)] = self._check(source_file, rule_name)
+        return dict(result)
+
+    def _check(self, source_file: str, rule_name: str) -> dict:
+        key = self._normalize(source_file)
+        if key not in self._registry:
+            self._register(key)
+        signature, rules, error = self._registry[key]
+
+        if signature is None:
+            return {"verified": False, "note": f"File not found: {source_file}", "rule_data": None}
+        if error is not None:
+            return {"verified": False, "note": f"Error loading {source_file}: {error}", "rule_data": None}
 
-        # Check file exists
-        if not full_path.exists():
+        rule_data = rules.get(rule_name)
+        if rule_data:
             return {
-                "verified": False,
-                "note": f"File not found: {source_file}",
-                "rule_data": None,
+                "verified": True,
+                "note": f"Rule '{rule_name}' found in {source_file}",
+                "rule_data": rule_data,
             }
+        return {
+            "verified": False,
+            "note": f"Rule '{rule_name}' not found in {source_file}",
+            "rule_data": None,
+        }
+
+    def _normalize(self, source_file: str) -> str:
+        key = self._paths.get(source_file)
+        if key is None:
+            path = Path(source_file) if source_file.startswith("/") else self.db_root / source_file
+            key = self._paths[source_file] = os.path.normpath(path)
+        return key
 
-        # Load and check for rule
+    @staticmethod
+    def _stat_signature(key: str) -> Optional[tuple]:
         try:
-            rule_data = self._load_rule(full_path, rule_name)
-            if rule_data:
-                return {
-                    "verified": True,
-                    "note": f"Rule '{rule_name}' found in {source_file}",
-                    "rule_data": rule_data,
-                }
-            else:
-                return {
-                    "verified": False,
-                    "note": f"Rule '{rule_name}' not found in {source_file}",
-                    "rule_data": None,
-                }
-        except Exception as e:
-            return {
-                "verified": False,
-                "note": f"Error loading {source_file}: {e}",
-                "rule_data": None,
-            }
+            stat = os.stat(key)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _register(self, key: str):
+        """(Re)index one file; a missing file is registered as such."""
+        signature = self._stat_signature(key)
+        rules, error = None, None
+        if signature is not None:
+            try:
+                with open(key) as f:
+                    rules = index_rules(json.load(f))
+            except Exception as e:
+                error = str(e)
+        self._registry[key] = (signature, rules, error)
+
+    def check_for_changes(self) -> list[str]:
+        """Re-index registered files whose mtime/size changed (or that appeared/vanished)."""
+        self._last_check = time.monotonic()
+        changed = [
+            key for key, (signature, _, _) in self._registry.items()
+            if self._stat_signature(key) != signature
+        ]
+        for key in changed:
+            self._register(key)
+        if changed:
+            self._results.clear()
+        return changed
 
     def _load_rule(self, file_path: Path, rule_name: str) -> Optional[dict]:
         """Load specific rule from JSON file."""
-        cache_key = str(file_path)
+        key = os.path.normpath(file_path)
+        if key not in self._registry:
+            self._register(key)
+        _, rules, error = self._registry[key]
+        if error is not None:
+            raise ValueError(error)
+        return (rules or {}).get(rule_name)
+
+
+# Per-process verifier for verify_batch(workers > 1)
+_worker_verifier: Optional["CoTVerifier"] = None
 
-        # Check cache
-        if cache_key not in self._rule_cache:
-            with open(file_path) as f:
-                self._rule_cache[cache_key] = json.load(f)
 
-        data = self._rule_cache[cache_key]
+def _init_batch_worker(db_root: Path, strict_mode: bool, preload_rules: bool):
+    global _worker_verifier
+    _worker_verifier = CoTVerifier(db_root, strict_mode=strict_mode, preload_rules=preload_rules)
 
-        # Search for rule by name (handle different JSON structures)
-        if isinstance(data, dict):
-            # Direct lookup
-            if rule_name in data:
-                return {rule_name: data[rule_name]}
-            # Nested search
-            for key, value in data.items():
-                if isinstance(value, dict) and rule_name in str(value):
-                    return value
-        elif isinstance(data, list):
-            # List of rules
-            for item in data:
-                if isinstance(item, dict) and item.get("name") == rule_name:
-                    return item
 
-        return None
+def _verify_chunk(items: list[tuple[str, str, str]]) -> list[CoTAnswer]:
+    return _worker_verifier.verify_batch(items)
 
 
 class CoTVerifier:
@@ -167,11 +268,16 @@ class CoTVerifier:
     4. Reject answer if any step lacks valid citation
     """
 
-    def __init__(self, db_root: Path, strict_mode: bool = True):
+    # Match "Step N:" or numbered list
+    STEP_PATTERN = re.compile(r'^(Step\s+\d+:|[\d]+\.)', re.IGNORECASE)
+    FINAL_ANSWER_PATTERN = re.compile(r'Final Answer:\s*(.+)', re.IGNORECASE | re.DOTALL)
+
+    def __init__(self, db_root: Path, strict_mode: bool = True, preload_rules: bool = False):
         self.db_root = db_root
         self.strict_mode = strict_mode  # require citation for EVERY step
+        self.preload_rules = preload_rules
         self.parser = CitationParser()
-        self.rule_checker = DatabaseRuleChecker(db_root)
+        self.rule_checker = DatabaseRuleChecker(db_root, preload=preload_rules)
 
     def verify(self, query: str, domain: str, ai_output: str) -> CoTAnswer:
         """
@@ -185,25 +291,76 @@ class CoTVerifier:
         ```
         """
         # Parse into steps
-        steps = self._parse_steps(ai_output)
+        cited_steps = self._parse_cited_steps(ai_output)
 
         # Verify each step
-        verified_steps = []
-        for step in steps:
-            verified_step = self._verify_step(step)
-            verified_steps.append(verified_step)
+        verified_steps = [self._verify_step(step, citation) for step, citation in cited_steps]
+
+        return self._build_answer(query, domain, ai_output, verified_steps)
 
+    def verify_batch(
+        self,
+        items: Iterable[tuple[str, str, str]],
+        workers: int = 1,
+        chunk_size: int = 256,
+    ) -> list[CoTAnswer]:
+        """
+        Verify many (query, domain, ai_output) answers; same results as verify() per item.
+
+        Each distinct (source_file, rule_name) citation in the batch is
+        checked once. With workers > 1 the items are split into chunks of
+        chunk_size verified by a process pool (each worker builds its own
+        rule registry); results keep the input order.
+        """
+        items = list(items)
+        if workers > 1 and len(items) > chunk_size:
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_batch_worker,
+                initargs=(self.db_root, self.strict_mode, self.preload_rules),
+            ) as pool:
+                return [answer for chunk in pool.map(_verify_chunk, chunks) for answer in chunk]
+
+        citations: dict = {}
+        parsed = [self._parse_cited_steps(ai_output, citations) for _, _, ai_output in items]
+
+        checked: dict[tuple[str, str], dict] = {}
+        verify_citation = self.rule_checker.verify_citation
+        for cited_steps in parsed:
+            for _, citation in cited_steps:
+                if citation is not None:
+                    key = (citation["source_file"], citation["rule_name"])
+                    if key not in checked:
+                        checked[key] = verify_citation(citation)
+
+        answers = []
+        for (query, domain, ai_output), cited_steps in zip(items, parsed):
+            steps = []
+            for step, citation in cited_steps:
+                if citation is None:
+                    step.verified = False
+                    step.verification_note = "No citation provided"
+                else:
+                    result = checked[(citation["source_file"], citation["rule_name"])]
+                    step.verified = result["verified"]
+                    step.verification_note = result["note"]
+                steps.append(step)
+            answers.append(self._build_answer(query, domain, ai_output, steps))
+        return answers
+
+    def _build_answer(self, query: str, domain: str, ai_output: str, steps: list[ReasoningStep]) -> CoTAnswer:
         # Extract final answer
         final_answer = self._extract_final_answer(ai_output)
 
         # Overall verification
-        all_verified = all(s.verified or not self.strict_mode for s in verified_steps)
-        confidence = self._calculate_confidence(verified_steps)
+        all_verified = all(s.verified or not self.strict_mode for s in steps)
+        confidence = self._calculate_confidence(steps)
 
         return CoTAnswer(
             query=query,
             domain=domain,
-            reasoning_steps=verified_steps,
+            reasoning_steps=steps,
             final_answer=final_answer,
             overall_verified=all_verified,
             confidence=confidence,
@@ -212,39 +369,57 @@ class CoTVerifier:
 
     def _parse_steps(self, output: str) -> list[ReasoningStep]:
         """Parse AI output into reasoning steps."""
+        return [step for step, _ in self._parse_cited_steps(output)]
+
+    def _parse_cited_steps(
+        self, output: str, citations: Optional[dict] = None
+    ) -> list[tuple[ReasoningStep, Optional[dict]]]:
+        """
+        Parse AI output into (reasoning step, first citation as a dict or None) pairs.
+
+        citations memoizes (source_file, rule_name) -> (citation dict, JSON
+        string) across calls, so a batch encodes each distinct citation once.
+        """
         steps = []
-        lines = output.split("\n")
+        step_match = self.STEP_PATTERN.match
+        citation_search = self.parser.CITATION_PATTERN.search
+        citation_sub = self.parser.CITATION_PATTERN.sub
+        if citations is None:
+            citations = {}
 
         step_num = 0
-        for line in lines:
+        for line in output.split("\n"):
             line = line.strip()
-            if not line:
+            if not line or not step_match(line):
                 continue
 
-            # Match "Step N:" or numbered list
-            if re.match(r'^(Step\s+\d+:|[\d]+\.)', line, re.IGNORECASE):
-                step_num += 1
-                # Extract claim (everything before citation if present)
-                citations = self.parser.extract_citations(line)
-                claim = re.sub(self.parser.CITATION_PATTERN, '', line).strip()
-
-                step = ReasoningStep(
-                    step_number=step_num,
-                    claim=claim,
-                    citation=json.dumps(citations[0]) if citations else None,
-                )
-                steps.append(step)
+            step_num += 1
+            # Extract claim (everything before citation if present)
+            match = citation_search(line)
+            if match:
+                key = (match.group(1).strip(), match.group(2).strip())
+                cached = citations.get(key)
+                if cached is None:
+                    citation = {"source_file": key[0], "rule_name": key[1]}
+                    cached = citations[key] = (citation, json.dumps(citation))
+                citation, encoded = cached
+                claim = citation_sub('', line).strip()
+            else:
+                citation, encoded, claim = None, None, line
+
+            steps.append((ReasoningStep(step_number=step_num, claim=claim, citation=encoded), citation))
 
         return steps
 
-    def _verify_step(self, step: ReasoningStep) -> ReasoningStep:
-        """Verify a single reasoning step's citation."""
+    def _verify_step(self, step: ReasoningStep, citation: Optional[dict] = None) -> ReasoningStep:
+        """Verify a single reasoning step's citation (decoded from step.citation if not given)."""
         if not step.citation:
             step.verified = False
             step.verification_note = "No citation provided"
             return step
 
-        citation = json.loads(step.citation)
+        if citation is None:
+            citation = json.loads(step.citation)
         result = self.rule_checker.verify_citation(citation)
 
         step.verified = result["verified"]
@@ -254,7 +429,7 @@ class CoTVerifier:
 
     def _extract_final_answer(self, output: str) -> str:
         """Extract the final answer from output."""
-        match = re.search(r'Final Answer:\s*(.+)', output, re.IGNORECASE | re.DOTALL)
+        match = self.FINAL_ANSWER_PATTERN.search(output)
         if match:
             return match.group(1).strip()
         # Fallback: last line
@@ -13,17 +13,29 @@ SELF-CORRECTION BLOCK:
       3. Confidence mis-calibrated — adjust scoring weights
     How to Test:
       pytest tests/test_cpo_engine.py -v
+
+Logs are appended through shared BufferedLogWriters (algorithms/log_writer.py).
+Pass buffer_lines > 1 to batch appends under high query volume; readers
+flush pending lines first, so load_triplets()/get_stats() always see them.
+Readers stream the logs line by line, so stats and exports run in constant
+memory however large the triplet file grows.
 """
 
 import json
-import csv
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from typing import Iterator
+
+try:
+    from algorithms.log_writer import BufferedLogWriter, csv_line, iter_jsonl, iter_lines_reversed
+except ImportError:  # run as a script: python algorithms/cpo_engine.py
+    from log_writer import BufferedLogWriter, csv_line, iter_jsonl, iter_lines_reversed
 
 
 TRIPLETS_DIR = Path("databases/cpo_triplets")
 TRIPLETS_DIR.mkdir(parents=True, exist_ok=True)
+CONFLICT_HEADER = csv_line(["timestamp", "query", "generic_preview", "expert_preview"])
 
 
 @dataclass
@@ -42,12 +54,24 @@ class CPOEngine:
     """
     Records and stores CPO triplets for fine-tuning.
     Use the stored JSONL file to run DPO fine-tuning later.
+
+    buffer_lines / flush_interval / process_safe configure the shared log
+    writers the first time a file is opened in this process.
     """
 
-    def __init__(self, domain: str):
+    def __init__(
+        self,
+        domain: str,
+        buffer_lines: int = 1,
+        flush_interval: float = 1.0,
+        process_safe: bool = False,
+    ):
         self.domain = domain
         self.triplet_file = TRIPLETS_DIR / f"{domain}_triplets.jsonl"
         self.conflict_file = TRIPLETS_DIR / f"{domain}_conflicts.csv"
+        options = {"max_lines": buffer_lines, "flush_interval": flush_interval, "process_safe": process_safe}
+        self._triplet_writer = BufferedLogWriter.shared(self.triplet_file, **options)
+        self._conflict_writer = BufferedLogWriter.shared(self.conflict_file, header=CONFLICT_HEADER, **options)
 
     def record(
         self,
@@ -72,8 +96,7 @@ class CPOEngine:
         )
 
         # Save to JSONL (append)
-        with open(self.triplet_file, "a") as f:
-            f.write(json.dumps(asdict(triplet)) + "\n")
+        self._triplet_writer.write_json(asdict(triplet))
 
         # Log conflicts separately
         if generic_answer and generic_answer != expert_answer:
@@ -83,56 +106,60 @@ class CPOEngine:
 
     def _log_conflict(self, query: str, generic: str, expert: str):
         """Log conflicts where DB differs from generic LLM."""
-        write_header = not self.conflict_file.exists()
-        with open(self.conflict_file, "a", newline="") as f:
-            writer = csv.writer(f)
-            if write_header:
-                writer.writerow(["timestamp", "query", "generic_preview", "expert_preview"])
-            writer.writerow([
-                datetime.utcnow().isoformat(),
-                query[:100],
-                generic[:150],
-                expert[:150],
-            ])
+        self._conflict_writer.write_row([
+            datetime.utcnow().isoformat(),
+            query[:100],
+            generic[:150],
+            expert[:150],
+        ])
+
+    def flush(self):
+        """Write any buffered triplets and conflicts to disk."""
+        self._triplet_writer.flush()
+        self._conflict_writer.flush()
+
+    def iter_triplets(self) -> Iterator[CPOTriplet]:
+        """Stream recorded triplets one at a time, skipping corrupt lines."""
+        self._triplet_writer.flush()
+        for data in iter_jsonl(self.triplet_file):
+            try:
+                yield CPOTriplet(**data)
+            except TypeError:
+                continue
 
     def load_triplets(self) -> list[CPOTriplet]:
         """Load all recorded triplets for review or fine-tuning."""
-        triplets = []
-        if not self.triplet_file.exists():
-            return []
-        with open(self.triplet_file) as f:
-            for line in f:
-                try:
-                    data = json.loads(line.strip())
-                    triplets.append(CPOTriplet(**data))
-                except Exception:
-                    pass
-        return triplets
+        return list(self.iter_triplets())
 
     def export_for_finetuning(self) -> Path:
-        """Export triplets as HuggingFace DPO-compatible JSONL."""
+        """Export triplets as HuggingFace DPO-compatible JSONL (one streaming pass)."""
         output_file = TRIPLETS_DIR / f"{self.domain}_dpo_ready.jsonl"
-        triplets = self.load_triplets()
+        count = 0
 
         with open(output_file, "w") as f:
-            for t in triplets:
+            for t in self.iter_triplets():
                 dpo_record = {
                     "prompt": t.query,
                     "chosen": t.expert_answer,
                     "rejected": t.generic_answer,
                 }
                 f.write(json.dumps(dpo_record) + "\n")
+                count += 1
 
-        print(f"Exported {len(triplets)} triplets to {output_file}")
+        print(f"Exported {count} triplets to {output_file}")
         return output_file
 
     def get_stats(self) -> dict:
-        triplets = self.load_triplets()
-        conflicts = sum(1 for t in triplets if t.generic_answer != t.expert_answer)
-        avg_confidence = sum(t.confidence for t in triplets) / len(triplets) if triplets else 0.0
+        total = conflicts = 0
+        confidence_sum = 0.0
+        for t in self.iter_triplets():
+            total += 1
+            conflicts += t.generic_answer != t.expert_answer
+            confidence_sum += t.confidence
+        avg_confidence = confidence_sum / total if total else 0.0
         return {
             "domain": self.domain,
-            "total_triplets": len(triplets),
+            "total_triplets": total,
             "conflicts_logged": conflicts,
             "avg_confidence": round(avg_confidence, 3),
         }
@@ -144,9 +171,18 @@ class ActiveLearner:
     Tracks low-confidence queries for human expert review.
     """
 
-    def __init__(self, confidence_threshold: float = 0.5):
+    def __init__(
+        self,
+        confidence_threshold: float = 0.5,
+        buffer_lines: int = 1,
+        flush_interval: float = 1.0,
+        process_safe: bool = False,
+    ):
         self.threshold = confidence_threshold
         self.gap_log_file = TRIPLETS_DIR / "knowledge_gaps.jsonl"
+        self._gap_writer = BufferedLogWriter.shared(
+            self.gap_log_file, max_lines=buffer_lines, flush_interval=flush_interval, process_safe=process_safe
+        )
 
     def check(self, query: str, domain: str, confidence: float) -> dict:
         """Flag if the AI's confidence is below threshold."""
@@ -160,8 +196,7 @@ class ActiveLearner:
                 "timestamp": datetime.utcnow().isoformat(),
                 "action": "add_data_for_this_query",
             }
-            with open(self.gap_log_file, "a") as f:
-                f.write(json.dumps(gap) + "\n")
+            self._gap_writer.write_json(gap)
 
         return {
             "is_knowledge_gap": is_gap,
@@ -169,18 +204,29 @@ class ActiveLearner:
             "suggestion": f"Add more '{domain}' data about: {query[:80]}" if is_gap else "OK",
         }
 
+    def iter_gaps(self) -> Iterator[dict]:
+        """Stream every logged knowledge gap, oldest first."""
+        self._gap_writer.flush()
+        yield from iter_jsonl(self.gap_log_file)
+
     def get_top_gaps(self, n: int = 10) -> list[dict]:
-        """Return the most common knowledge gaps to prioritize for data collection."""
-        if not self.gap_log_file.exists():
-            return []
+        """
+        Return the most recent n knowledge gaps to prioritize for data collection.
+        Reads backwards from the end of the log, so cost scales with n, not file size.
+        """
+        self._gap_writer.flush()
         gaps = []
-        with open(self.gap_log_file) as f:
-            for line in f:
-                try:
-                    gaps.append(json.loads(line.strip()))
-                except Exception:
-                    pass
-        return gaps[-n:]
+        if n <= 0:
+            return gaps
+        for line in iter_lines_reversed(self.gap_log_file):
+            try:
+                gaps.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            if len(gaps) >= n:
+                break
+        gaps.reverse()
+        return gaps
 
 
 if __name__ == "__main__":
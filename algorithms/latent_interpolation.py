@@ -13,6 +13,9 @@ SELF-CORRECTION BLOCK:
       1. Embeddings from different models incompatible
       2. Interpolation midpoint falls outside training distribution
       3. Decoded output is "uncanny valley" — technically valid but feels wrong
+      4. Deleting the .f32 vector file but keeping the .jsonl orphans every new-format line
+      5. Concurrent saves from several processes — serialized by an flock on the
+         .f32 file; without fcntl (Windows) only one writer is supported
     How to Test:
       pytest tests/test_latent_interpolation.py -v
     How to Fix:
@@ -22,11 +25,22 @@ SELF-CORRECTION BLOCK:
 """
 
 import json
+import os
 import numpy as np
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Iterable, Iterator, Optional, Literal, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, InterpolationDatabase supports one writer
+    fcntl = None
+
+try:
+    from algorithms.log_writer import iter_jsonl
+except ImportError:  # run as a script: python algorithms/latent_interpolation.py
+    from log_writer import iter_jsonl
 
 
 @dataclass
@@ -53,6 +67,7 @@ class InterpolationResult:
 
 
 EMBEDDINGS_DIR = Path("databases/latent_embeddings")
+VECTOR_DTYPE = np.dtype("<f4")
 EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
 
 
@@ -189,6 +204,58 @@ class LatentInterpolator:
         """Linear interpolation."""
         return (1 - t) * v0 + t * v1
 
+    def interpolate_batch(
+        self,
+        vecs_a,
+        vecs_b,
+        alphas=0.5,
+        method: Literal["slerp", "lerp"] = "slerp",
+    ) -> np.ndarray:
+        """
+        Blend N endpoint pairs at once (rows of two N×D matrices).
+
+        alphas: scalar or (N,) — one alpha per pair, returns (N, D);
+                (N, K) or (1, K) — a sweep of K alphas per pair, returns (N, K, D).
+        Same blends as interpolate() (near-parallel pairs fall back to LERP,
+        selected by mask), returned as one C-contiguous float32 array.
+        """
+        a = np.asarray(vecs_a, dtype=np.float32)
+        b = np.asarray(vecs_b, dtype=np.float32)
+        if a.ndim != 2 or a.shape != b.shape:
+            raise ValueError(f"Endpoint matrices must both be N×D, got {a.shape} and {b.shape}")
+
+        t = np.asarray(alphas, dtype=np.float64)
+        sweep = t.ndim == 2
+        if t.ndim > 2:
+            raise ValueError(f"alphas must be a scalar, (N,) or (N, K), got shape {t.shape}")
+        t = np.broadcast_to(t, (len(a), t.shape[1]) if sweep else (len(a),))
+        if not sweep:
+            t = t[:, None]
+
+        if method == "slerp":
+            w0, w1 = self._slerp_weights(a, b, t)
+        else:
+            w0, w1 = 1.0 - t, t
+
+        # (N, K, D): weights broadcast over D, endpoints over K
+        out = w0.astype(np.float32)[:, :, None] * a[:, None, :]
+        out += w1.astype(np.float32)[:, :, None] * b[:, None, :]
+        return out if sweep else out[:, 0, :]
+
+    def _slerp_weights(self, a: np.ndarray, b: np.ndarray, t: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Per-pair SLERP coefficients (N, K) for endpoints a, b; LERP where theta < 1e-5."""
+        # Angles in float64, like the per-pair path: arccos is ill-conditioned near 1
+        norm_a = np.sqrt(np.einsum("ij,ij->i", a, a, dtype=np.float64)) + 1e-8
+        norm_b = np.sqrt(np.einsum("ij,ij->i", b, b, dtype=np.float64)) + 1e-8
+        dot = np.einsum("ij,ij->i", a, b, dtype=np.float64) / (norm_a * norm_b)
+        theta = np.arccos(np.clip(dot, -1.0, 1.0))[:, None]
+
+        parallel = theta < 1e-5
+        sin_theta = np.where(parallel, 1.0, np.sin(theta))
+        w0 = np.where(parallel, 1.0 - t, np.sin((1.0 - t) * theta) / sin_theta)
+        w1 = np.where(parallel, t, np.sin(t * theta) / sin_theta)
+        return w0, w1
+
     def _blend_metadata(self, meta_a: dict, meta_b: dict, alpha: float) -> dict:
         """Blend metadata fields intelligently."""
         blended = {}
@@ -259,37 +326,333 @@ class LatentInterpolator:
         )
 
 
+class EmbeddingStore:
+    """
+    LatentEntry vectors in one contiguous float32 matrix, searchable by cosine.
+
+    Rows are appended in insertion order (capacity doubles as needed) and an
+    id map gives each entry's row. search() is exact: one matrix-vector
+    product over all rows plus an argpartition for the top k. With
+    approximate=True it uses random-projection LSH (build_lsh) — n_tables
+    hash tables of n_bits hyperplane signs; rows sharing a bucket with the
+    query (or one bit away, when probing) are re-ranked exactly.
+    """
+
+    def __init__(self, dim: Optional[int] = None, capacity: int = 1024):
+        self.dim = dim
+        self._vectors = np.empty((capacity, dim or 0), dtype=np.float32)
+        self._norms = np.empty(capacity, dtype=np.float32)
+        self._count = 0
+        self._entries: list[LatentEntry] = []
+        self._rows: dict[str, int] = {}
+        self._lsh: Optional[dict] = None
+        self._lsh_rows = 0  # rows hashed into the current LSH tables
+
+    # ─── Storage ──────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The stored vectors, (len(self), dim) float32 (a view; do not modify)."""
+        return self._vectors[:self._count]
+
+    @property
+    def ids(self) -> list[str]:
+        return [e.entry_id for e in self._entries]
+
+    def get(self, entry_id: str) -> Optional[LatentEntry]:
+        row = self._rows.get(entry_id)
+        return self._entries[row] if row is not None else None
+
+    def vector(self, entry_id: str) -> np.ndarray:
+        return self._vectors[self._rows[entry_id]]
+
+    def add(self, entry: LatentEntry):
+        """Add an entry; an existing entry_id has its vector replaced."""
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[LatentEntry]):
+        entries = list(entries)
+        if not entries:
+            return
+        vectors = np.asarray([e.embedding for e in entries], dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("All embeddings in one add must have the same length")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._vectors = np.empty((len(self._norms), self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding length {vectors.shape[1]} does not match store dim {self.dim}")
+
+        for entry, vector in zip(entries, vectors):
+            row = self._rows.get(entry.entry_id)
+            if row is None:
+                if self._count == len(self._norms):
+                    self._grow()
+                row = self._rows[entry.entry_id] = self._count
+                self._entries.append(entry)
+                self._count += 1
+            else:
+                self._entries[row] = entry
+                self._lsh_rows = -1  # a replaced vector may change buckets: rehash
+            self._vectors[row] = vector
+            self._norms[row] = np.linalg.norm(vector)
+
+    def _grow(self):
+        capacity = max(2 * len(self._norms), 16)
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[:self._count] = self._vectors[:self._count]
+        norms = np.empty(capacity, dtype=np.float32)
+        norms[:self._count] = self._norms[:self._count]
+        self._vectors, self._norms = vectors, norms
+
+    # ─── Search ───────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        query,
+        k: int = 10,
+        approximate: bool = False,
+        probe: bool = True,
+    ) -> list[tuple[str, float]]:
+        """
+        Top-k (entry_id, cosine similarity), best first.
+
+        query: a vector, or the entry_id of a stored entry ("find similar" —
+        the entry itself is excluded).
+        """
+        exclude = None
+        if isinstance(query, str):
+            exclude = self._rows[query]
+            query = self._vectors[exclude]
+        q = np.asarray(query, dtype=np.float32)
+        if self._count == 0 or k <= 0:
+            return []
+
+        if approximate:
+            rows = self._lsh_candidates(q, probe)
+        else:
+            rows = None
+        vectors = self.matrix if rows is None else self._vectors[rows]
+        norms = self._norms[:self._count] if rows is None else self._norms[rows]
+
+        scores = vectors @ q
+        scores /= np.maximum(norms * np.linalg.norm(q), 1e-12)
+        if exclude is not None:
+            scores[(rows == exclude) if rows is not None else exclude] = -np.inf
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        found = rows[top] if rows is not None else top
+        return [
+            (self._entries[row].entry_id, float(score))
+            for row, score in zip(found, scores[top]) if score != -np.inf
+        ]
+
+    def build_lsh(self, n_bits: int = 16, n_tables: int = 4, seed: int = 0):
+        """Hash every stored vector into n_tables random-hyperplane tables (n_bits <= 62)."""
+        rng = np.random.default_rng(seed)
+        self._lsh = {
+            "planes": rng.standard_normal((n_tables, self.dim or 0, n_bits)).astype(np.float32),
+            "weights": 1 << np.arange(n_bits, dtype=np.int64),
+        }
+        self._hash_rows()
+
+    def _hash_rows(self):
+        """(Re)build the bucket tables for all rows with the current hyperplanes."""
+        self._lsh["tables"] = []
+        for table_codes in self._lsh_codes(self.matrix):
+            order = np.argsort(table_codes, kind="stable")
+            unique, starts = np.unique(table_codes[order], return_index=True)
+            self._lsh["tables"].append(dict(zip(unique.tolist(), np.split(order, starts[1:]))))
+        self._lsh_rows = self._count
+
+    def _lsh_codes(self, vectors: np.ndarray) -> np.ndarray:
+        """Bucket code of each vector in each table, (n_tables, len(vectors))."""
+        bits = np.einsum("nd,tdb->tnb", vectors, self._lsh["planes"]) > 0
+        return bits.astype(np.int64) @ self._lsh["weights"]
+
+    def _lsh_candidates(self, q: np.ndarray, probe: bool) -> np.ndarray:
+        if self._lsh is None:
+            self.build_lsh()
+        elif self._lsh_rows != self._count:
+            self._hash_rows()
+
+        codes = self._lsh_codes(q[None, :])[:, 0]
+        flips = [0] + (self._lsh["weights"].tolist() if probe else [])
+        found = [
+            table[code ^ flip]
+            for table, code in zip(self._lsh["tables"], codes.tolist())
+            for flip in flips if (code ^ flip) in table
+        ]
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+
 class InterpolationDatabase:
-    """Stores interpolation results and tracks quality scores."""
+    """
+    Stores interpolation results and tracks quality scores.
+
+    Embeddings are appended as raw little-endian float32 to
+    {domain}_interpolations.f32 and memory-mapped on read. The JSONL file
+    keeps everything else, one line per result, with the embedding's element
+    offset and length in the vector file. Lines written with the embedding
+    inline (the previous format) are still read.
+
+    save() holds an exclusive flock on the vector file while it appends to
+    both files, so several processes can save to one database and every
+    line's offset points at its own vector.
+    """
 
     def __init__(self, domain: str):
         self.domain = domain
         self.db_file = EMBEDDINGS_DIR / f"{domain}_interpolations.jsonl"
+        self.vector_file = EMBEDDINGS_DIR / f"{domain}_interpolations.f32"
+        self._mapped: Optional[np.ndarray] = None
+        self._mapped_size = 0
 
     def save(self, result: InterpolationResult, quality_score: Optional[float] = None):
         """Save interpolation result with optional quality score."""
         result.quality_score = quality_score
-        with open(self.db_file, "a") as f:
-            f.write(json.dumps(asdict(result)) + "\n")
+        vector = np.asarray(result.embedding, dtype=VECTOR_DTYPE)
+
+        record = asdict(result)
+        del record["embedding"]
+
+        with open(self.vector_file, "ab") as f:
+            if fcntl is not None:
+                # Offset read, vector append and metadata append are one step for other writers
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                end = f.seek(0, os.SEEK_END)
+                if end % VECTOR_DTYPE.itemsize:  # torn earlier write: realign
+                    padding = VECTOR_DTYPE.itemsize - end % VECTOR_DTYPE.itemsize
+                    f.write(b"\0" * padding)
+                    end += padding
+                f.write(vector.tobytes())
+                f.flush()
+
+                record["embedding_offset"] = end // VECTOR_DTYPE.itemsize
+                record["embedding_dim"] = len(vector)
+                with open(self.db_file, "a") as db:
+                    db.write(json.dumps(record) + "\n")
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _vectors(self) -> np.ndarray:
+        """The vector file as a flat float32 array (re-mapped when the file has grown)."""
+        try:
+            size = self.vector_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if self._mapped is None or size != self._mapped_size:
+            count = size // VECTOR_DTYPE.itemsize
+            self._mapped = (np.memmap(self.vector_file, dtype=VECTOR_DTYPE, mode="r", shape=(count,))
+                            if count else np.empty(0, dtype=VECTOR_DTYPE))
+            self._mapped_size = size
+        return self._mapped
+
+    def iter_records(self) -> Iterator[dict]:
+        """Stream the metadata lines as dicts; embeddings are not read."""
+        for data in iter_jsonl(self.db_file):
+            if isinstance(data, dict):
+                yield data
+
+    def _embedding(self, record: dict, vectors: np.ndarray) -> Optional[np.ndarray]:
+        if "embedding" in record:
+            return np.asarray(record["embedding"], dtype=np.float32)
+        try:
+            offset, dim = int(record["embedding_offset"]), int(record["embedding_dim"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        vector = vectors[offset:offset + dim]
+        return vector if len(vector) == dim and offset >= 0 else None
+
+    def _to_result(self, record: dict, vectors: np.ndarray) -> Optional[InterpolationResult]:
+        embedding = self._embedding(record, vectors)
+        if embedding is None:
+            return None
+        data = {k: v for k, v in record.items() if k not in ("embedding_offset", "embedding_dim")}
+        data["embedding"] = record["embedding"] if "embedding" in record else embedding.tolist()
+        try:
+            return InterpolationResult(**data)
+        except TypeError:
+            return None
+
+    def iter_all(self) -> Iterator[InterpolationResult]:
+        """Stream interpolation results one at a time, skipping corrupt lines."""
+        vectors = self._vectors()
+        for record in self.iter_records():
+            result = self._to_result(record, vectors)
+            if result is not None:
+                yield result
 
     def load_all(self) -> list[InterpolationResult]:
         """Load all interpolation results."""
-        if not self.db_file.exists():
-            return []
-        results = []
-        with open(self.db_file) as f:
-            for line in f:
-                try:
-                    data = json.loads(line.strip())
-                    results.append(InterpolationResult(**data))
-                except Exception:
-                    pass
-        return results
+        return list(self.iter_all())
+
+    def quality_scores(self, records: Optional[list[dict]] = None) -> np.ndarray:
+        """Quality score per record in file order (NaN where unrated)."""
+        records = self.iter_records() if records is None else records
+        return np.fromiter(
+            (r["quality_score"] if isinstance(r.get("quality_score"), (int, float)) else np.nan
+             for r in records),
+            dtype=np.float64,
+        )
+
+    def embeddings(self, with_index: bool = False) -> Union[np.ndarray, tuple[np.ndarray, np.ndarray]]:
+        """
+        All embeddings as an (n, dim) float32 matrix; row i belongs to record
+        i, the same order as quality_scores().
+
+        Zero-copy view of the mapped file when the records' vectors are
+        stored back to back with one dimension; otherwise gathered. A record
+        whose vector cannot be read (truncated vector file) raises ValueError,
+        since dropping it would shift every later row. with_index=True skips
+        such records instead and returns (matrix, record indices).
+        """
+        vectors = self._vectors()
+        records = list(self.iter_records())
+        offsets = [r.get("embedding_offset") for r in records]
+        dims = {r.get("embedding_dim") for r in records}
+        if records and None not in offsets and len(dims) == 1:
+            dim, first = dims.pop(), offsets[0]
+            if offsets == list(range(first, first + dim * len(records), dim)) \
+                    and first + dim * len(records) <= len(vectors):
+                matrix = vectors[first:first + dim * len(records)].reshape(len(records), dim)
+                return (matrix, np.arange(len(records))) if with_index else matrix
+
+        rows, index = [], []
+        for i, record in enumerate(records):
+            embedding = self._embedding(record, vectors)
+            if embedding is None:
+                if not with_index:
+                    raise ValueError(f"{self.db_file}: record {i} has no readable embedding")
+                continue
+            rows.append(embedding)
+            index.append(i)
+        matrix = np.stack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+        return (matrix, np.asarray(index, dtype=np.intp)) if with_index else matrix
 
     def get_high_quality(self, min_score: float = 0.7) -> list[InterpolationResult]:
-        """Return interpolations rated above quality threshold."""
-        all_results = self.load_all()
-        return [r for r in all_results if r.quality_score and r.quality_score >= min_score]
+        """Return interpolations rated above quality threshold (one streaming pass)."""
+        vectors = self._vectors()
+        results = []
+        for record in self.iter_records():
+            score = record.get("quality_score")
+            # Unrated and zero scores never qualify, as before
+            if not isinstance(score, (int, float)) or not score or not score >= min_score:
+                continue
+            result = self._to_result(record, vectors)
+            if result is not None:
+                results.append(result)
+        return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,243 @@
+"""
+Buffered Append-Only Log Writer + Streaming Readers
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Shared writer for the JSONL/CSV logs that grow on every request (CPO
+triplets, conflicts, knowledge gaps). Lines are buffered in memory and
+appended in one open/write/close per batch instead of one per line.
+
+iter_jsonl() and iter_lines_reversed() read those logs back in constant
+memory: front to back one line at a time, or back to front in fixed-size
+chunks for "last n entries" queries on multi-GB files.
+
+Flush triggers:
+    - max_lines buffered lines or max_bytes buffered characters
+    - every flush_interval seconds while lines are pending (daemon thread)
+    - interpreter exit (atexit) and explicit flush()/flush_all()
+
+max_lines=1 (the default) writes every line through immediately.
+process_safe=True takes an exclusive flock around each append so several
+processes can share one file; lines are always written whole, in order.
+
+SELF-CORRECTION BLOCK:
+    What Could Break:
+      1. Process killed with SIGKILL — buffered lines are lost (keep max_lines small)
+      2. Forked child inherits the parent's buffer — cleared in the child after fork
+      3. File deleted/rotated between flushes — reopened per flush, header rewritten
+    How to Test:
+      pytest tests/test_log_writer.py -v
+"""
+
+import atexit
+import csv
+import io
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: process_safe falls back to O_APPEND writes
+    fcntl = None
+
+
+# Writers holding unflushed lines; a strong reference keeps them alive until flushed
+_pending_writers: set["BufferedLogWriter"] = set()
+_shared_writers: dict[Path, "BufferedLogWriter"] = {}
+_shared_lock = threading.Lock()
+
+
+def iter_jsonl(path: Path) -> Iterator[Any]:
+    """Yield each parsed line of a JSONL file, skipping blank and corrupt lines."""
+    try:
+        f = open(path)
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def iter_lines_reversed(path: Path, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Yield a file's lines last to first, reading fixed-size chunks from the end."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        partial = b""
+        while position > 0:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + partial).split(b"\n")
+            # lines[0] may continue in the previous chunk; keep it for the next read
+            partial = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.decode("utf-8", errors="replace")
+        if partial:
+            yield partial.decode("utf-8", errors="replace")
+
+
+def csv_line(row: list) -> str:
+    """Render one row exactly as csv.writer would write it to a file."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+class BufferedLogWriter:
+    """Thread-safe buffered appender for one line-oriented log file."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_lines: int = 1,
+        max_bytes: int = 1 << 20,
+        flush_interval: float = 1.0,
+        process_safe: bool = False,
+        header: Optional[str] = None,
+    ):
+        self.path = Path(path)
+        self.max_lines = max(1, max_lines)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.process_safe = process_safe
+        self.header = header  # written first whenever the file is empty
+        self.lines_written = 0
+        self.flushes = 0
+        self._buffer: list[str] = []
+        self._buffered_bytes = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls, path: Path, **options) -> "BufferedLogWriter":
+        """
+        Return the process-wide writer for path, creating it with options.
+        Every caller appending to the same file shares one buffer and lock,
+        so lines keep their order. Options of later calls are ignored.
+        """
+        key = Path(path).resolve()
+        with _shared_lock:
+            writer = _shared_writers.get(key)
+            if writer is None:
+                writer = _shared_writers[key] = cls(path, **options)
+            return writer
+
+    # ─── Writing ──────────────────────────────────────────────────────────
+
+    def write(self, line: str):
+        """Append one line (a trailing newline is added if missing)."""
+        if not line.endswith("\n"):
+            line += "\n"
+        with self._lock:
+            self._buffer.append(line)
+            self._buffered_bytes += len(line)
+            if len(self._buffer) >= self.max_lines or self._buffered_bytes >= self.max_bytes:
+                self._flush_locked()
+                return
+            _pending_writers.add(self)
+        self._ensure_flusher()
+
+    def write_json(self, record: Any):
+        self.write(json.dumps(record) + "\n")
+
+    def write_row(self, row: list):
+        self.write(csv_line(row))
+
+    def flush(self) -> int:
+        """Append every buffered line to the file; return how many were written."""
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        if not self._buffer:
+            return 0
+        lines, self._buffer, self._buffered_bytes = self._buffer, [], 0
+        _pending_writers.discard(self)
+
+        # newline="" so CSV "\r\n" terminators are written untranslated
+        try:
+            f = open(self.path, "a", newline="")
+        except FileNotFoundError:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(self.path, "a", newline="")
+        with f:
+            if self.process_safe and fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                # The end offset doubles as the emptiness check: no separate exists() stat
+                add_header = bool(self.header) and f.seek(0, os.SEEK_END) == 0
+                f.write("".join([self.header, *lines] if add_header else lines))
+                f.flush()
+            finally:
+                if self.process_safe and fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        self.lines_written += len(lines)
+        self.flushes += 1
+        return len(lines)
+
+    # ─── Periodic flush ───────────────────────────────────────────────────
+
+    def _ensure_flusher(self):
+        if self.flush_interval <= 0 or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name="log-writer-flush", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._wakeup.wait(self.flush_interval):
+            self.flush()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def close(self):
+        """Flush and stop the periodic flusher."""
+        self._wakeup.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self._flusher = None
+        self._wakeup = threading.Event()
+        self.flush()
+
+    def _reset_after_fork(self):
+        # The parent still owns these lines; writing them here would duplicate them
+        self._buffer, self._buffered_bytes = [], 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+
+
+def flush_all():
+    """Flush every writer with pending lines (registered to run at interpreter exit)."""
+    for writer in list(_pending_writers):
+        writer.flush()
+
+
+def _reset_all_after_fork():
+    global _shared_lock
+    _shared_lock = threading.Lock()
+    for writer in [*_pending_writers, *_shared_writers.values()]:
+        writer._reset_after_fork()
+    _pending_writers.clear()
+
+
+atexit.register(flush_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_all_after_fork)
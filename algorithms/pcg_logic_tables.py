@@ -13,6 +13,7 @@ SELF-CORRECTION BLOCK:
       1. Generated content violates game physics (impossible jumps)
       2. Logic rules conflict (rule A says yes, rule B says no)
       3. Output too predictable — players notice the patterns
+      4. A rule's condition edited in place after match() — call LogicTable.invalidate()
     How to Test:
       pytest tests/test_pcg_logic_tables.py -v
     How to Fix:
@@ -22,11 +23,21 @@ SELF-CORRECTION BLOCK:
 """
 
 import json
+import math
 import random
+import sqlite3
+import concurrent.futures
+import numpy as np
+from bisect import bisect_right
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Iterable, Iterator, Literal, Optional
+
+try:
+    from algorithms.log_writer import iter_jsonl
+except ImportError:  # run as a script: python algorithms/pcg_logic_tables.py
+    from log_writer import iter_jsonl
 
 
 @dataclass
@@ -51,49 +62,329 @@ class GeneratedAsset:
     quality_score: Optional[float] = None
 
 
+# Level element layouts for PlatformerLevelGenerator.generate_many(); one row per element
+PLATFORM_DTYPE = np.dtype([("x", np.int32), ("y", np.int32), ("length", np.int32)])
+ENTITY_DTYPE = np.dtype([("x", np.int32), ("y", np.int32)])
+LEVEL_ELEMENTS = {"platforms": None, "enemies": "basic", "collectibles": "coin", "hazards": "spike"}
+
+
+@dataclass
+class LevelBatch:
+    """
+    N platformer levels as NumPy structured arrays.
+
+    Each element kind (platforms, enemies, collectibles, hazards) is one
+    array holding every level's rows back to back; offsets[kind][i] and
+    offsets[kind][i + 1] delimit level i. Level i was generated from
+    SeedSequence(seed, spawn_key=(i,)), so it is the same whatever n, the
+    worker count, or which slice of the batch produced it.
+    """
+    difficulty: str
+    length: int
+    seed: int
+    elements: dict[str, np.ndarray]   # kind -> PLATFORM_DTYPE / ENTITY_DTYPE rows
+    offsets: dict[str, np.ndarray]    # kind -> (n + 1,) int64 row offsets
+    rule: Optional[LogicRule]         # highest-priority matching rule (None: default layout)
+    rules_applied: list[str]
+
+    def __len__(self) -> int:
+        return len(self.offsets["platforms"]) - 1
+
+    def level(self, index: int) -> dict[str, np.ndarray]:
+        """One level's element arrays (views into the batch)."""
+        return {kind: rows[self.offsets[kind][index]:self.offsets[kind][index + 1]]
+                for kind, rows in self.elements.items()}
+
+    def to_dict(self, index: int) -> dict:
+        """One level in the properties format PlatformerLevelGenerator.generate() returns."""
+        properties = {"length": self.length}
+        for kind, rows in self.level(index).items():
+            entity_type = LEVEL_ELEMENTS[kind]
+            if entity_type is None:
+                properties[kind] = [{"x": x, "y": y, "length": n} for x, y, n in rows.tolist()]
+            else:
+                properties[kind] = [{"x": x, "y": y, "type": entity_type} for x, y in rows.tolist()]
+        if self.rule is not None:
+            properties["requires_precise_jumps"] = self.rule.action.get("jump_required", False)
+            properties["has_moving_platforms"] = self.rule.action.get("moving_platforms", False)
+        return properties
+
+    def to_assets(self) -> list[GeneratedAsset]:
+        """Every level as a GeneratedAsset (dict conversion happens here, not during generation)."""
+        stamp = datetime.utcnow()
+        prefix = f"platformer_{self.difficulty if self.rule else 'default'}_{stamp.strftime('%Y%m%d%H%M%S')}"
+        return [
+            GeneratedAsset(
+                asset_id=f"{prefix}_{self.seed}_{i}",
+                asset_type="level",
+                genre="platformer",
+                properties=self.to_dict(i),
+                rules_applied=self.rules_applied,
+                created_at=stamp.isoformat(),
+            )
+            for i in range(len(self))
+        ]
+
+
 LOGIC_TABLES_DIR = Path("databases/game_dev/pcg_logic_tables")
 LOGIC_TABLES_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _condition_met(expected_value, actual_value) -> bool:
+    """One condition: {"min", "max"} dicts are inclusive ranges, anything else must be equal."""
+    # Handle ranges for numeric values
+    if isinstance(expected_value, dict) and "min" in expected_value:
+        return expected_value.get("min", float('-inf')) <= actual_value <= expected_value.get("max", float('inf'))
+    # Exact match for strings/simple values
+    return actual_value == expected_value
+
+
+def _is_real(value) -> bool:
+    return isinstance(value, (int, float)) and not math.isnan(value)
+
+
+def _is_hashable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class IntervalIndex:
+    """
+    Static centered interval tree over inclusive [low, high] ranges.
+
+    stab(x) returns the ids of every range containing x in O(log n + hits):
+    each node keeps the ranges that straddle its center sorted by low and by
+    high, so a query scans only the ranges it reports (plus one miss per node).
+    """
+
+    def __init__(self, ranges: list[tuple[float, float, int]]):
+        self.size = len(ranges)
+        self._root = self._build(ranges)
+
+    @classmethod
+    def _build(cls, ranges):
+        if not ranges:
+            return None
+        bounds = sorted(b for low, high, _ in ranges for b in (low, high))
+        center = bounds[len(bounds) // 2]
+        left = [r for r in ranges if r[1] < center]
+        right = [r for r in ranges if r[0] > center]
+        here = [r for r in ranges if r[0] <= center <= r[1]]
+        by_low = sorted((low, rid) for low, _, rid in here)
+        by_high = sorted(((high, rid) for _, high, rid in here), reverse=True)
+        return center, by_low, by_high, cls._build(left), cls._build(right)
+
+    def stab(self, x) -> list[int]:
+        hits = []
+        node = self._root
+        while node is not None:
+            center, by_low, by_high, left, right = node
+            if x < center:
+                for low, rid in by_low:
+                    if low > x:
+                        break
+                    hits.append(rid)
+                node = left
+            elif x > center:
+                for high, rid in by_high:
+                    if high < x:
+                        break
+                    hits.append(rid)
+                node = right
+            else:
+                hits.extend(rid for _, rid in by_low)
+                break
+        return hits
+
+
+class _RuleGroup:
+    """Rules sharing one condition layout: the same keys, each compared the same way."""
+
+    def __init__(self, layout: tuple[tuple[str, str], ...]):
+        self.keys = frozenset(key for key, _ in layout)
+        self.exact_keys = tuple(key for key, kind in layout if kind == "exact")
+        self.range_keys = [key for key, kind in layout if kind == "range"]
+        self.other_keys = [key for key, kind in layout if kind == "other"]
+        # Remaining checks once the bucket (and the first range key, if any) has narrowed things down
+        self.checks = self.range_keys[1:] + self.other_keys
+        # exact values (in exact_keys order) -> rule ids, plus spans/IntervalIndex of the first range key
+        self.buckets: dict[tuple, list[int]] = {}
+        self.spans: dict[tuple, list[tuple[float, float, int]]] = {}
+        self.ranges: dict[tuple, IntervalIndex] = {}
+
+
+class RuleIndex:
+    """
+    Compiled matcher for a priority-sorted rule list.
+
+    Rules are identified by their position in that list, so sorting the ids
+    of the matching rules gives them back in priority order. Rules are
+    grouped by condition layout (which keys, and for each key whether it is
+    a hashable exact value, a numeric {"min", "max"} range, or anything
+    else). Within a group:
+
+        exact  — one hash lookup on the tuple of the context's values for
+                 the group's exact keys finds the only rules that can match
+        ranges — an IntervalIndex per bucket on the first range key narrows
+                 that bucket to the rules whose range contains the value
+        rest   — further ranges and "other" conditions (unhashable or NaN
+                 values, non-numeric bounds) are checked per candidate with
+                 the same comparison as before
+
+    A group whose keys are not all in the context is skipped outright.
+    A non-numeric context value never satisfies a numeric range (the per-rule
+    comparison used to raise TypeError for it).
+    """
+
+    def __init__(self, rules: list[LogicRule]):
+        self.rules = rules
+        groups: dict[tuple, _RuleGroup] = {}
+        for rid, rule in enumerate(rules):
+            condition = rule.condition
+            layout = tuple(sorted((key, self._kind(expected)) for key, expected in condition.items()))
+            group = groups.get(layout)
+            if group is None:
+                group = groups[layout] = _RuleGroup(layout)
+            values = tuple(condition[key] for key in group.exact_keys)
+            group.buckets.setdefault(values, []).append(rid)
+            if group.range_keys:
+                bounds = condition[group.range_keys[0]]
+                group.spans.setdefault(values, []).append((bounds["min"], bounds.get("max", float('inf')), rid))
+        for group in groups.values():
+            group.ranges = {values: IntervalIndex(spans) for values, spans in group.spans.items()}
+            group.spans = {}
+        self.groups = list(groups.values())
+
+    @staticmethod
+    def _kind(expected) -> str:
+        if isinstance(expected, dict) and "min" in expected:
+            if _is_real(expected["min"]) and _is_real(expected.get("max", float('inf'))):
+                return "range"
+            return "other"
+        if _is_hashable(expected) and not (isinstance(expected, float) and math.isnan(expected)):
+            # (NaN equals nothing, but a dict lookup would find the same NaN object)
+            return "exact"
+        return "other"
+
+    def match(self, context: dict) -> list[LogicRule]:
+        rules = self.rules
+        present = context.keys()
+        matched: list[int] = []
+        for group in self.groups:
+            if not present >= group.keys:
+                continue
+            if group.range_keys and not all(_is_real(context[key]) for key in group.range_keys):
+                continue
+
+            values = tuple([context[key] for key in group.exact_keys])
+            try:
+                candidates = group.buckets.get(values)
+            except TypeError:  # unhashable context value equals no hashable condition
+                continue
+            if candidates is None:
+                continue
+            if group.range_keys:
+                candidates = group.ranges[values].stab(context[group.range_keys[0]])
+            if group.checks:
+                candidates = [rid for rid in candidates
+                              if all(_condition_met(rules[rid].condition[key], context[key])
+                                     for key in group.checks)]
+            matched.extend(candidates)
+
+        matched.sort()
+        return [rules[rid] for rid in matched]
+
+
+class _RuleList(list):
+    """A LogicTable's rule list: every mutation drops the table's compiled index."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table: "LogicTable", rules: Iterable[LogicRule] = ()):
+        super().__init__(rules)
+        self._table = table
+
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        table = getattr(self, "_table", None)  # unset while unpickling refills the list
+        if table is not None:
+            table.invalidate()
+        return result
+
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_RuleList, _name, _invalidating(_name))
+
+
 class LogicTable:
     """
     A table of rules for procedural generation.
 
     Rules are applied in priority order. If multiple rules match,
-    highest priority wins.
+    highest priority wins (ties keep insertion order).
+
+    match() uses a RuleIndex built on first use after the rules change.
+    self.rules is a list that invalidates the index on any change (append,
+    item assignment, removal, sort, or assigning a new list); editing a
+    rule's condition in place needs invalidate().
     """
 
     def __init__(self, domain: str):
         self.domain = domain
-        self.rules: list[LogicRule] = []
+        self._index: Optional[RuleIndex] = None
+        self.rules = []
         self.table_file = LOGIC_TABLES_DIR / f"{domain}_rules.json"
 
+    @property
+    def rules(self) -> list[LogicRule]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: Iterable[LogicRule]):
+        self._rules = _RuleList(self, rules)
+        self.invalidate()
+
     def add_rule(self, rule: LogicRule):
         """Add a rule to the table."""
-        self.rules.append(rule)
+        # After every rule of equal or higher priority: same order as append + stable sort
+        position = bisect_right(self.rules, -rule.priority, key=lambda r: -r.priority)
+        self.rules.insert(position, rule)
+
+    def add_rules(self, rules: Iterable[LogicRule]):
+        """Add many rules with a single sort."""
+        self.rules.extend(rules)
         self.rules.sort(key=lambda r: r.priority, reverse=True)
 
+    def invalidate(self):
+        """Drop the compiled index; the next match() rebuilds it."""
+        self._index = None
+
+    def _compiled(self) -> RuleIndex:
+        if self._index is None:
+            self._index = RuleIndex(self.rules)
+        return self._index
+
     def match(self, context: dict) -> list[LogicRule]:
-        """Find all rules that match the given context."""
-        matched = []
-        for rule in self.rules:
-            if self._conditions_met(rule.condition, context):
-                matched.append(rule)
-        return matched
+        """Find all rules that match the given context, highest priority first."""
+        return self._compiled().match(context)
 
     def _conditions_met(self, conditions: dict, context: dict) -> bool:
         """Check if all conditions are met by the context."""
         for key, expected_value in conditions.items():
             if key not in context:
                 return False
-            actual_value = context[key]
-
-            # Handle ranges for numeric values
-            if isinstance(expected_value, dict) and "min" in expected_value:
-                if not (expected_value.get("min", float('-inf')) <= actual_value <= expected_value.get("max", float('inf'))):
-                    return False
-            # Exact match for strings/simple values
-            elif actual_value != expected_value:
+            if not _condition_met(expected_value, context[key]):
                 return False
 
         return True
@@ -110,8 +401,72 @@ class LogicTable:
             return
         with open(self.table_file) as f:
             data = json.load(f)
-        self.rules = [LogicRule(**r) for r in data]
-        self.rules.sort(key=lambda r: r.priority, reverse=True)
+        self.rules = sorted((LogicRule(**r) for r in data), key=lambda r: r.priority, reverse=True)
+
+
+def _level_draw_layout(action: dict, length: int) -> tuple[np.ndarray, np.ndarray, dict[str, slice]]:
+    """
+    Inclusive (low, high) bounds of every integer one level draws, and where each part sits.
+
+    Only platform placement is random in count, and it is bounded: every
+    platform advances x by at least 3 + min spacing, so that many
+    (spacing, length) pairs always suffice and the extra ones are dropped.
+    """
+    spacing = action.get("platform_spacing", {"min": 3, "max": 5})
+    parts = [
+        ("spacing", length // max(3 + spacing["min"], 1) + 1, spacing["min"], spacing["max"]),
+        ("platform_length", length // max(3 + spacing["min"], 1) + 1, 3, 6),
+        ("enemies", int(length * action.get("enemy_density", 0.3) / 10), 0, length),
+        ("collectibles_x", max(3, length // 10) if action.get("collectibles") else 0, 0, length),
+        ("collectibles_y", max(3, length // 10) if action.get("collectibles") else 0, 0, 5),
+        ("hazards", length // 15 if action.get("spike_hazards") else 0, 0, length),
+    ]
+    lows, highs, layout, start = [], [], {}, 0
+    for name, count, low, high in parts:
+        lows.append(np.full(count, low, dtype=np.int64))
+        highs.append(np.full(count, high, dtype=np.int64))
+        layout[name] = slice(start, start + count)
+        start += count
+    return np.concatenate(lows), np.concatenate(highs), layout
+
+
+def _draw_levels(lows: np.ndarray, highs: np.ndarray, seed: int, start: int, stop: int) -> np.ndarray:
+    """One row of draws per level start..stop-1, each from its own seeded Generator."""
+    uniforms = np.empty((stop - start, len(lows)))
+    for row, index in enumerate(range(start, stop)):
+        np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,))).random(out=uniforms[row])
+    # Scale to the inclusive integer ranges for all levels at once
+    return lows + (uniforms * (highs - lows + 1)).astype(np.int64)
+
+
+def _entity_rows(x: np.ndarray, y=0) -> np.ndarray:
+    rows = np.empty(x.size, dtype=ENTITY_DTYPE)
+    rows["x"] = x.ravel()
+    rows["y"] = y.ravel() if isinstance(y, np.ndarray) else y
+    return rows
+
+
+def _assemble_levels(draws: np.ndarray, layout: dict[str, slice], length: int):
+    """Turn the (levels, draws) matrix into element arrays + offsets, all levels at once."""
+    n = len(draws)
+    spacing, platform_length = draws[:, layout["spacing"]], draws[:, layout["platform_length"]]
+    x = np.zeros_like(platform_length)
+    np.cumsum((platform_length + spacing)[:, :-1], axis=1, out=x[:, 1:])
+    keep = x < length  # x only grows along a row, so each level keeps a prefix
+    platforms = np.empty(int(keep.sum()), dtype=PLATFORM_DTYPE)
+    platforms["x"], platforms["y"], platforms["length"] = x[keep], 0, platform_length[keep]
+
+    elements = {
+        "platforms": platforms,
+        "enemies": _entity_rows(draws[:, layout["enemies"]]),
+        "collectibles": _entity_rows(draws[:, layout["collectibles_x"]], draws[:, layout["collectibles_y"]]),
+        "hazards": _entity_rows(draws[:, layout["hazards"]]),
+    }
+    offsets = {"platforms": np.concatenate(([0], np.cumsum(keep.sum(axis=1))))}
+    for kind, name in [("enemies", "enemies"), ("collectibles", "collectibles_x"), ("hazards", "hazards")]:
+        per_level = layout[name].stop - layout[name].start
+        offsets[kind] = np.arange(n + 1, dtype=np.int64) * per_level
+    return elements, offsets
 
 
 class PlatformerLevelGenerator:
@@ -198,6 +553,44 @@ class PlatformerLevelGenerator:
             created_at=datetime.utcnow().isoformat(),
         )
 
+    def generate_many(self, difficulty: str, length: int = 50, n: int = 1,
+                      seed: Optional[int] = None, workers: int = 1) -> LevelBatch:
+        """
+        Generate n platformer levels as NumPy arrays (see LevelBatch).
+
+        Same rules and layout as generate(), but level i draws from its own
+        Generator seeded with SeedSequence(seed, spawn_key=(i,)): a batch is
+        reproducible from its seed (None picks one; it is kept in
+        LevelBatch.seed), and with workers > 1 the draws for contiguous
+        level ranges are made in a process pool with identical results.
+        Convert with LevelBatch.to_dict()/to_assets() only where dicts are needed.
+        """
+        seed = np.random.SeedSequence(seed).entropy
+        matched_rules = self.logic_table.match({"difficulty": difficulty})
+        if not matched_rules:
+            # Fallback: the fixed medium-difficulty layout, repeated
+            default = self._generate_default(length).properties
+            platforms = np.array([(p["x"], p["y"], p["length"]) for p in default["platforms"]], dtype=PLATFORM_DTYPE)
+            elements = {kind: np.tile(platforms if kind == "platforms" else np.empty(0, ENTITY_DTYPE), n)
+                        for kind in LEVEL_ELEMENTS}
+            offsets = {kind: np.arange(n + 1, dtype=np.int64) * (len(platforms) if kind == "platforms" else 0)
+                       for kind in LEVEL_ELEMENTS}
+            return LevelBatch(difficulty, length, seed, elements, offsets, None, ["default"])
+
+        lows, highs, layout = _level_draw_layout(matched_rules[0].action, length)
+        if workers > 1 and n > workers:
+            bounds = np.linspace(0, n, workers + 1, dtype=int)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = [pool.submit(_draw_levels, lows, highs, seed, start, stop)
+                         for start, stop in zip(bounds[:-1], bounds[1:])]
+                draws = np.concatenate([part.result() for part in parts])
+        else:
+            draws = _draw_levels(lows, highs, seed, 0, n)
+
+        elements, offsets = _assemble_levels(draws, layout, length)
+        return LevelBatch(difficulty, length, seed, elements, offsets, matched_rules[0],
+                          [r.rule_id for r in matched_rules])
+
     def _apply_rule(self, rule: LogicRule, length: int) -> dict:
         """Apply a rule to generate level structure."""
         action = rule.action
@@ -340,31 +733,155 @@ class LootGenerator:
 
 
 class PCGDatabase:
-    """Stores generated assets for review and reuse."""
+    """
+    Stores generated assets for review and reuse.
 
-    def __init__(self):
-        self.db_file = LOGIC_TABLES_DIR / "generated_assets.jsonl"
+    Append-only SQLite table with indexes on (asset_type, quality_score),
+    (genre, quality_score) and quality_score, so quality queries and
+    filtered scans read only matching rows. properties and rules_applied
+    are stored as JSON text. A database created next to a legacy
+    generated_assets.jsonl imports it once; the JSONL file is left as is.
+
+    The sqlite3 connection belongs to the thread that opened the database:
+    use one PCGDatabase per thread (WAL lets them read while another
+    writes). Close it with close() or use it as a context manager.
+    """
+
+    COLUMNS = "asset_id, asset_type, genre, properties, rules_applied, created_at, quality_score"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS assets (
+            id INTEGER PRIMARY KEY,
+            asset_id TEXT NOT NULL,
+            asset_type TEXT NOT NULL,
+            genre TEXT NOT NULL,
+            properties TEXT NOT NULL,
+            rules_applied TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            quality_score REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_assets_type_quality ON assets(asset_type, quality_score);
+        CREATE INDEX IF NOT EXISTS idx_assets_genre_quality ON assets(genre, quality_score);
+        CREATE INDEX IF NOT EXISTS idx_assets_quality ON assets(quality_score);
+    """
+
+    def __init__(self, db_file: Optional[Path] = None):
+        self.db_file = db_file or LOGIC_TABLES_DIR / "generated_assets.sqlite"
+        self.legacy_file = self.db_file.with_suffix(".jsonl")
+        fresh = not self.db_file.exists()
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        if fresh and self.legacy_file.exists():
+            self.save_many(self._iter_legacy())
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "PCGDatabase":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _iter_legacy(self) -> Iterator[GeneratedAsset]:
+        for data in iter_jsonl(self.legacy_file):
+            try:
+                yield GeneratedAsset(**data)
+            except TypeError:
+                continue
+
+    @staticmethod
+    def _row(asset: GeneratedAsset) -> tuple:
+        return (asset.asset_id, asset.asset_type, asset.genre, json.dumps(asset.properties),
+                json.dumps(asset.rules_applied), asset.created_at, asset.quality_score)
+
+    @staticmethod
+    def _asset(row: tuple) -> GeneratedAsset:
+        asset_id, asset_type, genre, properties, rules_applied, created_at, quality_score = row
+        return GeneratedAsset(asset_id, asset_type, genre, json.loads(properties),
+                              json.loads(rules_applied), created_at, quality_score)
 
     def save(self, asset: GeneratedAsset):
-        with open(self.db_file, "a") as f:
-            f.write(json.dumps(asdict(asset)) + "\n")
+        self.save_many([asset])
+
+    def save_many(self, assets: Iterable[GeneratedAsset]) -> int:
+        """Append many assets in one transaction; returns how many were written."""
+        with self.conn:
+            cursor = self.conn.executemany(
+                f"INSERT INTO assets ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                map(self._row, assets),
+            )
+        return cursor.rowcount
+
+    @staticmethod
+    def _where(asset_type: Optional[str], genre: Optional[str],
+               min_score: Optional[float]) -> tuple[str, list]:
+        clauses, params = [], []
+        if asset_type is not None:
+            clauses.append("asset_type = ?")
+            params.append(asset_type)
+        if genre is not None:
+            clauses.append("genre = ?")
+            params.append(genre)
+        if min_score is not None:
+            # Unrated (NULL) and zero scores never qualify, as before
+            clauses.append("quality_score >= ? AND quality_score != 0")
+            params.append(min_score)
+        return " AND ".join(clauses) or "1", params
+
+    def iter_assets(self, asset_type: Optional[str] = None, genre: Optional[str] = None,
+                    min_score: Optional[float] = None, batch_size: int = 1000) -> Iterator[GeneratedAsset]:
+        """Stream matching assets in insertion order, batch_size rows at a time."""
+        where, params = self._where(asset_type, genre, min_score)
+        cursor = self.conn.execute(f"SELECT {self.COLUMNS} FROM assets WHERE {where} ORDER BY id", params)
+        while rows := cursor.fetchmany(batch_size):
+            yield from map(self._asset, rows)
+
+    def page(self, asset_type: Optional[str] = None, genre: Optional[str] = None,
+             min_score: Optional[float] = None, limit: int = 100,
+             after: int = 0) -> tuple[list[GeneratedAsset], Optional[int]]:
+        """
+        One page of matching assets in insertion order.
+
+        Returns (assets, cursor): pass cursor as `after` for the next page;
+        it is None after the last page. Pages seek by row id, so late pages
+        cost the same as early ones.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be >= 1, got {limit}")
+        where, params = self._where(asset_type, genre, min_score)
+        # One extra row tells whether another page follows
+        rows = self.conn.execute(
+            f"SELECT id, {self.COLUMNS} FROM assets WHERE {where} AND id > ? ORDER BY id LIMIT ?",
+            params + [after, limit + 1],
+        ).fetchall()
+        rows, more = rows[:limit], len(rows) > limit
+        return [self._asset(row[1:]) for row in rows], rows[-1][0] if more else None
+
+    def count(self, asset_type: Optional[str] = None, genre: Optional[str] = None,
+              min_score: Optional[float] = None) -> int:
+        where, params = self._where(asset_type, genre, min_score)
+        return self.conn.execute(f"SELECT COUNT(*) FROM assets WHERE {where}", params).fetchone()[0]
+
+    def best(self, limit: int = 10, asset_type: Optional[str] = None,
+             genre: Optional[str] = None) -> list[GeneratedAsset]:
+        """The highest-rated assets, best first."""
+        where, params = self._where(asset_type, genre, None)
+        rows = self.conn.execute(
+            f"SELECT {self.COLUMNS} FROM assets WHERE {where} AND quality_score IS NOT NULL"
+            f" ORDER BY quality_score DESC, id LIMIT ?",
+            params + [limit],
+        ).fetchall()
+        return [self._asset(row) for row in rows]
 
     def load_all(self) -> list[GeneratedAsset]:
-        if not self.db_file.exists():
-            return []
-        assets = []
-        with open(self.db_file) as f:
-            for line in f:
-                try:
-                    assets.append(GeneratedAsset(**json.loads(line.strip())))
-                except Exception:
-                    pass
-        return assets
-
-    def get_high_quality(self, min_score: float = 0.7) -> list[GeneratedAsset]:
+        return list(self.iter_assets())
+
+    def get_high_quality(self, min_score: float = 0.7, asset_type: Optional[str] = None,
+                         genre: Optional[str] = None) -> list[GeneratedAsset]:
         """Return assets rated above quality threshold."""
-        all_assets = self.load_all()
-        return [a for a in all_assets if a.quality_score and a.quality_score >= min_score]
+        return list(self.iter_assets(asset_type, genre, min_score))
 
 
 if __name__ == "__main__":
@@ -393,10 +910,6 @@ if __name__ == "__main__":
     print(f"Common loot: {common_drop.properties}")
 
     # Save to database
-    db = PCGDatabase()
-    db.save(easy_level)
-    db.save(hard_level)
-    db.save(boss_drop)
-    db.save(common_drop)
-
-    print(f"\nSaved {len(db.load_all())} assets to database")
+    with PCGDatabase() as db:
+        db.save_many([easy_level, hard_level, boss_drop, common_drop])
+        print(f"\nSaved {len(db.load_all())} assets to database")
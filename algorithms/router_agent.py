@@ -3,6 +3,8 @@ Router Agent — Decides which domain database to query.
 DRAFT ALPHA — REQUIRES TESTING AND ITERATION
 
 Uses keyword matching now; upgrade to embedding-based routing later.
+All domain keywords are compiled once into a single trie-shaped regex, so a
+query is scanned once regardless of how many keywords or domains exist.
 
 SELF-CORRECTION BLOCK:
     What Could Break:
@@ -61,22 +63,97 @@ DOMAIN_KEYWORDS: dict[str, list[str]] = {
 }
 
 
+def _trie_pattern(words: list[str]) -> str:
+    """Build a regex alternation shaped like a trie (longest match preferred)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A keyword ends here; the greedy optional still prefers longer keywords
+            body = "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class KeywordAutomaton:
+    """
+    Compiled multi-keyword matcher: one scan of the query finds every keyword
+    that occurs as a substring, including overlapping ones.
+
+    A zero-width lookahead tries the trie at every position and captures the
+    longest keyword starting there; shorter keywords starting at the same
+    position are exactly that keyword's keyword-prefixes, precomputed here.
+    """
+
+    def __init__(self, domain_keywords: dict[str, list[str]]):
+        self.domains = list(domain_keywords)
+        # keyword -> [(domain index, rank in that domain's list, keyword), ...]
+        postings: dict[str, list[tuple[int, int, str]]] = {}
+        for d, keywords in enumerate(domain_keywords.values()):
+            for rank, kw in enumerate(keywords):
+                postings.setdefault(kw, []).append((d, rank, kw))
+
+        # A hit on a keyword is also a hit on every keyword that is its prefix
+        keywords = sorted(postings)
+        self.expansions: dict[str, tuple[tuple[int, int, str], ...]] = {
+            kw: tuple(entry for other in keywords if kw.startswith(other) for entry in postings[other])
+            for kw in keywords
+        }
+        self.pattern = re.compile("(?=(" + _trie_pattern(keywords) + "))") if keywords else None
+
+    def scan(self, query: str) -> dict[str, list[str]]:
+        """Return matched keywords per domain (domain keyword order); only domains with hits."""
+        if self.pattern is None:
+            return {}
+        expansions = self.expansions
+        entries = sorted({e for kw in set(self.pattern.findall(query.lower())) for e in expansions[kw]})
+
+        hits: dict[str, list[str]] = {}
+        for d, _, kw in entries:
+            hits.setdefault(self.domains[d], []).append(kw)
+        return hits
+
+
+KEYWORD_AUTOMATON = KeywordAutomaton(DOMAIN_KEYWORDS)
+
+
 class RouterAgent:
     """Routes user queries to the correct domain database."""
 
+    def __init__(self, domain_keywords: Optional[dict[str, list[str]]] = None):
+        # Custom keyword tables get their own automaton; default shares the module one
+        self.automaton = KeywordAutomaton(domain_keywords) if domain_keywords else KEYWORD_AUTOMATON
+
     def route(self, query: str) -> RouteDecision:
         """Determine the best domain for a given query."""
-        query_lower = query.lower()
-        scores: dict[str, list[str]] = {d: [] for d in DOMAIN_KEYWORDS}
-
-        for domain, keywords in DOMAIN_KEYWORDS.items():
-            for kw in keywords:
-                if kw in query_lower:
-                    scores[domain].append(kw)
+        return self._decide(self.automaton.scan(query))
 
-        # Sort by match count
-        ranked = sorted(scores.items(), key=lambda x: len(x[1]), reverse=True)
-        best_domain, matched = ranked[0]
+    def route_batch(self, queries: list[str]) -> list[RouteDecision]:
+        """Route many queries (e.g. log replay); repeated queries are scanned once and share a decision."""
+        seen: dict[str, RouteDecision] = {}
+        decisions = []
+        for query in queries:
+            if query not in seen:
+                seen[query] = self.route(query)
+            decisions.append(seen[query])
+        return decisions
+
+    def _decide(self, scores: dict[str, list[str]]) -> RouteDecision:
+        """Pick the domain with the most keyword hits (first domain wins ties)."""
+        best_domain, matched = None, []
+        for domain, domain_matched in scores.items():
+            if len(domain_matched) > len(matched):
+                best_domain, matched = domain, domain_matched
 
         if not matched:
             return RouteDecision(
@@ -96,19 +173,15 @@ class RouterAgent:
 
     def route_multi(self, query: str, top_n: int = 2) -> list[RouteDecision]:
         """Return top N domain matches for cross-domain queries."""
-        query_lower = query.lower()
-        decisions = []
-
-        for domain, keywords in DOMAIN_KEYWORDS.items():
-            matched = [kw for kw in keywords if kw in query_lower]
-            if matched:
-                confidence = min(0.5 + len(matched) * 0.1, 0.99)
-                decisions.append(RouteDecision(
-                    domain=domain,
-                    confidence=confidence,
-                    strategy="keyword",
-                    keywords_matched=matched,
-                ))
+        decisions = [
+            RouteDecision(
+                domain=domain,
+                confidence=min(0.5 + len(matched) * 0.1, 0.99),
+                strategy="keyword",
+                keywords_matched=matched,
+            )
+            for domain, matched in self.automaton.scan(query).items()
+        ]
 
         decisions.sort(key=lambda d: d.confidence, reverse=True)
         return decisions[:top_n] if decisions else [
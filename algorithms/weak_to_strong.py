@@ -18,6 +18,10 @@ SELF-CORRECTION BLOCK:
       1. Weak model not actually "correct" — introduces systematic errors
       2. Strong model "forgets" weak model's corrections during training
       3. Distribution mismatch — weak model trained on different data than strong model
+      4. process_stream(workers > 1) builds a fresh pipeline per worker — rule edits made on
+         the parent's weak_model at runtime are not seen by the workers
+      5. A malformed <domain>/weak_labeling_rules.json raises ValueError when WeakModel is built
+      6. config/weak_labeling_rules.json missing — importing this module raises FileNotFoundError
     How to Test:
       pytest tests/test_weak_to_strong.py -v
     How to Fix:
@@ -27,10 +31,16 @@ SELF-CORRECTION BLOCK:
 """
 
 import json
+import operator
+import os
+import re
+import concurrent.futures
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Iterable, Iterator, Literal, Optional, Union
 import random
 
 
@@ -71,16 +81,219 @@ class SupervisionStats:
     verification_rate: float
 
 
+@dataclass
+class SupervisionCounters:
+    """Running totals behind SupervisionStats; chunk totals combine with merge()."""
+    total: int = 0
+    verified: int = 0
+    exported: int = 0
+    confidence_sum: float = 0.0
+    quality_sum: float = 0.0
+
+    def add(self, weak_label: WeakLabel, example: StrongTrainingExample, exported: bool = False):
+        self.total += 1
+        self.verified += example.verified
+        self.exported += exported
+        self.confidence_sum += weak_label.weak_confidence
+        self.quality_sum += example.quality_score
+
+    def merge(self, other: "SupervisionCounters") -> "SupervisionCounters":
+        self.total += other.total
+        self.verified += other.verified
+        self.exported += other.exported
+        self.confidence_sum += other.confidence_sum
+        self.quality_sum += other.quality_sum
+        return self
+
+    def to_stats(self, domain: str) -> SupervisionStats:
+        total = self.total or 1  # all averages are 0.0 for an empty run
+        return SupervisionStats(
+            domain=domain,
+            total_examples=self.total,
+            weak_labels_generated=self.total,
+            weak_labels_verified=self.verified,
+            avg_weak_confidence=self.confidence_sum / total,
+            avg_quality_score=self.quality_sum / total,
+            verification_rate=self.verified / total,
+        )
+
+
 SUPERVISION_DIR = Path("databases/weak_to_strong")
 SUPERVISION_DIR.mkdir(parents=True, exist_ok=True)
 
 
+RULES_FILENAME = "weak_labeling_rules.json"
+# Shipped labeling rules: {"generic": spec, "domains": {domain: spec}}. The file's _usage
+# key documents the spec format. db_path/<domain>/weak_labeling_rules.json overrides a domain.
+LABELING_RULES_FILE = Path(__file__).resolve().parent.parent / "config" / RULES_FILENAME
+
+
+def load_labeling_rules(path: Path = LABELING_RULES_FILE) -> tuple[dict[str, dict], dict]:
+    """(per-domain specs, generic fallback spec) from a labeling rules config file."""
+    with open(path) as f:
+        config = json.load(f)
+    return config["domains"], config["generic"]
+
+
+DEFAULT_LABELING_RULES, GENERIC_LABELING_RULES = load_labeling_rules()
+
+_NUMBER_COMPARISONS = {
+    "number_gt": operator.gt, "number_ge": operator.ge,
+    "number_lt": operator.lt, "number_le": operator.le,
+}
+
+
+class LabelingRules:
+    """
+    A domain's labeling rules compiled once for batch labeling.
+
+    Conditions and confidences are compiled into closures and thresholds
+    resolved by name at load time; decisions are memoized by (group
+    counts, number), so formatting and rule evaluation run once per
+    distinct feature combination rather than once per input.
+    """
+
+    MAX_DECISIONS = 1 << 16
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.thresholds: dict = dict(spec.get("thresholds", {}))
+        groups: dict[str, list[str]] = spec.get("keywords", {})
+        self.groups = list(groups)
+
+        group_index = {name: i for i, name in enumerate(self.groups)}
+        self._group_keywords: list[list[str]] = []
+        for name, keywords in groups.items():
+            lowered = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+            if "" in lowered:
+                raise ValueError(f"Empty keyword in group {name!r}")
+            self._group_keywords.append(lowered)
+        self.number_pattern = re.compile(spec["numbers"]) if spec.get("numbers") else None
+
+        self._rules = [self._compile_rule(rule, group_index) for rule in spec.get("rules", [])]
+        generic = GENERIC_LABELING_RULES["rules"][0]
+        self._fallback = (generic["label"], generic["confidence"], generic["reasoning"])
+        self._decisions: dict[tuple, tuple[str, float, str]] = {}
+
+    @staticmethod
+    def spec_for(domain: str, db_path: Path) -> dict:
+        """db_path/<domain>/weak_labeling_rules.json if present, else the shipped config's rules."""
+        path = Path(db_path) / domain / RULES_FILENAME
+        if path.exists():
+            with open(path) as f:
+                return json.load(f)
+        return DEFAULT_LABELING_RULES.get(domain, GENERIC_LABELING_RULES)
+
+    @classmethod
+    def for_domain(cls, domain: str, db_path: Path) -> "LabelingRules":
+        return cls(cls.spec_for(domain, db_path))
+
+    def _threshold(self, value):
+        if isinstance(value, str):
+            if value not in self.thresholds:
+                raise ValueError(f"Unknown threshold {value!r}")
+            return self.thresholds[value]
+        return value
+
+    def _compile_rule(self, rule: dict, group_index: dict[str, int]):
+        def group(name):
+            if name not in group_index:
+                raise ValueError(f"Unknown keyword group {name!r}")
+            return group_index[name]
+
+        checks = []
+        for key, value in rule.get("if", {}).items():
+            if key == "keywords":
+                checks.append(lambda counts, number, g=group(value): counts[g] > 0)
+            elif key == "more":
+                a, b = group(value[0]), group(value[1])
+                checks.append(lambda counts, number, a=a, b=b: counts[a] > counts[b])
+            elif key == "has_number":
+                checks.append(lambda counts, number, want=bool(value): (number is not None) == want)
+            elif key in _NUMBER_COMPARISONS:
+                op, limit = _NUMBER_COMPARISONS[key], self._threshold(value)
+                checks.append(lambda counts, number, op=op, limit=limit: number is not None and op(number, limit))
+            else:
+                raise ValueError(f"Unknown rule condition {key!r}")
+
+        confidence = rule["confidence"]
+        if isinstance(confidence, dict):
+            g = group(confidence["keywords"])
+            base, per_match, cap = confidence["base"], confidence["per_match"], confidence["max"]
+            score = lambda counts, g=g, base=base, per_match=per_match, cap=cap: min(base + counts[g] * per_match, cap)
+        else:
+            score = lambda counts, confidence=confidence: confidence
+        return checks, rule["label"], score, rule["reasoning"]
+
+    def decide(self, counts: tuple[int, ...], number: Optional[float]) -> tuple[str, float, str]:
+        """(prediction, confidence, reasoning) from the first rule whose conditions hold."""
+        key = (counts, number)
+        decision = self._decisions.get(key)
+        if decision is not None:
+            return decision
+        decision = self._fallback
+        for checks, label, score, reasoning in self._rules:
+            if all(check(counts, number) for check in checks):
+                values = {**self.thresholds, **dict(zip(self.groups, counts)), "number": number}
+                decision = (label, score(counts), reasoning.format(**values))
+                break
+        if len(self._decisions) >= self.MAX_DECISIONS:
+            self._decisions.clear()
+        self._decisions[key] = decision
+        return decision
+
+    def text_features(self, text: str) -> tuple[tuple[int, ...], Optional[float]]:
+        """Group counts and first number for one text (features() without the batch setup)."""
+        lowered = text.lower()
+        counts = tuple([sum([keyword in lowered for keyword in keywords]) for keywords in self._group_keywords])
+        match = self.number_pattern.search(text) if self.number_pattern is not None else None
+        return counts, float(match.group(0)) if match else None
+
+    def features(self, texts: list[str]) -> tuple[list[tuple[int, ...]], list[Optional[float]]]:
+        """
+        Group counts and first number for each text.
+
+        Each text is lowercased once, then each keyword is tested against
+        the whole batch in one comprehension (a C-level substring search
+        per text), and the per-keyword hit columns are summed per group.
+        """
+        if self._group_keywords:
+            lowered = [text.lower() for text in texts]
+            columns = []
+            for keywords in self._group_keywords:
+                hits = [[keyword in text for text in lowered] for keyword in keywords]
+                columns.append(list(map(sum, zip(*hits))) if hits else [0] * len(texts))
+            counts = list(zip(*columns))
+        else:
+            counts = [()] * len(texts)
+
+        if self.number_pattern is not None:
+            search = self.number_pattern.search
+            numbers = [float(match.group(0)) if (match := search(text)) else None for text in texts]
+        else:
+            numbers = [None] * len(texts)
+        return counts, numbers
+
+
+def _rules_summary(spec: dict) -> dict:
+    """Thresholds and keyword lists of a rule spec, keyed like the original WeakModel.rules."""
+    summary = dict(spec.get("thresholds", {}))
+    summary.update({f"{group}_keywords": list(keywords) for group, keywords in spec.get("keywords", {}).items()})
+    return summary
+
+
 class WeakModel:
     """
     Simulates a weak but highly accurate model (e.g., Haiku-3.5, GPT-4-mini).
 
     In production: Replace with actual API calls to smaller model.
-    For now: Uses rule-based heuristics + database lookup.
+    For now: Uses the domain's compiled LabelingRules (keyword groups,
+    number extraction, threshold rules) in self.labeling_rules, loaded from
+    config/weak_labeling_rules.json or a db_path/<domain> override.
+
+    self.rules keeps its original shape, {domain: {threshold: value,
+    "<group>_keywords": [...]}}, as a read-only summary of those rules:
+    editing it does not change labeling (edit the rules file instead).
     """
 
     def __init__(self, domain: str, db_path: Path):
@@ -89,18 +302,11 @@ class WeakModel:
         self._load_domain_rules()
 
     def _load_domain_rules(self):
-        """Load domain-specific validation rules."""
-        # Simplified: in production, load from actual database
+        """Load and compile domain-specific labeling rules."""
+        self.labeling_rules = LabelingRules.for_domain(self.domain, self.db_path)
         self.rules = {
-            "finance": {
-                "pe_threshold": 30,
-                "debt_threshold": 2.0,
-                "roe_threshold": 0.15,
-            },
-            "cybersecurity": {
-                "threat_keywords": ["exploit", "malware", "vulnerability"],
-                "safe_keywords": ["update", "patch", "secure"],
-            },
+            domain: _rules_summary(LabelingRules.spec_for(domain, self.db_path))
+            for domain in dict.fromkeys([*DEFAULT_LABELING_RULES, self.domain])
         }
 
     def label(self, input_text: str) -> WeakLabel:
@@ -109,92 +315,37 @@ class WeakModel:
 
         Returns prediction + reasoning + confidence.
         """
-        if self.domain == "finance":
-            return self._label_finance(input_text)
-        elif self.domain == "cybersecurity":
-            return self._label_cybersecurity(input_text)
-        else:
-            return self._label_generic(input_text)
-
-    def _label_finance(self, input_text: str) -> WeakLabel:
-        """Finance-specific weak labeling."""
-        input_lower = input_text.lower()
-
-        # Check for P/E ratio questions
-        if "pe" in input_lower or "price" in input_lower:
-            # Parse number if present
-            import re
-            numbers = re.findall(r'\d+\.?\d*', input_text)
-            if numbers:
-                pe_value = float(numbers[0])
-                if pe_value > self.rules["finance"]["pe_threshold"]:
-                    prediction = "overvalued"
-                    reasoning = f"PE ratio {pe_value} exceeds threshold {self.rules['finance']['pe_threshold']}"
-                    confidence = 0.85
-                else:
-                    prediction = "fairly_valued"
-                    reasoning = f"PE ratio {pe_value} is below threshold"
-                    confidence = 0.80
-            else:
-                prediction = "insufficient_data"
-                reasoning = "No PE value found in input"
-                confidence = 0.50
-        else:
-            prediction = "unknown"
-            reasoning = "Query not related to known financial metrics"
-            confidence = 0.30
-
+        now = datetime.utcnow()
+        prediction, confidence, reasoning = self.labeling_rules.decide(*self.labeling_rules.text_features(input_text))
         return WeakLabel(
-            data_id=f"weak_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
+            data_id=f"weak_{now.strftime('%Y%m%d%H%M%S')}",
             domain=self.domain,
             input_text=input_text,
             weak_prediction=prediction,
             weak_confidence=confidence,
             reasoning=reasoning,
-            created_at=datetime.utcnow().isoformat(),
+            created_at=now.isoformat(),
         )
 
-    def _label_cybersecurity(self, input_text: str) -> WeakLabel:
-        """Cybersecurity-specific weak labeling."""
-        input_lower = input_text.lower()
-
-        threat_count = sum(1 for kw in self.rules["cybersecurity"]["threat_keywords"] if kw in input_lower)
-        safe_count = sum(1 for kw in self.rules["cybersecurity"]["safe_keywords"] if kw in input_lower)
-
-        if threat_count > safe_count:
-            prediction = "threat"
-            reasoning = f"Threat keywords detected: {threat_count}"
-            confidence = min(0.6 + threat_count * 0.1, 0.95)
-        elif safe_count > 0:
-            prediction = "safe"
-            reasoning = f"Safe keywords detected: {safe_count}"
-            confidence = min(0.6 + safe_count * 0.1, 0.90)
-        else:
-            prediction = "unknown"
-            reasoning = "No clear threat or safe indicators"
-            confidence = 0.40
-
-        return WeakLabel(
-            data_id=f"weak_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
-            domain=self.domain,
-            input_text=input_text,
-            weak_prediction=prediction,
-            weak_confidence=confidence,
-            reasoning=reasoning,
-            created_at=datetime.utcnow().isoformat(),
-        )
-
-    def _label_generic(self, input_text: str) -> WeakLabel:
-        """Generic weak labeling for other domains."""
-        return WeakLabel(
-            data_id=f"weak_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
-            domain=self.domain,
-            input_text=input_text,
-            weak_prediction="unknown",
-            weak_confidence=0.5,
-            reasoning="Generic labeling - no domain rules",
-            created_at=datetime.utcnow().isoformat(),
-        )
+    def label_batch(self, input_texts: list[str]) -> list[WeakLabel]:
+        """Label many inputs; one keyword/number pass and one timestamp for the whole batch."""
+        now = datetime.utcnow()
+        data_id, created_at = f"weak_{now.strftime('%Y%m%d%H%M%S')}", now.isoformat()
+        counts, numbers = self.labeling_rules.features(input_texts)
+        decide = self.labeling_rules.decide
+        labels = []
+        for input_text, row, number in zip(input_texts, counts, numbers):
+            prediction, confidence, reasoning = decide(row, number)
+            labels.append(WeakLabel(
+                data_id=data_id,
+                domain=self.domain,
+                input_text=input_text,
+                weak_prediction=prediction,
+                weak_confidence=confidence,
+                reasoning=reasoning,
+                created_at=created_at,
+            ))
+        return labels
 
 
 class WeakLabelValidator:
@@ -272,32 +423,58 @@ class WeakLabelValidator:
         }
 
 
+# Per-process pipeline for process_stream(workers > 1), built once by the pool initializer
+_worker_pipeline: Optional["WeakToStrongPipeline"] = None
+
+
+def _init_stream_worker(domain: str, db_path: Path):
+    global _worker_pipeline
+    _worker_pipeline = WeakToStrongPipeline(domain, db_path)
+
+
+def _process_stream_chunk(raw_inputs: list[str], min_quality: float) -> tuple[list[str], SupervisionCounters]:
+    return _worker_pipeline._process_chunk(raw_inputs, min_quality)
+
+
+def _iter_inputs(raw_inputs: Union[Iterable[str], str, os.PathLike]) -> Iterator[str]:
+    """Inputs from an iterable, or one per non-blank line of a text file (str or PathLike path)."""
+    if not isinstance(raw_inputs, (str, os.PathLike)):
+        yield from raw_inputs
+        return
+    with open(raw_inputs) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                yield line
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
 class WeakToStrongPipeline:
     """
     End-to-end pipeline: raw data → weak labels → validation → strong training set.
+
+    process_batch() keeps every example in memory for export_training_set();
+    process_stream() writes qualifying examples straight to the output JSONL
+    and keeps only running counters, for inputs that do not fit in memory.
     """
 
     def __init__(self, domain: str, db_path: Path):
         self.domain = domain
+        self.db_path = db_path
         self.weak_model = WeakModel(domain, db_path)
         self.validator = WeakLabelValidator(db_path)
         self.training_examples: list[StrongTrainingExample] = []
+        self.counters = SupervisionCounters()
 
-    def process_batch(self, raw_inputs: list[str]) -> list[StrongTrainingExample]:
-        """
-        Process a batch of raw inputs through the pipeline.
-
-        Steps:
-        1. Generate weak labels
-        2. Validate each label
-        3. Create training examples for strong model (verified only)
-        """
-        examples = []
-
-        for input_text in raw_inputs:
-            # Step 1: Weak model labels
-            weak_label = self.weak_model.label(input_text)
-
+    def _make_examples(self, input_texts: list[str]) -> Iterator[tuple[WeakLabel, StrongTrainingExample]]:
+        """Label (as one batch), validate and wrap each input."""
+        # Step 1: Weak model labels
+        for weak_label in self.weak_model.label_batch(input_texts):
             # Step 2: Validate
             validation = self.validator.validate(weak_label)
 
@@ -305,19 +482,108 @@ class WeakToStrongPipeline:
             example = StrongTrainingExample(
                 example_id=f"strong_{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}",
                 domain=self.domain,
-                input_text=input_text,
+                input_text=weak_label.input_text,
                 weak_label=weak_label.weak_prediction,
                 weak_reasoning=weak_label.reasoning,
                 verified=validation["verified"],
                 quality_score=validation["quality_score"],
                 created_at=datetime.utcnow().isoformat(),
             )
+            yield weak_label, example
 
+    def process_batch(self, raw_inputs: list[str]) -> list[StrongTrainingExample]:
+        """
+        Process a batch of raw inputs through the pipeline.
+
+        Steps:
+        1. Generate weak labels
+        2. Validate each label
+        3. Create training examples for strong model (verified only)
+        """
+        examples = []
+
+        for weak_label, example in self._make_examples(list(raw_inputs)):
+            self.counters.add(weak_label, example)
             examples.append(example)
             self.training_examples.append(example)
 
         return examples
 
+    def _process_chunk(self, raw_inputs: list[str], min_quality: float) -> tuple[list[str], SupervisionCounters]:
+        """Label a chunk; return the JSONL lines to export and the chunk's counters."""
+        lines = []
+        counters = SupervisionCounters()
+        for weak_label, example in self._make_examples(raw_inputs):
+            exported = example.verified and example.quality_score >= min_quality
+            if exported:
+                lines.append(json.dumps(self._training_record(example)) + "\n")
+            counters.add(weak_label, example, exported)
+        return lines, counters
+
+    def process_stream(
+        self,
+        raw_inputs: Union[Iterable[str], str, os.PathLike],
+        output_file: Optional[Path] = None,
+        min_quality: float = 0.7,
+        workers: int = 1,
+        chunk_size: int = 1000,
+    ) -> SupervisionStats:
+        """
+        Label, validate and export a stream of inputs in constant memory.
+
+        raw_inputs: any iterable of strings (consumed lazily), or a path (str
+        or PathLike) to a text file with one input per line; a single input
+        string must be wrapped in a list. Verified examples at or above
+        min_quality are written to output_file (default: the file
+        export_training_set() writes) in input order, in the same format.
+
+        Inputs are processed in chunks of chunk_size; with workers > 1 the
+        chunks go to a process pool with at most 2 * workers chunks in
+        flight. Examples are not kept in training_examples; they are counted
+        in self.counters (so get_stats() covers them) and the returned
+        stats cover this stream only.
+        """
+        output_file = output_file or SUPERVISION_DIR / f"{self.domain}_strong_training.jsonl"
+        chunks = _chunked(_iter_inputs(raw_inputs), chunk_size)
+        stream_counters = SupervisionCounters()
+
+        with open(output_file, "w") as f:
+            if workers > 1:
+                with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_stream_worker,
+                    initargs=(self.domain, self.db_path),
+                ) as pool:
+                    pending: deque = deque()
+                    for chunk in chunks:
+                        pending.append(pool.submit(_process_stream_chunk, chunk, min_quality))
+                        if len(pending) >= 2 * workers:
+                            lines, counters = pending.popleft().result()
+                            f.writelines(lines)
+                            stream_counters.merge(counters)
+                    while pending:
+                        lines, counters = pending.popleft().result()
+                        f.writelines(lines)
+                        stream_counters.merge(counters)
+            else:
+                for chunk in chunks:
+                    lines, counters = self._process_chunk(chunk, min_quality)
+                    f.writelines(lines)
+                    stream_counters.merge(counters)
+
+        self.counters.merge(stream_counters)
+        return stream_counters.to_stats(self.domain)
+
+    @staticmethod
+    def _training_record(ex: StrongTrainingExample) -> dict:
+        # Format for fine-tuning: input + weak_reasoning → weak_label
+        return {
+            "input": ex.input_text,
+            "reasoning": ex.weak_reasoning,
+            "label": ex.weak_label,
+            "quality": ex.quality_score,
+        }
+
     def export_training_set(
         self,
         min_quality: float = 0.7,
@@ -338,45 +604,14 @@ class WeakToStrongPipeline:
 
         with open(output_file, "w") as f:
             for ex in high_quality:
-                # Format for fine-tuning: input + weak_reasoning → weak_label
-                record = {
-                    "input": ex.input_text,
-                    "reasoning": ex.weak_reasoning,
-                    "label": ex.weak_label,
-                    "quality": ex.quality_score,
-                }
-                f.write(json.dumps(record) + "\n")
+                f.write(json.dumps(self._training_record(ex)) + "\n")
 
         print(f"Exported {len(high_quality)} / {len(self.training_examples)} examples to {output_file}")
         return output_file
 
     def get_stats(self) -> SupervisionStats:
-        """Get pipeline statistics."""
-        total = len(self.training_examples)
-        verified = sum(1 for ex in self.training_examples if ex.verified)
-
-        if total == 0:
-            return SupervisionStats(
-                domain=self.domain,
-                total_examples=0,
-                weak_labels_generated=0,
-                weak_labels_verified=0,
-                avg_weak_confidence=0.0,
-                avg_quality_score=0.0,
-                verification_rate=0.0,
-            )
-
-        avg_quality = sum(ex.quality_score for ex in self.training_examples) / total
-
-        return SupervisionStats(
-            domain=self.domain,
-            total_examples=total,
-            weak_labels_generated=total,
-            weak_labels_verified=verified,
-            avg_weak_confidence=0.0,  # would need to store weak_confidence separately
-            avg_quality_score=avg_quality,
-            verification_rate=verified / total,
-        )
+        """Get pipeline statistics (process_batch and process_stream inputs)."""
+        return self.counters.to_stats(self.domain)
 
 
 if __name__ == "__main__":
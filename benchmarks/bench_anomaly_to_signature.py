@@ -0,0 +1,274 @@
+"""
+SignatureDatabase Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Inserts synthetic Falco-style signatures through SignatureDatabase.add
+(token postings index, persisted alongside the JSONL store) and compares the
+per-insert cost with the previous reload-and-scan-every-signature add.
+
+The legacy add is O(N) per insert, so it only runs up to --legacy-limit
+signatures; the per-insert latency at each checkpoint is what to compare.
+
+--stream-lines measures AnomalyStreamPipeline throughput (lines/sec) over a
+synthetic Falco log.
+
+--parse-lines compares AnomalyParser feature extraction: the previous parser,
+a fused single-pass extractor (one named-group alternation per line, matches
+dispatched into buckets in Python), the tuned parse() and parse_batch().
+
+--mine-anomalies times SignatureGenerator feature counting on a large anomaly
+corpus: the previous flat-list Counters, then the map-reduce count_features
+across 1..--max-workers processes (results must equal the serial count).
+
+Usage:
+    python benchmarks/bench_anomaly_to_signature.py
+    python benchmarks/bench_anomaly_to_signature.py --signatures 100000 --legacy-limit 5000
+    python benchmarks/bench_anomaly_to_signature.py --signatures 0 --stream-lines 1000000
+    python benchmarks/bench_anomaly_to_signature.py --signatures 0 --parse-lines 2000000
+    python benchmarks/bench_anomaly_to_signature.py --signatures 0 --mine-anomalies 2000000 --max-workers 8
+"""
+
+import sys
+import json
+import time
+import random
+import tempfile
+import os
+import argparse
+import re
+from collections import Counter
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import algorithms.anomaly_to_signature as a2s
+from algorithms.anomaly_to_signature import AnomalyParser, Signature, SignatureDatabase, SignatureGenerator
+from algorithms.anomaly_stream import AnomalyStreamPipeline
+
+
+SYSCALLS = [f"sc{i}" for i in range(400)]
+PROCESSES = [f"proc{i}" for i in range(20000)]
+
+
+def synthetic_signatures(n: int, seed: int = 42) -> list[Signature]:
+    rng = random.Random(seed)
+    signatures = []
+    for i in range(n):
+        syscalls = " or ".join(f"evt.type={sc}" for sc in rng.sample(SYSCALLS, rng.randint(1, 4)))
+        procs = " or ".join(f'proc.name="{p}"' for p in rng.sample(PROCESSES, rng.randint(1, 2)))
+        condition = f"({syscalls}) and ({procs})"
+        signatures.append(Signature(
+            signature_id=f"falco_bench_{i}", name=f"bench_{i}", pattern=condition,
+            rule_type="falco" if i % 4 else "snort", confidence=0.8,
+            created_at="2026-01-01T00:00:00", source_anomalies=[], rule_text=condition,
+        ))
+    return signatures
+
+
+class LegacySignatureDatabase(SignatureDatabase):
+    """The previous add: re-read every stored signature, compare pairwise."""
+
+    def add(self, signature: Signature) -> dict:
+        conflicts = self._check_conflicts(signature, self.load_all())
+        if conflicts:
+            self._log_conflict(signature, [c.signature_id for c in conflicts])
+            return {"added": False}
+        with open(self.db_file, "a") as f:
+            f.write(json.dumps(asdict(signature)) + "\n")
+        return {"added": True}
+
+
+def insert(db: SignatureDatabase, signatures: list[Signature], checkpoints: list[int]) -> dict:
+    """Insert all signatures; return {checkpoint: mean µs per insert over the preceding window}."""
+    window_start, previous, results, added = time.perf_counter(), 0, {}, 0
+    for i, sig in enumerate(signatures, 1):
+        added += db.add(sig)["added"]
+        if i in checkpoints:
+            now = time.perf_counter()
+            results[i] = (now - window_start) * 1e6 / (i - previous)
+            window_start, previous = now, i
+    results["added"] = added
+    return results
+
+
+def run(n: int, legacy_limit: int):
+    signatures = synthetic_signatures(n)
+    checkpoints = sorted({c for c in (100, 1000, 5000, 10000, 50000, 100000, n) if c <= n})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        a2s.SIGNATURES_DIR = Path(tmp) / "indexed"
+        a2s.SIGNATURES_DIR.mkdir()
+        start = time.perf_counter()
+        indexed = insert(SignatureDatabase(), signatures, checkpoints)
+        total = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = SignatureDatabase()
+        reopened.add(signatures[0])
+        reopen_ms = (time.perf_counter() - start) * 1000
+
+        a2s.SIGNATURES_DIR = Path(tmp) / "legacy"
+        a2s.SIGNATURES_DIR.mkdir()
+        legacy_checkpoints = [c for c in checkpoints if c <= legacy_limit]
+        legacy = insert(LegacySignatureDatabase(), signatures[:legacy_limit], legacy_checkpoints)
+
+    print(f"{n} synthetic signatures ({indexed['added']} added, {n - indexed['added']} conflicts)")
+    print(f"  indexed total {total:.2f} s ({n / total:,.0f} inserts/s); reopen + first add {reopen_ms:.1f} ms")
+    for c in checkpoints:
+        line = f"  after {c:>7} inserts | indexed {indexed[c]:9.1f} µs/insert"
+        if c in legacy:
+            line += f" | legacy {legacy[c]:11.1f} µs/insert | speedup {legacy[c] / indexed[c]:7.1f}x"
+        print(line)
+
+
+def synthetic_falco_lines(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    users = ["root", "www-data", "attacker", "svc"]
+    lines = []
+    for i in range(n):
+        second = i // 1000  # ~1000 events per second of log time
+        lines.append(
+            f"2026-01-01 {second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d} "
+            f"rule=Suspicious_exec syscall={rng.choice(SYSCALLS[:40])} proc.name={rng.choice(PROCESSES[:500])} "
+            f"user.name={rng.choice(users)} connection=10.0.{rng.randrange(256)}.{rng.randrange(256)} "
+            f"port={rng.choice([22, 80, 443, 4444, 8080])}"
+        )
+    return lines
+
+
+def run_stream(n: int, batch_size: int = 1000):
+    lines = synthetic_falco_lines(n)
+    pipeline = AnomalyStreamPipeline(min_support=3, window_seconds=60, batch_size=batch_size)
+    start = time.perf_counter()
+    emitted = sum(1 for _ in pipeline.process_lines(iter(lines)))
+    elapsed = time.perf_counter() - start
+    print(f"stream {n} Falco lines | {n / elapsed:10,.0f} lines/s | {emitted} signatures"
+          f" | open clusters {len(pipeline.clusters)} | expired {pipeline.stats['clusters_expired']}")
+
+
+class LegacyAnomalyParser:
+    """The previous parser: Unicode IP scan, re.search for the rule, log.lower() per protocol."""
+
+    SYSCALL_PATTERN = re.compile(r'syscall=([a-z_]+)')
+    IP_PATTERN = re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b')
+    PORT_PATTERN = re.compile(r'port=(\d+)')
+    PROCESS_PATTERN = re.compile(r'proc\.name=([^\s]+)')
+
+    def parse(self, raw_log: str, source: str = "falco") -> dict:
+        features = {
+            "syscalls": self.SYSCALL_PATTERN.findall(raw_log),
+            "ips": self.IP_PATTERN.findall(raw_log),
+            "ports": self.PORT_PATTERN.findall(raw_log),
+            "processes": self.PROCESS_PATTERN.findall(raw_log),
+        }
+        if source == "falco":
+            match = re.search(r'rule=([^\s]+)', raw_log)
+            features["rule"] = match.group(1) if match else None
+        return features
+
+
+FUSED_PATTERN = re.compile(
+    r'syscall=(?P<syscalls>[a-z_]+)|port=(?P<ports>\d+)|proc\.name=(?P<processes>\S+)'
+    r'|rule=(?P<rule>\S+)|\b(?P<ips>[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})\b',
+    re.ASCII,
+)
+
+
+def fused_parse_batch(lines: list[str]) -> list[dict]:
+    """One scan per line; each match is routed to its bucket by lastgroup."""
+    finditer = FUSED_PATTERN.finditer
+    parsed = []
+    for line in lines:
+        features = {"syscalls": [], "ips": [], "ports": [], "processes": [], "rule": None}
+        for match in finditer(line):
+            group = match.lastgroup
+            if group == "rule":
+                if features["rule"] is None:
+                    features["rule"] = match.group(group)
+            else:
+                features[group].append(match.group(group))
+        parsed.append(features)
+    return parsed
+
+
+def run_parse(n: int):
+    lines = synthetic_falco_lines(n)
+    legacy_parser, parser = LegacyAnomalyParser(), AnomalyParser()
+    variants = [
+        ("legacy parse()", lambda: [legacy_parser.parse(line) for line in lines]),
+        ("fused single pass", lambda: fused_parse_batch(lines)),
+        ("parse()", lambda: [parser.parse(line) for line in lines]),
+        ("parse_batch()", lambda: parser.parse_batch(lines)),
+    ]
+    print(f"parse {n} Falco lines")
+    expected, baseline = None, None
+    for label, fn in variants:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected, baseline = result, elapsed
+        same = "same output" if result == expected else "DIFFERENT output"
+        print(f"  {label:<18} | {n / elapsed:10,.0f} lines/s | speedup {baseline / elapsed:5.2f}x | {same}")
+        del result
+
+
+def legacy_common_features(features_list: list[dict]) -> dict:
+    """The previous _find_common_features: flat lists, then one Counter each."""
+    common = {}
+    all_syscalls = [sc for f in features_list for sc in f.get("syscalls", [])]
+    if all_syscalls:
+        common["syscalls"] = [sc for sc, cnt in Counter(all_syscalls).items() if cnt >= len(features_list) * 0.5]
+    all_processes = [p for f in features_list for p in f.get("processes", [])]
+    if all_processes:
+        common["processes"] = [p for p, cnt in Counter(all_processes).items() if cnt >= len(features_list) * 0.5]
+    all_ports = [p for f in features_list for p in f.get("ports", [])]
+    if all_ports:
+        common["ports"] = [p for p, cnt in Counter(all_ports).items() if cnt >= 2]
+    return common
+
+
+def run_mine(n: int, max_workers: int):
+    features = AnomalyParser().parse_batch(synthetic_falco_lines(n))
+    generator = SignatureGenerator()
+    print(f"mine {n} anomalies ({os.cpu_count()} CPUs)")
+
+    start = time.perf_counter()
+    expected = legacy_common_features(features)
+    baseline = time.perf_counter() - start
+    print(f"  {'legacy serial':<14} | {baseline:8.2f} s")
+
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        counts = generator.count_features(features, workers=workers)
+        common = counts.common()
+        elapsed = time.perf_counter() - start
+        same = "same output" if common == expected else "DIFFERENT output"
+        print(f"  {f'{workers} worker(s)':<14} | {elapsed:8.2f} s | speedup {baseline / elapsed:5.2f}x | {same}")
+        workers *= 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signatures", type=int, default=100000)
+    parser.add_argument("--legacy-limit", type=int, default=5000)
+    parser.add_argument("--stream-lines", type=int, default=0)
+    parser.add_argument("--parse-lines", type=int, default=0)
+    parser.add_argument("--mine-anomalies", type=int, default=0)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    if args.signatures:
+        run(args.signatures, args.legacy_limit)
+    if args.stream_lines:
+        run_stream(args.stream_lines)
+    if args.parse_lines:
+        run_parse(args.parse_lines)
+    if args.mine_anomalies:
+        run_mine(args.mine_anomalies, args.max_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+CoTVerifier Citation Check Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Verifies --citations synthetic citations against a generated rule database
+(top-level keys, nested dict keys, named list items, missing rules and
+missing files) with:
+
+    legacy   — exists() per citation + str(value) scan of every nested dict
+    lazy     — rule registry filled on each file's first citation
+    preload  — rule registry built for every file at startup
+
+--answers N verifies N synthetic multi-step CoT answers with the previous
+per-answer verify() (uncompiled regexes, JSON round trip per citation),
+the current verify() loop, verify_batch() and verify_batch(workers=W).
+
+Usage:
+    python benchmarks/bench_cot_verifier.py
+    python benchmarks/bench_cot_verifier.py --citations 1000000 --files 200 --rules 500
+    python benchmarks/bench_cot_verifier.py --citations 0 --answers 100000 --workers 4
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from algorithms.cot_verifier import CoTVerifier, DatabaseRuleChecker, ReasoningStep
+
+
+class LegacyRuleChecker:
+    """The previous checker: exists() per citation, substring search of nested dicts."""
+
+    def __init__(self, db_root: Path):
+        self.db_root = db_root
+        self._rule_cache: dict[str, dict] = {}
+
+    def verify_citation(self, citation: dict) -> dict:
+        source_file, rule_name = citation["source_file"], citation["rule_name"]
+        full_path = self.db_root / source_file if not source_file.startswith("/") else Path(source_file)
+        if not full_path.exists():
+            return {"verified": False, "note": f"File not found: {source_file}", "rule_data": None}
+        rule_data = self._load_rule(full_path, rule_name)
+        if rule_data:
+            return {"verified": True, "note": f"Rule '{rule_name}' found in {source_file}", "rule_data": rule_data}
+        return {"verified": False, "note": f"Rule '{rule_name}' not found in {source_file}", "rule_data": None}
+
+    def _load_rule(self, file_path: Path, rule_name: str) -> Optional[dict]:
+        cache_key = str(file_path)
+        if cache_key not in self._rule_cache:
+            with open(file_path) as f:
+                self._rule_cache[cache_key] = json.load(f)
+        data = self._rule_cache[cache_key]
+        if isinstance(data, dict):
+            if rule_name in data:
+                return {rule_name: data[rule_name]}
+            for value in data.values():
+                if isinstance(value, dict) and rule_name in str(value):
+                    return value
+        elif isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict) and item.get("name") == rule_name:
+                    return item
+        return None
+
+
+def build_database(root: Path, files: int, rules: int) -> list[tuple[str, list[str]]]:
+    """Write rule files; return [(relative path, citable rule names)]."""
+    catalog = []
+    for i in range(files):
+        path = Path(f"domain{i % 10}") / f"rules_{i}.json"
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        if i % 3 == 2:
+            data = [{"name": f"f{i}_item_{j}", "threshold": j, "description": "x" * 40} for j in range(rules)]
+            names = [item["name"] for item in data]
+        else:
+            groups = max(1, rules // 20)
+            data = {f"f{i}_top_{j}": {"value": j} for j in range(rules // 2)}
+            data.update({
+                f"f{i}_group_{g}": {f"f{i}_nested_{g}_{k}": {"value": k, "description": "y" * 40}
+                                    for k in range(20)}
+                for g in range(groups)
+            })
+            names = [f"f{i}_top_{j}" for j in range(rules // 2)]
+            names += [f"f{i}_nested_{g}_{k}" for g in range(groups) for k in range(20)]
+        (root / path).write_text(json.dumps(data))
+        catalog.append((str(path), names))
+    return catalog
+
+
+def synthetic_citations(catalog: list, n: int, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    citations = []
+    for i in range(n):
+        source, names = rng.choice(catalog)
+        roll = rng.random()
+        if roll < 0.05:
+            citations.append({"source_file": f"missing/{i % 50}.json", "rule_name": "anything"})
+        elif roll < 0.15:
+            citations.append({"source_file": source, "rule_name": f"absent_rule_{i % 1000}"})
+        else:
+            citations.append({"source_file": source, "rule_name": rng.choice(names)})
+    return citations
+
+
+def run(n: int, files: int, rules: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        catalog = build_database(root, files, rules)
+        citations = synthetic_citations(catalog, n)
+
+        results = {}
+        for label, make in [
+            ("legacy", lambda: LegacyRuleChecker(root)),
+            ("lazy registry", lambda: DatabaseRuleChecker(root)),
+            ("preload registry", lambda: DatabaseRuleChecker(root, preload=True)),
+        ]:
+            start = time.perf_counter()
+            checker = make()
+            setup = time.perf_counter() - start
+            start = time.perf_counter()
+            verified = [checker.verify_citation(c)["verified"] for c in citations]
+            elapsed = time.perf_counter() - start
+            results[label] = (setup, elapsed, verified)
+
+    legacy_elapsed, expected = results["legacy"][1], results["legacy"][2]
+    print(f"{n} citations over {files} files x {rules} rules ({sum(expected)} verified)")
+    for label, (setup, elapsed, verified) in results.items():
+        same = "same verdicts" if verified == expected else "DIFFERENT verdicts"
+        print(f"  {label:<17} | setup {setup * 1000:8.1f} ms | {n / elapsed:12,.0f} citations/s"
+              f" | speedup {legacy_elapsed / elapsed:6.1f}x | {same}")
+
+
+class LegacyCoTVerifier(CoTVerifier):
+    """The previous verify(): re.match/re.sub per line, json.dumps + json.loads per citation."""
+
+    def verify(self, query: str, domain: str, ai_output: str):
+        steps = [self._legacy_verify_step(step) for step in self._legacy_parse_steps(ai_output)]
+        return self._build_answer(query, domain, ai_output, steps)
+
+    def _legacy_parse_steps(self, output: str) -> list[ReasoningStep]:
+        steps, step_num = [], 0
+        for line in output.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            if re.match(r'^(Step\s+\d+:|[\d]+\.)', line, re.IGNORECASE):
+                step_num += 1
+                citations = self.parser.extract_citations(line)
+                claim = re.sub(self.parser.CITATION_PATTERN, '', line).strip()
+                steps.append(ReasoningStep(step_number=step_num, claim=claim,
+                                           citation=json.dumps(citations[0]) if citations else None))
+        return steps
+
+    def _legacy_verify_step(self, step: ReasoningStep) -> ReasoningStep:
+        if not step.citation:
+            step.verified, step.verification_note = False, "No citation provided"
+            return step
+        result = self.rule_checker.verify_citation(json.loads(step.citation))
+        step.verified, step.verification_note = result["verified"], result["note"]
+        return step
+
+
+def synthetic_answers(citations: list[dict], n: int, seed: int = 5) -> list[tuple[str, str, str]]:
+    rng = random.Random(seed)
+    answers = []
+    for i in range(n):
+        lines = ["Let me work through this.", ""]
+        for step in range(1, rng.randint(3, 6) + 1):
+            claim = f"Step {step}: metric {rng.randrange(1000)} compared against the threshold"
+            if rng.random() < 0.9:
+                c = rng.choice(citations)
+                claim += f" [Source: {c['source_file']} | Rule: {c['rule_name']}]"
+            lines.append(claim)
+        lines.append(f"Final Answer: verdict {i % 7}")
+        answers.append((f"query {i}", "finance", "\n".join(lines)))
+    return answers
+
+
+def run_answers(n: int, workers: int, files: int, rules: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        catalog = build_database(root, files, rules)
+        # A limited citation pool: real CoT datasets cite the same rules over and over
+        items = synthetic_answers(synthetic_citations(catalog, 2000), n)
+
+        legacy = LegacyCoTVerifier(root, preload_rules=True)
+        verifier = CoTVerifier(root, preload_rules=True)
+        variants = [
+            ("legacy verify()", lambda: [legacy.verify(*item) for item in items]),
+            ("verify()", lambda: [verifier.verify(*item) for item in items]),
+            ("verify_batch()", lambda: verifier.verify_batch(items)),
+        ]
+        if workers > 1:
+            variants.append((f"verify_batch(w={workers})", lambda: verifier.verify_batch(items, workers=workers)))
+
+        print(f"{n} CoT answers ({os.cpu_count()} CPUs)")
+        expected, baseline = None, None
+        for label, fn in variants:
+            start = time.perf_counter()
+            answers = fn()
+            elapsed = time.perf_counter() - start
+            verdicts = [(a.overall_verified, [s.verification_note for s in a.reasoning_steps]) for a in answers]
+            if expected is None:
+                expected, baseline = verdicts, elapsed
+            same = "same verdicts" if verdicts == expected else "DIFFERENT verdicts"
+            print(f"  {label:<22} | {n / elapsed:10,.0f} answers/s | speedup {baseline / elapsed:5.2f}x | {same}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--citations", type=int, default=100000)
+    parser.add_argument("--files", type=int, default=60)
+    parser.add_argument("--rules", type=int, default=200)
+    parser.add_argument("--answers", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    if args.citations:
+        run(args.citations, args.files, args.rules)
+    if args.answers:
+        run_answers(args.answers, args.workers, args.files, args.rules)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+CPOEngine Logging Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Measures CPOEngine.record + ActiveLearner.check throughput with the shared
+BufferedLogWriter (write-through, batched, process-safe) against the previous
+open/append/close per line (plus an exists() stat per conflict).
+
+--read-records measures the streaming readers on a large log: get_stats
+(peak memory) and get_top_gaps (tail read) against loading the whole file.
+
+Usage:
+    python benchmarks/bench_cpo_engine.py
+    python benchmarks/bench_cpo_engine.py --records 100000
+    python benchmarks/bench_cpo_engine.py --read-records 500000
+"""
+
+import sys
+import csv
+import json
+import time
+import tempfile
+import argparse
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import algorithms.cpo_engine as cpo_engine
+from algorithms.cpo_engine import CPOEngine, CPOTriplet, ActiveLearner
+
+
+EXPERT_RESULTS = [{"pe_ratio": 28.5, "source_file": "metrics.json"}]
+
+
+class LegacyWriter:
+    """The previous per-line behavior: open/append/close, exists() before each CSV row."""
+
+    def __init__(self, path: Path, header: list | None = None):
+        self.path = path
+        self.header = header
+
+    def write_json(self, record):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def write_row(self, row):
+        write_header = not self.path.exists()
+        with open(self.path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(self.header)
+            writer.writerow(row)
+
+    def flush(self):
+        pass
+
+
+def make_engines(tmp: Path, name: str, **options):
+    # Fresh directory per config: shared writers are keyed by path
+    cpo_engine.TRIPLETS_DIR = tmp / name
+    cpo_engine.TRIPLETS_DIR.mkdir()
+    return CPOEngine("finance", **options), ActiveLearner(**options)
+
+
+def timed(engine: CPOEngine, learner: ActiveLearner, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        engine.record(f"query {i}", "generic", EXPERT_RESULTS)
+        learner.check(f"query {i}", "finance", 0.2)
+    engine.flush()
+    learner._gap_writer.flush()
+    elapsed = time.perf_counter() - start
+    assert len(engine.load_triplets()) == n
+    return elapsed
+
+
+def run_legacy(tmp: Path, n: int) -> float:
+    engine, learner = make_engines(tmp, "legacy")
+    engine._triplet_writer = LegacyWriter(engine.triplet_file)
+    engine._conflict_writer = LegacyWriter(
+        engine.conflict_file, ["timestamp", "query", "generic_preview", "expert_preview"]
+    )
+    learner._gap_writer = LegacyWriter(learner.gap_log_file)
+    return timed(engine, learner, n)
+
+
+def run_writer(tmp: Path, n: int, name: str, **options) -> float:
+    return timed(*make_engines(tmp, name, **options), n)
+
+
+def run(n: int):
+    configs = [
+        ("write-through", {}),
+        ("buffered x64", {"buffer_lines": 64}),
+        ("buffered x512", {"buffer_lines": 512}),
+        ("buffered x512 process-safe", {"buffer_lines": 512, "process_safe": True}),
+    ]
+    print(f"{n} record() + check() calls (3 log lines each)")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        legacy = run_legacy(tmp, n)
+        print(f"  {'legacy open/append/close':<28} | {n / legacy:10.0f} calls/s")
+        for name, options in configs:
+            elapsed = run_writer(tmp, n, name.replace(" ", "_"), **options)
+            print(f"  {name:<28} | {n / elapsed:10.0f} calls/s | speedup {legacy / elapsed:5.1f}x")
+
+
+def legacy_load(path: Path, cls=None) -> list:
+    items = []
+    with open(path) as f:
+        for line in f:
+            try:
+                data = json.loads(line.strip())
+                items.append(cls(**data) if cls else data)
+            except Exception:
+                pass
+    return items
+
+
+def measure(fn) -> tuple[float, float]:
+    """Return (ms, peak MB of Python heap) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def run_readers(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, learner = make_engines(Path(tmp), "readers")
+        expert = json.dumps(EXPERT_RESULTS, indent=2)
+        with open(engine.triplet_file, "w") as f:
+            for i in range(n):
+                f.write(json.dumps({"query": f"query {i}", "domain": "finance", "generic_answer": "generic",
+                                    "expert_answer": expert, "confidence": 0.7,
+                                    "timestamp": "2026-01-01T00:00:00", "source_files": []}) + "\n")
+        with open(learner.gap_log_file, "w") as f:
+            for i in range(n):
+                f.write(json.dumps({"query": f"query {i}", "domain": "finance", "confidence": 0.2}) + "\n")
+        size_mb = engine.triplet_file.stat().st_size / 1e6
+
+        def legacy_stats():
+            triplets = legacy_load(engine.triplet_file, CPOTriplet)
+            return len(triplets), sum(t.confidence for t in triplets)
+
+        print(f"{n} logged lines ({size_mb:.0f} MB triplet log)")
+        for label, fn in [
+            ("get_stats  legacy list", legacy_stats),
+            ("get_stats  streaming", engine.get_stats),
+            ("top gaps   legacy list", lambda: legacy_load(learner.gap_log_file)[-10:]),
+            ("top gaps   tail read", lambda: learner.get_top_gaps(10)),
+        ]:
+            ms, peak = measure(fn)
+            print(f"  {label:<24} | {ms:10.2f} ms | peak heap {peak:8.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--read-records", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.records)
+    print()
+    run_readers(args.read_records)
+
+
+if __name__ == "__main__":
+    main()
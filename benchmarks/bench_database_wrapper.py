@@ -0,0 +1,152 @@
+"""
+DatabaseWrapper Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Measures DatabaseWrapper start-up time against a synthetic data/ tree:
+  cold  — no persisted keyword index, every JSON file parsed
+  warm  — persisted index present, nothing changed
+  touch — persisted index present, 1% of files modified
+
+and route_query latency over a synthetic corpus (default 10k files), compared
+against the previous files × keywords × posting-list scan.
+
+Usage:
+    python benchmarks/bench_database_wrapper.py
+    python benchmarks/bench_database_wrapper.py --files 100 1000 5000
+    python benchmarks/bench_database_wrapper.py --route-files 10000
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcp_server.database_wrapper import DatabaseWrapper
+
+
+WORDS = [
+    "circuit", "breaker", "voltage", "ground", "conduit", "sepsis", "dosage", "triage",
+    "kubernetes", "container", "deployment", "ledger", "accrual", "depreciation",
+    "framing", "joist", "rafter", "solder", "torque", "pressure", "refrigerant",
+    "protocol", "inspection", "clearance", "ampacity", "warranty", "estimate",
+]
+
+DOMAINS = ["electrical", "healthcare", "devops", "accounting", "carpentry", "automotive"]
+
+
+def make_record(rng: random.Random, n_records: int = 20) -> dict:
+    return {
+        f"{rng.choice(WORDS)}_{rng.choice(WORDS)}": {
+            "description": " ".join(rng.choices(WORDS, k=12)) + f" item{rng.randint(0, 10**6)}",
+            "steps": [" ".join(rng.choices(WORDS, k=6)) for _ in range(3)],
+        }
+        for _ in range(n_records)
+    }
+
+
+def build_corpus(root: Path, n_files: int, seed: int = 0, records_per_file: int = 20) -> list[Path]:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(n_files):
+        domain_dir = root / DOMAINS[i % len(DOMAINS)]
+        domain_dir.mkdir(parents=True, exist_ok=True)
+        path = domain_dir / f"synthetic_{i:06d}.json"
+        path.write_text(json.dumps(make_record(rng, records_per_file)))
+        paths.append(path)
+    return paths
+
+
+def timed_start(data_dir: Path) -> tuple[float, dict]:
+    start = time.perf_counter()
+    wrapper = DatabaseWrapper(data_dir=str(data_dir), config_dir=str(ROOT / "config"))
+    return (time.perf_counter() - start) * 1000, wrapper.index_stats
+
+
+def legacy_route_query(wrapper: DatabaseWrapper, query: str, top_k: int = 3) -> list[tuple]:
+    """Previous routing: scan every file, list membership test per keyword."""
+    list_index = {}
+    for keyword, file_ids in wrapper.keyword_index.items():
+        list_index[keyword] = [
+            (wrapper.indexed_files[i][0], wrapper.indexed_files[i][1].name) for i in sorted(file_ids)
+        ]
+
+    def route():
+        query_keywords = set(re.findall(r"\b[a-z]{3,}\b", query.lower()))
+        adjustments = wrapper.weights_config["weight_adjustments"]
+        matches = []
+        for domain, files in wrapper.domain_databases.items():
+            domain_weight = wrapper.weights_config["domain_weights"].get(domain, {}).get("weight", 0.5)
+            for file_path in files:
+                matched = [
+                    kw for kw in query_keywords
+                    if kw in list_index and (domain, file_path.name) in list_index[kw]
+                ]
+                if not matched:
+                    continue
+                confidence = len(matched) / max(len(query_keywords), 1)
+                for boost in ("safety_critical_boost", "compliance_boost"):
+                    if any(kw in query.lower() for kw in adjustments[boost]["keywords"]):
+                        confidence *= adjustments[boost]["multiplier"]
+                matches.append((min(confidence, 1.0) * domain_weight, domain, file_path.name))
+        matches.sort(key=lambda m: m[0], reverse=True)
+        return matches[:top_k]
+
+    return route
+
+
+def run_route(n_files: int, repeats: int = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        build_corpus(data_dir, n_files, records_per_file=2)
+        wrapper = DatabaseWrapper(data_dir=str(data_dir), config_dir=str(ROOT / "config"))
+        query = "voltage breaker inspection safety code for a sepsis triage protocol"
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            wrapper.route_query(query)
+        new_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        legacy = legacy_route_query(wrapper, query)
+        start = time.perf_counter()
+        legacy_repeats = max(1, repeats // 10)
+        for _ in range(legacy_repeats):
+            legacy()
+        legacy_ms = (time.perf_counter() - start) * 1000 / legacy_repeats
+
+        print(f"route_query over {n_files} files | posting sets {new_ms:8.2f} ms/query"
+              f" | legacy scan {legacy_ms:9.2f} ms/query | speedup {legacy_ms / new_ms:6.1f}x")
+
+
+def run(n_files: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        paths = build_corpus(data_dir, n_files)
+
+        cold_ms, cold_stats = timed_start(data_dir)
+        warm_ms, warm_stats = timed_start(data_dir)
+
+        rng = random.Random(1)
+        for path in rng.sample(paths, max(1, n_files // 100)):
+            path.write_text(json.dumps(make_record(rng)))
+        touch_ms, touch_stats = timed_start(data_dir)
+
+        print(f"{n_files:>7} files | cold {cold_ms:9.1f} ms ({cold_stats['extracted']} parsed)"
+              f" | warm {warm_ms:8.1f} ms ({warm_stats['extracted']} parsed)"
+              f" | 1% changed {touch_ms:8.1f} ms ({touch_stats['extracted']} parsed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DatabaseWrapper start-up benchmark")
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--route-files", type=int, default=10000)
+    args = parser.parse_args()
+    for n in args.files:
+        run(n)
+    run_route(args.route_files)
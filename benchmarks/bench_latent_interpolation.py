@@ -0,0 +1,199 @@
+"""
+Latent Interpolation Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Generates an interpolation sweep (--sweep alphas for each of --pairs
+endpoint pairs) three ways and reports blends/sec:
+
+    interpolate()       — one InterpolationResult per blend (list → array → list)
+    _slerp per blend    — the per-pair NumPy math alone, no result objects
+    interpolate_batch() — all blends in fused NumPy ops, one float32 array
+
+--search N builds an EmbeddingStore of N clustered vectors and reports
+latency per top-k query and recall@k for: a Python scan over LatentEntry
+lists (previously the only option), exact search (one matrix-vector product)
+and LSH approximate search.
+
+--store N saves N interpolation results to an InterpolationDatabase and
+compares file size, load_all() and get_high_quality() against the previous
+layout (embedding inline in each JSONL line).
+
+Usage:
+    python benchmarks/bench_latent_interpolation.py
+    python benchmarks/bench_latent_interpolation.py --pairs 100000 --dim 512 --sweep 9
+    python benchmarks/bench_latent_interpolation.py --pairs 0 --search 1000000 --dim 64
+    python benchmarks/bench_latent_interpolation.py --pairs 0 --store 50000 --dim 256
+"""
+
+import sys
+import json
+import time
+import tempfile
+import argparse
+from dataclasses import asdict
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from algorithms import latent_interpolation
+from algorithms.latent_interpolation import (
+    EmbeddingStore, InterpolationDatabase, InterpolationResult, LatentEntry, LatentInterpolator
+)
+
+
+def run_interpolation(pairs: int, dim: int, sweep: int, slow_limit: int):
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(pairs, dim)).astype(np.float32)
+    b = rng.normal(size=(pairs, dim)).astype(np.float32)
+    alphas = np.linspace(0.0, 1.0, sweep)
+    interpolator = LatentInterpolator("music")
+    blends = pairs * sweep
+    slow_pairs = min(pairs, slow_limit)
+
+    entries = [(LatentEntry(f"a{i}", "music", {}, a[i].tolist(), ""),
+                LatentEntry(f"b{i}", "music", {}, b[i].tolist(), "")) for i in range(slow_pairs)]
+    start = time.perf_counter()
+    for entry_a, entry_b in entries:
+        for alpha in alphas:
+            interpolator.interpolate(entry_a, entry_b, float(alpha))
+    per_result = (time.perf_counter() - start) / (slow_pairs * sweep)
+
+    start = time.perf_counter()
+    for i in range(slow_pairs):
+        for alpha in alphas:
+            interpolator._slerp(a[i], b[i], float(alpha))
+    per_slerp = (time.perf_counter() - start) / (slow_pairs * sweep)
+
+    start = time.perf_counter()
+    out = interpolator.interpolate_batch(a, b, alphas[None, :])
+    per_batch = (time.perf_counter() - start) / blends
+
+    check = np.array([interpolator._slerp(a[i], b[i], float(alphas[-2])) for i in range(min(pairs, 100))])
+    same = "same blends" if np.allclose(out[:len(check), -2], check, atol=1e-4) else "DIFFERENT blends"
+
+    print(f"{pairs} pairs x {sweep} alphas, dim {dim} ({blends:,} blends, {out.nbytes / 1e6:.0f} MB out)"
+          f" — per-call rows timed on {slow_pairs} pairs")
+    print(f"  {'interpolate()':<20} | {1 / per_result:12,.0f} blends/s")
+    print(f"  {'_slerp per blend':<20} | {1 / per_slerp:12,.0f} blends/s | speedup {per_result / per_slerp:7.1f}x")
+    print(f"  {'interpolate_batch()':<20} | {1 / per_batch:12,.0f} blends/s | speedup {per_result / per_batch:7.1f}x"
+          f" | {same}")
+
+
+def python_scan(entries: list[LatentEntry], query: list[float], k: int) -> list[str]:
+    """Load-everything baseline: cosine against each entry's list embedding."""
+    q = np.array(query)
+    q_norm = np.linalg.norm(q)
+    scored = []
+    for entry in entries:
+        v = np.array(entry.embedding)
+        scored.append((float(v @ q / (np.linalg.norm(v) * q_norm)), entry.entry_id))
+    scored.sort(reverse=True)
+    return [entry_id for _, entry_id in scored[:k]]
+
+
+def run_search(n: int, dim: int, k: int, queries: int, slow_limit: int):
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(max(n // 1000, 10), dim))
+    vectors = (centers[rng.integers(0, len(centers), n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+    probes = vectors[rng.integers(0, n, queries)] + 0.05 * rng.normal(size=(queries, dim)).astype(np.float32)
+
+    start = time.perf_counter()
+    store = EmbeddingStore(dim=dim, capacity=n)
+    store.add_many(LatentEntry(f"e{i}", "music", {}, v, "") for i, v in enumerate(vectors))
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    store.build_lsh()
+    lsh_s = time.perf_counter() - start
+
+    def timed(fn):
+        start = time.perf_counter()
+        results = [fn(q) for q in probes]
+        return results, (time.perf_counter() - start) * 1000 / queries
+
+    exact, exact_ms = timed(lambda q: [i for i, _ in store.search(q, k)])
+    print(f"search {n:,} x {dim} vectors, top-{k}, {queries} queries"
+          f" (store build {build_s:.2f} s, LSH build {lsh_s:.2f} s)")
+
+    slow_n = min(n, slow_limit)
+    entries = [LatentEntry(f"e{i}", "music", {}, vectors[i].tolist(), "") for i in range(slow_n)]
+    _, scan_ms = timed(lambda q: python_scan(entries, q.tolist(), k))
+    print(f"  {'python scan':<22} | {scan_ms * n / slow_n:10.3f} ms/query (extrapolated from {slow_n:,})")
+    print(f"  {'exact':<22} | {exact_ms:10.3f} ms/query | recall 1.000")
+    for label, probe in [("LSH", False), ("LSH + 1-bit probes", True)]:
+        approx, approx_ms = timed(lambda q: [i for i, _ in store.search(q, k, approximate=True, probe=probe)])
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+        print(f"  {label:<22} | {approx_ms:10.3f} ms/query | recall {recall:.3f}")
+
+
+class LegacyInterpolationDatabase(InterpolationDatabase):
+    """The previous layout: every line carries its embedding as a JSON list."""
+
+    def save(self, result: InterpolationResult, quality_score=None):
+        result.quality_score = quality_score
+        with open(self.db_file, "a") as f:
+            f.write(json.dumps(asdict(result)) + "\n")
+
+    def get_high_quality(self, min_score: float = 0.7) -> list[InterpolationResult]:
+        return [r for r in self.load_all() if r.quality_score and r.quality_score >= min_score]
+
+
+def run_store(n: int, dim: int):
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    scores = rng.random(n)
+    results = [InterpolationResult(f"r{i}", f"a{i}", f"b{i}", 0.5, vectors[i].tolist(), {"bpm": 120},
+                                   "2024-01-15T12:00:00") for i in range(n)]
+
+    print(f"{n:,} interpolation results, dim {dim}")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        with mock.patch.object(latent_interpolation, "EMBEDDINGS_DIR", root):
+            rows = {}
+            for label, db in [("inline JSON", LegacyInterpolationDatabase("legacy")),
+                              ("float32 + memmap", InterpolationDatabase("binary"))]:
+                start = time.perf_counter()
+                for result, score in zip(results, scores):
+                    db.save(result, quality_score=float(score))
+                save_s = time.perf_counter() - start
+                size = sum(p.stat().st_size for p in root.glob(f"{db.domain}_*"))
+                start = time.perf_counter()
+                loaded = db.load_all()
+                load_s = time.perf_counter() - start
+                start = time.perf_counter()
+                high = db.get_high_quality(0.9)
+                high_s = time.perf_counter() - start
+                rows[label] = (size, save_s, load_s, high_s, [r.result_id for r in high], len(loaded))
+
+    base = rows["inline JSON"]
+    for label, (size, save_s, load_s, high_s, high, count) in rows.items():
+        same = "same results" if high == base[4] and count == base[5] else "DIFFERENT results"
+        print(f"  {label:<17} | {size / 1e6:8.1f} MB | save {n / save_s:9,.0f}/s"
+              f" | load_all {load_s:6.2f} s | get_high_quality {high_s:6.2f} s"
+              f" ({base[3] / high_s:5.1f}x) | {same}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--sweep", type=int, default=9)
+    parser.add_argument("--slow-limit", type=int, default=2000, help="pairs/entries timed with per-call paths")
+    parser.add_argument("--search", type=int, default=0, help="catalog size for the search benchmark")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--store", type=int, default=0, help="results saved for the storage benchmark")
+    args = parser.parse_args()
+    if args.pairs:
+        run_interpolation(args.pairs, args.dim, args.sweep, args.slow_limit)
+    if args.search:
+        run_search(args.search, args.dim, args.k, args.queries, args.slow_limit)
+    if args.store:
+        run_store(args.store, args.dim)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+MCP Skill Server Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Measures DatabaseConnector.query (BM25 index) against the previous
+json.dumps-per-record substring scan over a synthetic domain, and the
+resident size of in-memory records vs the mmap'd RecordStore (store_dir).
+
+--load-test drives call_tool through a local stub MCP client with open-loop
+concurrent arrivals and reports p50/p99 latency per pool configuration,
+compared with the previous inline (on-event-loop) execution, plus the same
+thread pool behind the query_expert_db ResultCache.
+
+Usage:
+    python benchmarks/bench_mcp_server.py
+    python benchmarks/bench_mcp_server.py --records 50000
+    python benchmarks/bench_mcp_server.py --load-test --rate 300 --requests 2000
+"""
+
+import sys
+import json
+import asyncio
+import statistics
+import time
+import random
+import tempfile
+import argparse
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcp_server.mcp_skill_server import (
+    DatabaseConnector, ResultCache, ToolExecutor, VerifierAgent, call_tool, cpo
+)
+
+
+WORDS = [
+    "malware", "phishing", "exploit", "firewall", "ransomware", "payload", "intrusion",
+    "syscall", "execve", "lateral", "movement", "credential", "dumping", "beacon",
+    "persistence", "registry", "privilege", "escalation", "kernel", "container",
+]
+
+QUERIES = [
+    "ransomware lateral movement",
+    "credential dumping privilege escalation",
+    "container escape kernel exploit",
+    "phishing payload beacon persistence",
+]
+
+
+def build_domain(root: Path, n_records: int, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    domain_dir = root / "cybersecurity"
+    domain_dir.mkdir(parents=True)
+    records = [
+        {
+            "id": f"T{i:06d}",
+            "name": " ".join(rng.choices(WORDS, k=3)),
+            "description": " ".join(rng.choices(WORDS, k=25)),
+            "tags": rng.sample(WORDS, 4),
+        }
+        for i in range(n_records)
+    ]
+    (domain_dir / "techniques.json").write_text(json.dumps(records))
+    return root
+
+
+def legacy_query(records: list[dict], query: str, top_k: int = 3) -> list[dict]:
+    query_lower = query.lower()
+    scored = []
+    for record in records:
+        record_str = json.dumps(record).lower()
+        score = sum(1 for word in query_lower.split() if word in record_str)
+        if score > 0:
+            scored.append((score, record))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [r for _, r in scored[:top_k]]
+
+
+def run_query_benchmark(n_records: int, repeats: int = 50):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = build_domain(Path(tmp), n_records)
+        connector = DatabaseConnector(root)
+
+        start = time.perf_counter()
+        records = connector.load_domain("cybersecurity")
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for i in range(repeats):
+            connector.query("cybersecurity", QUERIES[i % len(QUERIES)], top_k=5)
+        bm25_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        legacy_repeats = max(1, repeats // 10)
+        start = time.perf_counter()
+        for i in range(legacy_repeats):
+            legacy_query(records, QUERIES[i % len(QUERIES)], top_k=5)
+        legacy_ms = (time.perf_counter() - start) * 1000 / legacy_repeats
+
+        print(f"{n_records:>7} records | load+index {load_ms:8.1f} ms | BM25 {bm25_ms:7.2f} ms/query"
+              f" | legacy scan {legacy_ms:8.2f} ms/query | speedup {legacy_ms / bm25_ms:6.1f}x")
+
+
+def traced_load(connector: DatabaseConnector) -> tuple[float, float]:
+    """Return (load ms, MB of Python heap retained by the loaded records)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = connector.load_domain("cybersecurity")
+    elapsed = (time.perf_counter() - start) * 1000
+    # Drop the BM25 index so only the record container is measured
+    connector._loaded.clear()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return elapsed, retained / 1e6
+
+
+def run_store_benchmark(n_records: int, repeats: int = 50):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = build_domain(Path(tmp) / "data", n_records)
+        store_dir = Path(tmp) / "store"
+
+        memory_ms, memory_mb = traced_load(DatabaseConnector(root))
+        cold_ms, _ = traced_load(DatabaseConnector(root, store_dir=store_dir))
+        warm_ms, store_mb = traced_load(DatabaseConnector(root, store_dir=store_dir))
+
+        connector = DatabaseConnector(root, store_dir=store_dir)
+        connector.load_domain("cybersecurity")
+        start = time.perf_counter()
+        for i in range(repeats):
+            connector.query("cybersecurity", QUERIES[i % len(QUERIES)], top_k=5)
+        query_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        print(f"{n_records:>7} records | in-memory load {memory_ms:8.1f} ms, {memory_mb:7.1f} MB"
+              f" | store compile {cold_ms:8.1f} ms, open {warm_ms:8.1f} ms, {store_mb:5.1f} MB"
+              f" | store query {query_ms:6.2f} ms")
+
+
+class StubMCPClient:
+    """Stands in for an MCP client: sends tool calls straight to the server's call_tool."""
+
+    def __init__(self, tools: ToolExecutor | None, connector: DatabaseConnector, cache: ResultCache | None = None):
+        self.tools = tools
+        self.connector = connector
+        self.cache = cache or ResultCache(max_entries=0)
+        self.latencies_ms: list[float] = []
+
+    async def call_tool(self, name: str, arguments: dict, sent_at: float) -> str:
+        if self.tools is None:
+            # Previous behaviour: lookup runs synchronously on the event loop
+            results = self.connector.query(arguments["domain"], arguments["query"], arguments["top_k"])
+            text = json.dumps(cpo.resolve(arguments["query"], results), indent=2)
+        else:
+            text = await call_tool(name, arguments, self.tools, self.cache)
+        self.latencies_ms.append((time.perf_counter() - sent_at) * 1000)
+        return text
+
+
+def percentile(values: list[float], pct: int) -> float:
+    return statistics.quantiles(values, n=100)[pct - 1] if len(values) > 1 else values[0]
+
+
+async def drive(client: StubMCPClient, n_requests: int, rate: float, seed: int = 0):
+    """Open-loop load: requests arrive at `rate`/s; latency is measured from arrival."""
+    rng = random.Random(seed)
+    # Mix of hot (repeated) and cold queries, like several agents sharing one server
+    requests = [
+        {"domain": "cybersecurity", "query": rng.choice(QUERIES) if rng.random() < 0.5
+         else " ".join(rng.sample(WORDS, 3)), "top_k": 5}
+        for _ in range(n_requests)
+    ]
+    start = time.perf_counter()
+
+    async def one(i: int, arguments: dict):
+        sent_at = start + i / rate
+        await asyncio.sleep(max(0.0, sent_at - time.perf_counter()))
+        await client.call_tool("query_expert_db", arguments, sent_at)
+
+    await asyncio.gather(*(one(i, a) for i, a in enumerate(requests)))
+
+
+def run_load_test(n_records: int, n_requests: int, rate: float, workers: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = build_domain(Path(tmp), n_records)
+        configs = [("inline (event loop)", None, False, 0),
+                   (f"thread pool x{workers}", workers, False, 0),
+                   (f"process pool x{workers}", workers, True, 0),
+                   (f"thread pool x{workers} + cache", workers, False, 1024)]
+        print(f"{n_requests} requests at {rate:.0f} req/s over {n_records} records")
+        for label, max_workers, use_processes, cache_size in configs:
+            connector = DatabaseConnector(root)
+            connector.load_domain("cybersecurity")
+            tools = None if max_workers is None else ToolExecutor(
+                connector, VerifierAgent(), max_workers=max_workers, use_processes=use_processes
+            )
+
+            if tools is not None:
+                # Warm worker processes so their domain load is not counted as request latency
+                asyncio.run(drive(StubMCPClient(tools, connector), workers * 4, rate=1e6, seed=1))
+                tools.stats.update(executed=0, coalesced=0)
+
+            cache = ResultCache(max_entries=cache_size)
+            client = StubMCPClient(tools, connector, cache)
+            asyncio.run(drive(client, n_requests, rate))
+            coalesced = tools.stats["coalesced"] if tools else 0
+            if tools is not None:
+                tools.shutdown()
+
+            print(f"  {label:<30} | p50 {percentile(client.latencies_ms, 50):8.2f} ms"
+                  f" | p99 {percentile(client.latencies_ms, 99):8.2f} ms"
+                  f" | coalesced {coalesced:4d} | cache hit rate {cache.stats()['hit_rate']:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP skill server benchmarks")
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--load-test", action="store_true", help="Run the concurrent stub-client load test")
+    parser.add_argument("--rate", type=float, default=300.0, help="Request arrival rate (req/s)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    if args.load_test:
+        run_load_test(args.records[0], args.requests, args.rate, args.workers)
+        sys.exit(0)
+    for n in args.records:
+        run_query_benchmark(n)
+    for n in args.records:
+        run_store_benchmark(n)
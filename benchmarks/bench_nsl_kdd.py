@@ -0,0 +1,106 @@
+"""
+NSL-KDD Loader + Scoring Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Measures parse throughput (rows/sec) of load_kdd against a csv.reader loop
+that converts every field in Python, and scoring throughput of
+anomaly_scores + attack_profiles against a per-row Python implementation.
+
+--scale N concatenates KDDTest.txt N times (N=6 is about the size of the
+full KDDTrain+ set, 126k rows) to check how both paths grow.
+
+Usage:
+    python benchmarks/bench_nsl_kdd.py
+    python benchmarks/bench_nsl_kdd.py --scale 6
+    python benchmarks/bench_nsl_kdd.py --file data/cybersecurity/KDDTrain.txt
+"""
+
+import sys
+import csv
+import math
+import time
+import tempfile
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from algorithms.nsl_kdd import (
+    KDD_FEATURES, KDD_TEST_FILE, MAX_Z, MIN_STD, anomaly_scores, attack_profiles, load_kdd
+)
+
+
+CATEGORICAL_INDEXES = {KDD_FEATURES.index(c) for c in ("protocol_type", "service", "flag")}
+
+
+def python_load(path: Path) -> tuple[list[list[float]], list[str]]:
+    """Row-at-a-time baseline: csv.reader + float() per field."""
+    rows, labels = [], []
+    with open(path) as f:
+        for record in csv.reader(f):
+            rows.append([float(v) for i, v in enumerate(record[:41]) if i not in CATEGORICAL_INDEXES])
+            labels.append(record[41])
+    return rows, labels
+
+
+def python_scores(rows: list[list[float]], labels: list[str]) -> list[float]:
+    """The same score as anomaly_scores, one row and one feature at a time."""
+    normal = [[math.log1p(v) for v in row] for row, label in zip(rows, labels) if label == "normal"]
+    n, width = len(normal), len(normal[0])
+    means = [sum(r[j] for r in normal) / n for j in range(width)]
+    stds = [max(math.sqrt(sum((r[j] - means[j]) ** 2 for r in normal) / n), MIN_STD) for j in range(width)]
+    scores = []
+    for row in rows:
+        total = 0.0
+        for j, v in enumerate(row):
+            total += min(abs(math.log1p(v) - means[j]) / stds[j], MAX_Z)
+        scores.append(total / width / MAX_Z)
+    return scores
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(path: Path):
+    rows = sum(1 for _ in open(path))
+    print(f"{path.name}: {rows} rows")
+
+    (py_rows, py_labels), py_parse = timed(lambda: python_load(path))
+    kdd, np_parse = timed(lambda: load_kdd(path))
+    print(f"  parse   csv.reader + float() | {rows / py_parse:12,.0f} rows/s")
+    print(f"  parse   load_kdd (NumPy)     | {rows / np_parse:12,.0f} rows/s | speedup {py_parse / np_parse:5.1f}x")
+
+    py_result, py_score = timed(lambda: python_scores(py_rows, py_labels))
+    np_result, np_score = timed(lambda: anomaly_scores(kdd))
+    _, np_profiles = timed(lambda: attack_profiles(kdd, scores=np_result))
+    same = "same scores" if np.allclose(py_result, np_result) else "DIFFERENT scores"
+    print(f"  score   per-row Python       | {rows / py_score:12,.0f} rows/s")
+    print(f"  score   anomaly_scores       | {rows / np_score:12,.0f} rows/s | speedup {py_score / np_score:5.1f}x"
+          f" | {same}")
+    print(f"  profile attack_profiles      | {rows / np_profiles:12,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", type=Path, default=ROOT / KDD_TEST_FILE)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.scale <= 1:
+        run(args.file)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        scaled = Path(tmp) / f"{args.file.stem}_x{args.scale}.txt"
+        text = args.file.read_text()
+        scaled.write_text(text * args.scale)
+        run(scaled)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+PCG Logic Table Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Builds a LogicTable of --rules synthetic rules (exact genre/difficulty/biome
+conditions, numeric level and score ranges) and reports:
+
+    build  — add_rule() per rule with a full re-sort (previous), add_rule()
+             with bisect insertion, and add_rules() with one sort
+    match  — per-rule _conditions_met scan (previous) vs the compiled
+             RuleIndex, checking both return the same rules in the same order
+
+--levels N generates N platformer levels with generate() one at a time
+(global random, dict output) and with generate_many() (per-level seeded
+Generators, structured arrays), with and without the dict conversion, and
+with --workers processes.
+
+--assets N stores N generated levels/loot rolls in the previous JSONL
+PCGDatabase and the SQLite one, then times get_high_quality (rare
+threshold, filtered by asset type) and fetching one page of matches.
+
+Usage:
+    python benchmarks/bench_pcg_logic_tables.py
+    python benchmarks/bench_pcg_logic_tables.py --rules 100000 --contexts 2000
+    python benchmarks/bench_pcg_logic_tables.py --rules 0 --levels 100000 --length 200 --workers 4
+    python benchmarks/bench_pcg_logic_tables.py --rules 0 --assets 1000000
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from algorithms.pcg_logic_tables import GeneratedAsset, LogicRule, LogicTable, PCGDatabase, PlatformerLevelGenerator
+
+
+GENRES = ["platformer", "rpg", "shooter", "puzzle", "racing", "roguelike"]
+DIFFICULTIES = ["easy", "medium", "hard", "expert"]
+BIOMES = [f"biome_{i}" for i in range(40)]
+
+
+def synthetic_rules(n: int, seed: int = 0) -> list[LogicRule]:
+    rng = random.Random(seed)
+    rules = []
+    for i in range(n):
+        condition = {"genre": rng.choice(GENRES)}
+        if rng.random() < 0.7:
+            condition["difficulty"] = rng.choice(DIFFICULTIES)
+        if rng.random() < 0.5:
+            condition["biome"] = rng.choice(BIOMES)
+        if rng.random() < 0.4:
+            low = rng.randint(1, 90)
+            condition["player_level"] = {"min": low, "max": low + rng.randint(1, 15)}
+        if rng.random() < 0.2:
+            condition["score"] = {"min": round(rng.random(), 2)}
+        rules.append(LogicRule(f"rule_{i}", "bench", condition, {"enemy_density": rng.random()},
+                               priority=rng.randint(0, 100)))
+    return rules
+
+
+def synthetic_contexts(n: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    return [{"genre": rng.choice(GENRES), "difficulty": rng.choice(DIFFICULTIES),
+             "biome": rng.choice(BIOMES), "player_level": rng.randint(1, 100), "score": rng.random()}
+            for _ in range(n)]
+
+
+class LegacyLogicTable(LogicTable):
+    """The previous table: full re-sort per add_rule, _conditions_met per rule per match."""
+
+    def add_rule(self, rule: LogicRule):
+        self.rules.append(rule)
+        self.rules.sort(key=lambda r: r.priority, reverse=True)
+
+    def match(self, context: dict) -> list[LogicRule]:
+        return [rule for rule in self.rules if self._conditions_met(rule.condition, context)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def fill(table: LogicTable, rules: list[LogicRule]) -> LogicTable:
+    for rule in rules:
+        table.add_rule(rule)
+    return table
+
+
+def bulk(table: LogicTable, rules: list[LogicRule]) -> LogicTable:
+    table.add_rules(rules)
+    return table
+
+
+def run(n: int, contexts: int):
+    rules = synthetic_rules(n)
+    probes = synthetic_contexts(contexts)
+    print(f"{n:,} rules, {contexts:,} contexts")
+
+    legacy, legacy_build = timed(lambda: fill(LegacyLogicTable("bench"), rules))
+    _, insert_build = timed(lambda: fill(LogicTable("bench"), rules))
+    table, bulk_build = timed(lambda: bulk(LogicTable("bench"), rules))
+    print(f"  build  add_rule + re-sort   | {legacy_build * 1000:9.1f} ms")
+    print(f"  build  add_rule (bisect)    | {insert_build * 1000:9.1f} ms | speedup {legacy_build / insert_build:7.1f}x")
+    print(f"  build  add_rules            | {bulk_build * 1000:9.1f} ms | speedup {legacy_build / bulk_build:7.1f}x")
+
+    _, index_build = timed(table._compiled)
+    expected, legacy_match = timed(lambda: [[r.rule_id for r in legacy.match(c)] for c in probes])
+    actual, index_match = timed(lambda: [[r.rule_id for r in table.match(c)] for c in probes])
+    same = "same matches" if actual == expected else "DIFFERENT matches"
+    hits = sum(map(len, expected)) / contexts
+    print(f"  match  per-rule scan        | {legacy_match * 1e6 / contexts:9.1f} us/context")
+    print(f"  match  RuleIndex            | {index_match * 1e6 / contexts:9.1f} us/context"
+          f" | speedup {legacy_match / index_match:7.1f}x | {same} ({hits:.1f} rules/context,"
+          f" index built in {index_build * 1000:.1f} ms)")
+
+
+def run_levels(n: int, length: int, workers: int):
+    gen = PlatformerLevelGenerator()
+    print(f"{n:,} hard levels of length {length} ({os.cpu_count()} CPUs)")
+    variants = [
+        ("generate() per level", lambda: [gen.generate("hard", length).properties for _ in range(n)]),
+        ("generate_many()", lambda: gen.generate_many("hard", length, n, seed=0)),
+        ("generate_many() + to_dict", lambda: [b.to_dict(i) for b in [gen.generate_many("hard", length, n, seed=0)]
+                                               for i in range(n)]),
+    ]
+    if workers > 1:
+        variants.append((f"generate_many(w={workers})",
+                         lambda: gen.generate_many("hard", length, n, seed=0, workers=workers)))
+    baseline = None
+    for label, fn in variants:
+        _, elapsed = timed(fn)
+        baseline = baseline or elapsed
+        print(f"  {label:<27} | {n / elapsed:11,.0f} levels/s | speedup {baseline / elapsed:6.1f}x")
+
+
+class LegacyPCGDatabase:
+    """The previous store: one JSONL line per asset, every query loads and filters everything."""
+
+    def __init__(self, db_file: Path):
+        self.db_file = db_file
+
+    def save(self, asset: GeneratedAsset):
+        with open(self.db_file, "a") as f:
+            f.write(json.dumps(asdict(asset)) + "\n")
+
+    def load_all(self) -> list[GeneratedAsset]:
+        with open(self.db_file) as f:
+            return [GeneratedAsset(**json.loads(line)) for line in f]
+
+    def get_high_quality(self, min_score: float = 0.7) -> list[GeneratedAsset]:
+        return [a for a in self.load_all() if a.quality_score and a.quality_score >= min_score]
+
+
+def synthetic_assets(n: int, seed: int = 2):
+    rng = random.Random(seed)
+    for i in range(n):
+        level = i % 3 != 0
+        yield GeneratedAsset(
+            asset_id=f"asset_{i}",
+            asset_type="level" if level else "loot",
+            genre="platformer" if level else "rpg",
+            properties={"length": 50, "platforms": [{"x": x * 8, "y": 0, "length": 4} for x in range(6)]}
+            if level else {"rarity": "rare", "damage": rng.randint(10, 500)},
+            rules_applied=["hard_platformer" if level else "boss_loot"],
+            created_at="2024-01-15T12:00:00",
+            quality_score=round(rng.random(), 3) if rng.random() < 0.8 else None,
+        )
+
+
+def run_assets(n: int):
+    print(f"{n:,} assets")
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacyPCGDatabase(Path(tmp) / "legacy.jsonl")
+        _, legacy_save = timed(lambda: [legacy.save(a) for a in synthetic_assets(n)])
+        db = PCGDatabase(Path(tmp) / "assets.sqlite")
+        _, bulk_save = timed(lambda: db.save_many(synthetic_assets(n)))
+
+        expected, legacy_query = timed(lambda: [a.asset_id for a in legacy.get_high_quality(0.99)
+                                                if a.asset_type == "level"])
+        actual, query = timed(lambda: [a.asset_id for a in db.get_high_quality(0.99, asset_type="level")])
+        _, legacy_page = timed(lambda: [a for a in legacy.load_all() if a.genre == "rpg"][:100])
+        _, page = timed(lambda: db.page(genre="rpg", limit=100))
+        same = "same results" if actual == expected else "DIFFERENT results"
+
+        print(f"  save     JSONL save() per asset   | {n / legacy_save:10,.0f} assets/s")
+        print(f"  save     SQLite save_many()       | {n / bulk_save:10,.0f} assets/s"
+              f" | speedup {legacy_save / bulk_save:6.1f}x")
+        print(f"  quality  JSONL load_all + filter  | {legacy_query * 1000:10.1f} ms")
+        print(f"  quality  SQLite indexed query     | {query * 1000:10.1f} ms"
+              f" | speedup {legacy_query / query:6.1f}x | {same} ({len(actual):,} assets)")
+        print(f"  page     JSONL load_all + slice   | {legacy_page * 1000:10.1f} ms")
+        print(f"  page     SQLite page(limit=100)   | {page * 1000:10.1f} ms"
+              f" | speedup {legacy_page / page:6.1f}x")
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=10000)
+    parser.add_argument("--contexts", type=int, default=1000)
+    parser.add_argument("--levels", type=int, default=0)
+    parser.add_argument("--length", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--assets", type=int, default=0)
+    args = parser.parse_args()
+    if args.rules:
+        run(args.rules, args.contexts)
+    if args.levels:
+        run_levels(args.levels, args.length, args.workers)
+    if args.assets:
+        run_assets(args.assets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+RouterAgent Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Measures per-call latency of RouterAgent.route / route_multi (single compiled
+keyword automaton) against the previous per-keyword substring scan, and
+route_batch throughput for log replay.
+
+Usage:
+    python benchmarks/bench_router.py
+    python benchmarks/bench_router.py --batch 200000
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from algorithms.router_agent import RouterAgent, DOMAIN_KEYWORDS
+
+
+QUERIES = [
+    "detect a malware phishing attack via Falco intrusion log",
+    "What is the PE ratio and ROE for AAPL stock?",
+    "Create a lo-fi jazz chord progression at 80 BPM",
+    "Generate a pixel art character for my platformer game",
+    "What is the best hook for my YouTube tutorial video?",
+    "Write a three-act story about a time-traveling hero archetype",
+    "xyzzy nonexistent gibberish aaabbbccc",
+]
+
+
+def legacy_route(query: str) -> str:
+    query_lower = query.lower()
+    scores = {d: [kw for kw in kws if kw in query_lower] for d, kws in DOMAIN_KEYWORDS.items()}
+    return max(scores.items(), key=lambda x: len(x[1]))[0]
+
+
+def per_call_us(fn, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(QUERIES[i % len(QUERIES)])
+    return (time.perf_counter() - start) * 1e6 / n
+
+
+def run(n_calls: int, batch_size: int):
+    router = RouterAgent()
+    route_us = per_call_us(router.route, n_calls)
+    multi_us = per_call_us(lambda q: router.route_multi(q, top_n=2), n_calls)
+    legacy_us = per_call_us(legacy_route, n_calls)
+    print(f"route        {route_us:7.2f} µs/call  (legacy scan {legacy_us:7.2f} µs/call,"
+          f" {legacy_us / route_us:4.1f}x)")
+    print(f"route_multi  {multi_us:7.2f} µs/call")
+
+    # Log replay: mostly repeated queries with a long tail of unique ones
+    rng = random.Random(0)
+    log = [
+        rng.choice(QUERIES) if rng.random() < 0.8 else f"{rng.choice(QUERIES)} #{rng.randint(0, 10**6)}"
+        for _ in range(batch_size)
+    ]
+    start = time.perf_counter()
+    router.route_batch(log)
+    elapsed = time.perf_counter() - start
+    print(f"route_batch  {batch_size / elapsed:10,.0f} queries/s over {batch_size:,} log lines")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RouterAgent benchmarks")
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.calls, args.batch)
@@ -0,0 +1,209 @@
+"""
+Weak-to-Strong Pipeline Benchmarks
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Labels, validates and exports --inputs synthetic finance queries with:
+
+    process_batch + export  — every StrongTrainingExample kept in memory, then written
+    process_stream          — chunks written as they finish, only counters kept
+    process_stream(w=W)     — the same chunks spread over a process pool
+
+and reports inputs/sec and peak Python heap (tracemalloc, measured in a
+separate run so it does not slow the timed one).
+
+--labels N labels N synthetic finance and cybersecurity inputs with the
+previous hand-written WeakModel branches (label() per input) and with the
+compiled LabelingRules (label() per input and label_batch() per
+--chunk-size inputs), and checks that all three agree.
+
+Usage:
+    python benchmarks/bench_weak_to_strong.py
+    python benchmarks/bench_weak_to_strong.py --inputs 1000000 --workers 8 --chunk-size 5000
+    python benchmarks/bench_weak_to_strong.py --inputs 0 --labels 1000000
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import tempfile
+import argparse
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from algorithms.weak_to_strong import WeakLabel, WeakModel, WeakToStrongPipeline
+
+
+TEMPLATES = [
+    "Is {t} overvalued with PE ratio of {v}?",
+    "{t} has PE of {v}, is this good?",
+    "What is the price target for {t}?",
+    "Analyze the debt-to-equity ratio of {t}",
+    "Should I invest in {t}?",
+]
+
+
+def synthetic_inputs(path: Path, n: int, seed: int = 3):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for _ in range(n):
+            template = rng.choice(TEMPLATES)
+            f.write(template.format(t=f"T{rng.randrange(5000)}", v=round(rng.uniform(5, 80), 1)) + "\n")
+
+
+CYBER_WORDS = ["exploit", "malware", "vulnerability", "update", "patch", "secure", "unpatched",
+               "Exploited", "MALWARE", "insecure", "updates", "scan", "login", "firewall", "ok"]
+
+
+def synthetic_label_inputs(n: int, seed: int = 4) -> dict[str, list[str]]:
+    rng = random.Random(seed)
+    finance = [rng.choice(TEMPLATES).format(t=f"T{rng.randrange(5000)}", v=round(rng.uniform(5, 80), 1))
+               for _ in range(n // 2)]
+    cyber = [" ".join(rng.choice(CYBER_WORDS) for _ in range(rng.randint(2, 8))) for _ in range(n - n // 2)]
+    return {"finance": finance, "cybersecurity": cyber}
+
+
+class LegacyWeakModel:
+    """The previous WeakModel: hard-coded branches, re.findall and keyword scans per input."""
+
+    def __init__(self, domain: str):
+        self.domain = domain
+        self.rules = {
+            "finance": {"pe_threshold": 30, "debt_threshold": 2.0, "roe_threshold": 0.15},
+            "cybersecurity": {
+                "threat_keywords": ["exploit", "malware", "vulnerability"],
+                "safe_keywords": ["update", "patch", "secure"],
+            },
+        }
+
+    def label(self, input_text: str) -> WeakLabel:
+        if self.domain == "finance":
+            prediction, reasoning, confidence = self._label_finance(input_text)
+        else:
+            prediction, reasoning, confidence = self._label_cybersecurity(input_text)
+        return WeakLabel(
+            data_id=f"weak_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
+            domain=self.domain,
+            input_text=input_text,
+            weak_prediction=prediction,
+            weak_confidence=confidence,
+            reasoning=reasoning,
+            created_at=datetime.utcnow().isoformat(),
+        )
+
+    def _label_finance(self, input_text: str):
+        input_lower = input_text.lower()
+        if "pe" in input_lower or "price" in input_lower:
+            numbers = re.findall(r'\d+\.?\d*', input_text)
+            if numbers:
+                pe_value = float(numbers[0])
+                if pe_value > self.rules["finance"]["pe_threshold"]:
+                    return "overvalued", f"PE ratio {pe_value} exceeds threshold {self.rules['finance']['pe_threshold']}", 0.85
+                return "fairly_valued", f"PE ratio {pe_value} is below threshold", 0.80
+            return "insufficient_data", "No PE value found in input", 0.50
+        return "unknown", "Query not related to known financial metrics", 0.30
+
+    def _label_cybersecurity(self, input_text: str):
+        input_lower = input_text.lower()
+        threat_count = sum(1 for kw in self.rules["cybersecurity"]["threat_keywords"] if kw in input_lower)
+        safe_count = sum(1 for kw in self.rules["cybersecurity"]["safe_keywords"] if kw in input_lower)
+        if threat_count > safe_count:
+            return "threat", f"Threat keywords detected: {threat_count}", min(0.6 + threat_count * 0.1, 0.95)
+        if safe_count > 0:
+            return "safe", f"Safe keywords detected: {safe_count}", min(0.6 + safe_count * 0.1, 0.90)
+        return "unknown", "No clear threat or safe indicators", 0.40
+
+
+def run_labels(n: int, chunk_size: int):
+    print(f"{n:,} label inputs, label_batch chunk size {chunk_size}")
+    for domain, texts in synthetic_label_inputs(n).items():
+        legacy = LegacyWeakModel(domain)
+        model = WeakModel(domain, db_path=ROOT / "data")
+        variants = [
+            ("legacy label()", lambda: [legacy.label(t) for t in texts]),
+            ("compiled label()", lambda: [model.label(t) for t in texts]),
+            ("label_batch()", lambda: [label for i in range(0, len(texts), chunk_size)
+                                       for label in model.label_batch(texts[i:i + chunk_size])]),
+        ]
+        expected, baseline = None, None
+        for label, fn in variants:
+            start = time.perf_counter()
+            labels = fn()
+            elapsed = time.perf_counter() - start
+            verdicts = [(w.weak_prediction, w.weak_confidence, w.reasoning) for w in labels]
+            if expected is None:
+                expected, baseline = verdicts, elapsed
+            same = "same labels" if verdicts == expected else "DIFFERENT labels"
+            print(f"  {domain:<13} {label:<17} | {len(texts) / elapsed:11,.0f} labels/s"
+                  f" | speedup {baseline / elapsed:5.2f}x | {same}")
+
+
+def batch_export(source: Path, output: Path) -> Path:
+    pipeline = WeakToStrongPipeline("finance", db_path=ROOT / "data")
+    with open(source) as f:
+        pipeline.process_batch([line.rstrip("\n") for line in f])
+    # export_training_set always writes under SUPERVISION_DIR; move it next to the others
+    os.replace(pipeline.export_training_set(min_quality=0.7), output)
+    return output
+
+
+def stream_export(source: Path, output: Path, workers: int, chunk_size: int) -> Path:
+    pipeline = WeakToStrongPipeline("finance", db_path=ROOT / "data")
+    pipeline.process_stream(source, output_file=output, workers=workers, chunk_size=chunk_size)
+    return output
+
+
+def run(n: int, workers: int, chunk_size: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        source = root / "inputs.txt"
+        synthetic_inputs(source, n)
+
+        variants = [
+            ("process_batch + export", lambda out: batch_export(source, out)),
+            ("process_stream", lambda out: stream_export(source, out, 1, chunk_size)),
+        ]
+        if workers > 1:
+            variants.append((f"process_stream(w={workers})",
+                             lambda out: stream_export(source, out, workers, chunk_size)))
+
+        print(f"{n:,} inputs, chunk size {chunk_size} ({os.cpu_count()} CPUs)")
+        expected, baseline = None, None
+        for i, (label, fn) in enumerate(variants):
+            start = time.perf_counter()
+            output = fn(root / f"out_{i}.jsonl")
+            elapsed = time.perf_counter() - start
+            exported = output.read_bytes()
+
+            tracemalloc.start()
+            fn(root / f"mem_{i}.jsonl")
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            if expected is None:
+                expected, baseline = exported, elapsed
+            same = "same export" if exported == expected else "DIFFERENT export"
+            print(f"  {label:<24} | {n / elapsed:10,.0f} inputs/s | speedup {baseline / elapsed:5.2f}x"
+                  f" | peak heap {peak / 1e6:8.1f} MB | {same}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inputs", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--labels", type=int, default=0, help="inputs for the labeling benchmark")
+    args = parser.parse_args()
+    if args.inputs:
+        run(args.inputs, args.workers, args.chunk_size)
+    if args.labels:
+        run_labels(args.labels, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
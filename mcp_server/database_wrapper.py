@@ -4,13 +4,23 @@ Provides unified interface to all domain databases with weighted routing and alg
 """
 
 import json
+import os
 import re
+import hashlib
+import struct
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Set
+from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
 import numpy as np
 
+try:
+    from mcp_server.record_store import RecordStore
+except ImportError:  # run as a script: python mcp_server/database_wrapper.py
+    from record_store import RecordStore
+
 
 class ConfidenceLevel(Enum):
     """Query matching confidence levels"""
@@ -52,14 +62,39 @@ class DatabaseWrapper:
     Handles routing, weighting, and algorithm selection
     """
 
-    def __init__(self, data_dir: str = "data", config_dir: str = "config"):
+    INDEX_VERSION = 1
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        config_dir: str = "config",
+        index_file: Optional[str] = None,
+        store_file: Optional[str] = None,
+    ):
         self.data_dir = Path(data_dir)
         self.config_dir = Path(config_dir)
+        # Persistent keyword index (one read at startup, only changed files re-extracted)
+        self.index_file = Path(index_file) if index_file else self.data_dir / ".keyword_index.json"
+        self.index_stats = {"reused": 0, "extracted": 0, "removed": 0}
+        # mmap'd copy of every database file so queries decode only the files they return
+        self.store_file = Path(store_file) if store_file else self.data_dir / ".record_store.bin"
+        self.record_store: Optional[RecordStore] = None
 
         # Load configuration
         self.weights_config = self._load_weights_config()
+        self.refresh_index()
+
+    def refresh_index(self):
+        """Re-discover databases and bring the keyword index up to date with data/"""
         self.domain_databases = self._discover_databases()
+        # File ids index into this list; postings in keyword_index are sets of ids
+        self.indexed_files: List[Tuple[str, Path]] = [
+            (domain, file_path)
+            for domain, files in self.domain_databases.items()
+            for file_path in files
+        ]
         self.keyword_index = self._build_keyword_index()
+        self.record_store = self._open_record_store()
 
     def _load_weights_config(self) -> Dict:
         """Load database weights configuration"""
@@ -78,24 +113,137 @@ class DatabaseWrapper:
                     databases[domain_name] = json_files
         return databases
 
-    def _build_keyword_index(self) -> Dict[str, List[Tuple[str, str]]]:
-        """Build inverted index: keyword -> [(domain, file), ...]"""
-        index = {}
-
-        for domain, files in self.domain_databases.items():
-            for file_path in files:
-                with open(file_path, 'r') as f:
-                    content = json.load(f)
+    def _build_keyword_index(self) -> Dict[str, Set[int]]:
+        """Build inverted index: keyword -> {file_id, ...} (ids into self.indexed_files)
 
-                # Extract keywords from keys and values
-                keywords = self._extract_keywords(content)
-
-                for keyword in keywords:
-                    if keyword not in index:
-                        index[keyword] = []
-                    index[keyword].append((domain, file_path.name))
-
-        return index
+        Per-file keywords are cached in self.index_file keyed by relative path
+        with mtime/size/sha1, so only new or changed files are re-parsed.
+        """
+        cached_files = self._load_persisted_index()
+        file_entries = {}
+        self.index_stats = {"reused": 0, "extracted": 0, "removed": 0}
+        # Bytes of files read while indexing, handed to _open_record_store so no file is read twice
+        self._read_bytes: Dict[Path, bytes] = {}
+        dirty = False
+
+        for domain, file_path in self.indexed_files:
+            rel_path = f"{domain}/{file_path.name}"
+            entry = self._index_entry(file_path, cached_files.get(rel_path))
+            if entry is not cached_files.get(rel_path):
+                dirty = True
+            file_entries[rel_path] = entry
+
+        self._file_entries = file_entries
+        removed = set(cached_files) - set(file_entries)
+        self.index_stats["removed"] = len(removed)
+        if dirty or removed or not self.index_file.exists():
+            self._save_persisted_index(file_entries)
+
+        index = defaultdict(set)
+        for file_id, entry in enumerate(file_entries.values()):
+            for keyword in entry["keywords"]:
+                index[keyword].add(file_id)
+
+        return dict(index)
+
+    def _index_entry(self, file_path: Path, cached: Optional[Dict]) -> Dict:
+        """Return the index entry for a file, re-extracting keywords only if it changed"""
+        stat = file_path.stat()
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            self.index_stats["reused"] += 1
+            return cached
+
+        raw = file_path.read_bytes()
+        self._read_bytes[file_path] = raw
+        digest = hashlib.sha1(raw).hexdigest()
+        if cached and cached["sha1"] == digest:
+            # Touched but not modified (e.g. git checkout) - keep keywords, refresh stat
+            self.index_stats["reused"] += 1
+            return {**cached, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+        # Extract keywords from keys and values
+        keywords = self._extract_keywords(json.loads(raw))
+        self.index_stats["extracted"] += 1
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha1": digest,
+            "keywords": sorted(keywords),
+        }
+
+    def _load_persisted_index(self) -> Dict[str, Dict]:
+        """Load per-file keyword entries from the on-disk index (empty if missing or stale)"""
+        try:
+            with open(self.index_file, 'r') as f:
+                persisted = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(persisted, dict) or persisted.get("version") != self.INDEX_VERSION:
+            return {}
+        return persisted.get("files", {})
+
+    def _save_persisted_index(self, file_entries: Dict[str, Dict]):
+        """Atomically write the per-file keyword entries to the on-disk index"""
+        tmp_file = None
+        try:
+            # Unique temp name: concurrent indexers must not share (and steal) one file
+            fd, tmp_name = tempfile.mkstemp(prefix=self.index_file.name + ".", suffix=".tmp",
+                                            dir=self.index_file.parent)
+            tmp_file = Path(tmp_name)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"version": self.INDEX_VERSION, "files": file_entries}, f, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            # Read-only data dir (or a concurrent writer won): index still works in memory
+            if tmp_file is not None:
+                tmp_file.unlink(missing_ok=True)
+
+    def _open_record_store(self) -> Optional[RecordStore]:
+        """Open the record store, rebuilding it if any file changed
+
+        A rebuild copies unchanged files' bytes from the previous store and
+        takes changed files' bytes from indexing, so each file is read from
+        data/ at most once per refresh.
+        """
+        sources = {rel_path: entry["sha1"] for rel_path, entry in self._file_entries.items()}
+        read_bytes, self._read_bytes = self._read_bytes, {}
+        previous = self.record_store
+        if previous is None:
+            try:
+                previous = RecordStore(self.store_file)
+            except (OSError, ValueError, struct.error):
+                previous = None
+        if previous is not None and previous.meta.get("sources") == sources:
+            return previous
+
+        previous_sources = (previous.meta.get("sources") or {}) if previous is not None else {}
+
+        def blobs():
+            for rel_path, sha1 in sources.items():
+                blob = read_bytes.get(self.data_dir / rel_path)
+                if blob is None and previous_sources.get(rel_path) == sha1:
+                    blob = previous.get_raw(rel_path)
+                if blob is None:
+                    blob = (self.data_dir / rel_path).read_bytes()
+                yield blob
+
+        try:
+            return RecordStore.write_blobs(self.store_file, blobs(), keys=list(sources), meta={"sources": sources})
+        except OSError:
+            # Read-only data dir: fall back to reading files on demand
+            return None
+        finally:
+            if previous is not None:
+                previous.close()
+
+    def _load_database(self, domain: str, database_file: str) -> Any:
+        """Decode one database file, from the record store when available"""
+        if self.record_store is not None:
+            data = self.record_store.get(f"{domain}/{database_file}")
+            if data is not None:
+                return data
+        with open(self.data_dir / domain / database_file, 'r') as f:
+            return json.load(f)
 
     def _extract_keywords(self, data: Any, keywords: set = None) -> set:
         """Recursively extract keywords from JSON data"""
@@ -133,60 +281,55 @@ class DatabaseWrapper:
         # Extract query keywords
         query_keywords = set(re.findall(r'\b[a-z]{3,}\b', query.lower()))
 
-        # Calculate match scores for each database
+        # Accumulate matched keywords per file from the query's posting lists only
+        file_matches = defaultdict(list)
+        for keyword in query_keywords:
+            for file_id in self.keyword_index.get(keyword, ()):
+                file_matches[file_id].append(keyword)
+
+        # Safety/compliance boosts depend only on the query
+        query_lower = query.lower()
+        adjustments = self.weights_config['weight_adjustments']
+        boost = 1.0
+        if any(kw in query_lower for kw in adjustments['safety_critical_boost']['keywords']):
+            boost *= adjustments['safety_critical_boost']['multiplier']
+        if any(kw in query_lower for kw in adjustments['compliance_boost']['keywords']):
+            boost *= adjustments['compliance_boost']['multiplier']
+
+        # Calculate match scores for each matched database (file id order keeps ties stable)
         matches = []
 
-        for domain, files in self.domain_databases.items():
+        for file_id in sorted(file_matches):
+            domain, file_path = self.indexed_files[file_id]
+            matched_keywords = file_matches[file_id]
             domain_weight = self.weights_config['domain_weights'].get(domain, {}).get('weight', 0.5)
 
-            for file_path in files:
-                file_name = file_path.name
-
-                # Count keyword matches
-                matched_keywords = []
-                for keyword in query_keywords:
-                    if keyword in self.keyword_index and (domain, file_name) in self.keyword_index[keyword]:
-                        matched_keywords.append(keyword)
-
-                if not matched_keywords:
-                    continue
-
-                # Calculate base confidence
-                confidence = len(matched_keywords) / max(len(query_keywords), 1)
+            # Calculate base confidence, apply boosts and cap at 1.0
+            confidence = len(matched_keywords) / max(len(query_keywords), 1)
+            confidence = min(confidence * boost, 1.0)
 
-                # Apply safety-critical boost
-                if any(kw in query.lower() for kw in self.weights_config['weight_adjustments']['safety_critical_boost']['keywords']):
-                    confidence *= self.weights_config['weight_adjustments']['safety_critical_boost']['multiplier']
-
-                # Apply compliance boost
-                if any(kw in query.lower() for kw in self.weights_config['weight_adjustments']['compliance_boost']['keywords']):
-                    confidence *= self.weights_config['weight_adjustments']['compliance_boost']['multiplier']
-
-                # Cap confidence at 1.0
-                confidence = min(confidence, 1.0)
-
-                # Get database-specific weight
-                db_config = self.weights_config['domain_weights'][domain]['databases'].get(
-                    file_path.stem, {'weight': domain_weight}
-                )
-                db_weight = db_config.get('weight', domain_weight)
+            # Get database-specific weight
+            db_config = self.weights_config['domain_weights'][domain]['databases'].get(
+                file_path.stem, {'weight': domain_weight}
+            )
+            db_weight = db_config.get('weight', domain_weight)
 
-                # Calculate weighted score
-                weighted_score = confidence * db_weight * domain_weight
+            # Calculate weighted score
+            weighted_score = confidence * db_weight * domain_weight
 
-                # Get algorithm recommendations
-                algorithms = db_config.get('algorithms', [])
+            # Get algorithm recommendations
+            algorithms = db_config.get('algorithms', [])
 
-                matches.append(DatabaseMatch(
-                    domain=domain,
-                    database_file=file_name,
-                    confidence=confidence,
-                    weight=db_weight * domain_weight,
-                    weighted_score=weighted_score,
-                    matched_keywords=matched_keywords,
-                    relevant_sections=[],
-                    algorithm_recommendations=algorithms
-                ))
+            matches.append(DatabaseMatch(
+                domain=domain,
+                database_file=file_path.name,
+                confidence=confidence,
+                weight=db_weight * domain_weight,
+                weighted_score=weighted_score,
+                matched_keywords=matched_keywords,
+                relevant_sections=[],
+                algorithm_recommendations=algorithms
+            ))
 
         # Sort by weighted_score and return top_k
         matches.sort(key=lambda x: x.weighted_score, reverse=True)
@@ -228,9 +371,7 @@ class DatabaseWrapper:
         all_algorithms = set()
 
         for match in matches:
-            file_path = self.data_dir / match.domain / match.database_file
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            data = self._load_database(match.domain, match.database_file)
 
             sources.append({
                 "domain": match.domain,
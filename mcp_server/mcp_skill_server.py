@@ -10,6 +10,18 @@ Env vars required:
     DB_ROOT_PATH  — path to /data directory (default: ./data)
     LOG_LEVEL     — DEBUG | INFO | WARNING (default: INFO)
 
+Optional env vars:
+    DB_STORE_PATH — directory for compiled, mmap'd record stores; when set,
+                    records are decoded lazily instead of held in memory
+    MCP_WORKERS   — worker pool size for database lookups (default: min(8, CPUs))
+    MCP_POOL      — thread | process (default: thread)
+    MCP_CACHE_SIZE — max cached query_expert_db responses (default: 1024, 0 disables)
+    MCP_CACHE_TTL  — seconds a cached response stays valid (default: 300)
+    MCP_WARMUP     — 1 to preload every domain in the background at startup
+    MCP_WATCH_INTERVAL — seconds between background polls of the domain
+                    directories; changed domains are rebuilt and swapped in
+                    while queries keep using the old index (default: 0, off)
+
 Run:
     pip install mcp
     python mcp_server/mcp_skill_server.py
@@ -26,12 +38,25 @@ SELF-CORRECTION BLOCK:
 """
 
 import asyncio
+import heapq
+import concurrent.futures
 import json
+import math
 import os
+import re
 import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import partial
 from pathlib import Path
 from typing import Any
 
+try:
+    from mcp_server.record_store import RecordStore, compile_lock
+except ImportError:  # run as a script: python mcp_server/mcp_skill_server.py
+    from record_store import RecordStore, compile_lock
+
 try:
     from mcp.server.models import InitializationOptions
     from mcp.server import NotificationOptions, Server
@@ -46,65 +71,280 @@ logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 log = logging.getLogger("mcp-skill-server")
 
 DB_ROOT = Path(os.getenv("DB_ROOT_PATH", "./data"))
+DB_STORE = Path(os.environ["DB_STORE_PATH"]) if os.getenv("DB_STORE_PATH") else None
+MCP_WORKERS = int(os.getenv("MCP_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+MCP_POOL = os.getenv("MCP_POOL", "thread")
+MCP_CACHE_SIZE = int(os.getenv("MCP_CACHE_SIZE", "1024"))
+MCP_CACHE_TTL = float(os.getenv("MCP_CACHE_TTL", "300"))
+MCP_WARMUP = os.getenv("MCP_WARMUP", "0") == "1"
+MCP_WATCH_INTERVAL = float(os.getenv("MCP_WATCH_INTERVAL", "0"))
 DOMAINS = ["cybersecurity", "finance", "game_dev", "music", "video", "creativity"]
 
 
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens (underscores and punctuation split words)."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _record_tokens(value: Any, tokens: list[str]) -> list[str]:
+    """Collect tokens from every key and scalar value of a JSON record."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            tokens.extend(tokenize(str(key)))
+            _record_tokens(item, tokens)
+    elif isinstance(value, list):
+        for item in value:
+            _record_tokens(item, tokens)
+    elif value is not None:
+        tokens.extend(tokenize(str(value)))
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over a domain's records, built once per domain load.
+
+    Term weights are query-independent, so each posting stores its final
+    idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl)) weight and a
+    query only sums postings for its own terms.
+    """
+
+    def __init__(self, records: list, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_count = len(records)
+        term_counts = [Counter(_record_tokens(r, [])) for r in records]
+        self.doc_lengths = [sum(c.values()) for c in term_counts]
+        self.avg_doc_length = sum(self.doc_lengths) / self.doc_count if self.doc_count else 0.0
+
+        doc_freq: Counter = Counter()
+        for counts in term_counts:
+            doc_freq.update(counts.keys())
+        self.idf = {
+            term: math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+        self.postings: dict[str, list[tuple[int, float]]] = {}
+        for doc_id, counts in enumerate(term_counts):
+            norm = k1 * (1 - b + b * self.doc_lengths[doc_id] / (self.avg_doc_length or 1.0))
+            for term, tf in counts.items():
+                weight = self.idf[term] * tf * (k1 + 1) / (tf + norm)
+                self.postings.setdefault(term, []).append((doc_id, weight))
+
+    def search(self, query: str, top_k: int = 3) -> list[tuple[float, int]]:
+        """Return up to top_k (score, doc_id) pairs, best first."""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        # Ties broken by record order so results are deterministic
+        best = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, doc_id) for doc_id, score in best]
+
+
 class DatabaseConnector:
-    """Connects to domain databases and retrieves expert data."""
+    """
+    Connects to domain databases and retrieves expert data.
 
-    def __init__(self, db_root: Path):
-        self.db_root = db_root
-        self._cache: dict[str, list[dict]] = {}
+    With store_dir set, each domain is compiled into an mmap'd RecordStore
+    (rebuilt when any source file's mtime/size changes) and records are only
+    decoded when a query returns them.
 
-    def load_domain(self, domain: str) -> list[dict]:
-        """Load all JSON files for a domain into memory."""
-        if domain in self._cache:
-            return self._cache[domain]
+    A loaded domain is published as one (records, index) tuple, so a reload
+    can swap it in with a single assignment while queries already running
+    finish against the tuple they picked up.
+    """
 
+    def __init__(self, db_root: Path, store_dir: Path | None = None, change_check_interval: float = 1.0):
+        self.db_root = db_root
+        self.store_dir = Path(store_dir) if store_dir else None
+        self._loaded: dict[str, tuple[list[dict] | RecordStore, BM25Index]] = {}
+        # Source file path -> [mtime_ns, size] per domain, for change detection
+        self.change_check_interval = change_check_interval
+        self._fingerprints: dict[str, dict[str, list[int]]] = {}
+        self._last_checked: dict[str, float] = {}
+        # One lock per domain so concurrent worker threads load each domain once
+        self._load_locks: dict[str, threading.Lock] = {}
+        # Bumped each time a domain is reloaded or invalidated (see version())
+        self._versions: dict[str, int] = {}
+
+    def load_domain(self, domain: str) -> list[dict] | RecordStore:
+        """Load all JSON files for a domain (into memory, or into an mmap'd store)."""
+        return self._get_loaded(domain)[0]
+
+    def _get_loaded(self, domain: str) -> tuple[list[dict] | RecordStore, BM25Index | None]:
+        loaded = self._loaded.get(domain)
+        if loaded is not None:
+            return loaded
+
+        with self._load_locks.setdefault(domain, threading.Lock()):
+            loaded = self._loaded.get(domain)
+            if loaded is None:
+                loaded = self._build_domain(domain)
+                if loaded[1] is not None:
+                    self._loaded[domain] = loaded
+            return loaded
+
+    def _build_domain(self, domain: str) -> tuple[list[dict] | RecordStore, BM25Index | None]:
         domain_path = self.db_root / domain
-        records = []
 
         if not domain_path.exists():
             log.warning(f"Domain path not found: {domain_path}")
-            return []
+            return [], None
+
+        json_files = list(domain_path.rglob("*.json"))
+        sources = self._source_stats(json_files)
+        self._fingerprints[domain] = sources
+        if self.store_dir is None:
+            records = list(self._iter_records(json_files))
+        else:
+            records = self._load_store(domain, json_files, sources)
+
+        log.info(f"Loaded {len(records)} records from {domain}")
+        return records, BM25Index(records)
 
-        for json_file in domain_path.rglob("*.json"):
+    def _iter_records(self, json_files: list[Path]):
+        """Yield records from each JSON file, skipping files that fail to parse."""
+        for json_file in json_files:
             try:
                 with open(json_file) as f:
                     data = json.load(f)
-                    if isinstance(data, list):
-                        records.extend(data)
-                    elif isinstance(data, dict):
-                        records.append({"source_file": str(json_file), **data})
             except json.JSONDecodeError as e:
                 log.error(f"Bad JSON in {json_file}: {e}")
-
-        self._cache[domain] = records
-        log.info(f"Loaded {len(records)} records from {domain}")
-        return records
+                continue
+            if isinstance(data, list):
+                yield from data
+            elif isinstance(data, dict):
+                yield {"source_file": str(json_file), **data}
+
+    def _source_stats(self, json_files: list[Path]) -> dict[str, list[int]]:
+        sources = {}
+        for json_file in json_files:
+            try:
+                stat = json_file.stat()
+            except FileNotFoundError:
+                continue
+            sources[str(json_file)] = [stat.st_mtime_ns, stat.st_size]
+        return sources
+
+    def _load_store(self, domain: str, json_files: list[Path], sources: dict) -> RecordStore:
+        """
+        Open the domain's record store, recompiling it if any source changed.
+        Compilation holds compile_lock, so process-pool workers that all find
+        the store stale compile it once and the rest open the result.
+        """
+        store_path = self.store_dir / f"{domain}.records"
+        store = RecordStore.open_if_fresh(store_path, sources)
+        if store is not None:
+            return store
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        with compile_lock(store_path):
+            store = RecordStore.open_if_fresh(store_path, sources)
+            if store is None:
+                store = RecordStore.write(store_path, self._iter_records(json_files), meta={"sources": sources})
+                log.info(f"Compiled record store for {domain}: {store_path}")
+        return store
 
     def query(self, domain: str, query: str, top_k: int = 3) -> list[dict]:
-        """Simple keyword search across domain records. Upgrade to vector search later."""
-        records = self.load_domain(domain)
-        query_lower = query.lower()
-        scored = []
+        """BM25 keyword search across domain records. Upgrade to vector search later."""
+        while True:
+            records, index = self._get_loaded(domain)
+            if index is None:
+                return []
+            if not isinstance(records, RecordStore):
+                return [records[doc_id] for _, doc_id in index.search(query, top_k)]
+            # Hold the store so a concurrent reload cannot close it mid-read
+            if records.acquire():
+                try:
+                    return [records[doc_id] for _, doc_id in index.search(query, top_k)]
+                finally:
+                    records.release()
+            # Retired between lookup and acquire: the replacement is already published
+
+    def version(self, domain: str) -> int:
+        """How many times the domain has been reloaded or invalidated in this process."""
+        return self._versions.get(domain, 0)
+
+    def _retire(self, domain: str, loaded: tuple | None):
+        """Count a swap-out and close the old store once its in-flight readers finish."""
+        self._versions[domain] = self._versions.get(domain, 0) + 1
+        if loaded is not None and isinstance(loaded[0], RecordStore):
+            loaded[0].retire()
+
+    def warm_up(self, domains: list[str] | None = None, max_workers: int | None = None) -> dict:
+        """
+        Start loading domains (default: all DOMAINS) concurrently in the background.
+        Returns {domain: Future}; queries arriving meanwhile wait on the per-domain
+        lock instead of loading a second copy.
+        """
+        domains = list(domains or DOMAINS)
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(domains) or 1, thread_name_prefix="mcp-warmup"
+        )
+        futures = {domain: pool.submit(self.load_domain, domain) for domain in domains}
+        pool.shutdown(wait=False)
+        return futures
+
+    def reload_domain(self, domain: str):
+        """
+        Rebuild a domain from disk and swap it in atomically. Queries keep
+        running against the previous index while the new one is built.
+        """
+        with self._load_locks.setdefault(domain, threading.Lock()):
+            records, index = self._build_domain(domain)
+            if index is None:
+                old = self._loaded.pop(domain, None)
+            else:
+                old = self._loaded.get(domain)
+                self._loaded[domain] = (records, index)
+            self._retire(domain, old)
+
+    def change_check_due(self, domain: str) -> bool:
+        """True if check_for_changes would actually re-stat the domain's files."""
+        return time.monotonic() - self._last_checked.get(domain, float("-inf")) >= self.change_check_interval
+
+    def check_for_changes(self, domain: str, reload: bool = False, force: bool = False) -> bool:
+        """
+        Re-stat the domain's JSON files (at most once per change_check_interval,
+        unless force). If any file was added, removed or modified since the last
+        load/check, drop the loaded domain so the next query reloads it (or,
+        with reload, rebuild it now and swap it in), and return True.
+        """
+        if not force and not self.change_check_due(domain):
+            return False
+        self._last_checked[domain] = time.monotonic()
 
-        for record in records:
-            record_str = json.dumps(record).lower()
-            # Count keyword matches as basic relevance score
-            score = sum(1 for word in query_lower.split() if word in record_str)
-            if score > 0:
-                scored.append((score, record))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [r for _, r in scored[:top_k]]
+        domain_path = self.db_root / domain
+        json_files = list(domain_path.rglob("*.json")) if domain_path.exists() else []
+        current = self._source_stats(json_files)
+        previous = self._fingerprints.get(domain)
+        self._fingerprints[domain] = current
+        if previous is None or previous == current:
+            return False
+
+        if reload and domain in self._loaded:
+            log.info(f"Source files changed for {domain}; reloading")
+            self.reload_domain(domain)
+        else:
+            log.info(f"Source files changed for {domain}; invalidating")
+            self.invalidate(domain)
+        return True
+
+    def invalidate(self, domain: str):
+        """Forget a loaded domain; in-flight queries keep using the records they hold."""
+        with self._load_locks.setdefault(domain, threading.Lock()):
+            self._retire(domain, self._loaded.pop(domain, None))
 
     def get_stats(self) -> dict:
         """Return database statistics."""
         stats = {}
         for domain in DOMAINS:
             records = self.load_domain(domain)
-            stats[domain] = {"records": len(records), "loaded": domain in self._cache}
+            stats[domain] = {"records": len(records), "loaded": domain in self._loaded}
         return stats
 
 
@@ -175,11 +415,361 @@ class VerifierAgent:
         }
 
 
+class ResultCache:
+    """
+    Bounded LRU + TTL cache of serialized query_expert_db responses.
+
+    Keys are (domain, normalized query, top_k); the normalized query is the
+    sorted set of query tokens, which is all BM25 scoring depends on.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._epoch = 0  # bumped by invalidate() with no domain
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(domain: str, query: str, top_k: int) -> tuple:
+        return (domain, " ".join(sorted(set(tokenize(query)))), top_k)
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self, domain: str) -> tuple[int, int]:
+        """Changes on every invalidation of the domain; pass to put() to drop stale results."""
+        return (self._epoch, self._generations.get(domain, 0))
+
+    def put(self, key: tuple, value: str, generation: tuple[int, int] | None = None):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation(key[0]):
+                return  # computed from data that was invalidated while in flight
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, domain: str | None = None):
+        """Drop every entry (or only those for one domain)."""
+        with self._lock:
+            stale = [k for k in self._entries if domain is None or k[0] == domain]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            if domain is None:
+                self._epoch += 1
+            else:
+                self._generations[domain] = self._generations.get(domain, 0) + 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class DomainWatcher:
+    """
+    Polls domain directories from a daemon thread and hot-reloads changed ones.
+
+    Polling (mtime/size via check_for_changes) works on every platform and
+    filesystem; polls closer together than the connector's
+    change_check_interval are skipped. A changed domain is rebuilt off to the side and swapped in,
+    then on_change(domain) runs — e.g. to drop cached responses.
+
+    With MCP_POOL=process the watched connector is the main process's, which
+    serves no queries itself: each change it detects bumps
+    connector.version(domain), and ToolExecutor passes that version to the
+    workers so each re-checks the domain on its next query.
+    """
+
+    def __init__(
+        self,
+        connector: DatabaseConnector,
+        domains: list[str] | None = None,
+        interval: float = 2.0,
+        on_change=None,
+    ):
+        self.connector = connector
+        self.domains = list(domains or DOMAINS)
+        self.interval = interval
+        self.on_change = on_change
+        self.reloads = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll_once(self) -> list[str]:
+        """Check every domain once; return the domains that changed."""
+        changed = []
+        for domain in self.domains:
+            try:
+                if self.connector.check_for_changes(domain, reload=True):
+                    changed.append(domain)
+            except Exception as e:  # keep watching the other domains
+                log.error(f"Reload failed for {domain}: {e}")
+        for domain in changed:
+            if self.on_change is not None:
+                self.on_change(domain)
+        self.reloads += len(changed)
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll_once()
+
+    def start(self) -> "DomainWatcher":
+        if not self.running:
+            self._stop.clear()
+            # Fingerprints domains that are not loaded yet, so later polls can diff against them
+            self.poll_once()
+            self._thread = threading.Thread(target=self._run, name="mcp-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+# ─── Tool Execution ─────────────────────────────────────────────────────────
+
+# Per-process state for MCP_POOL=process workers (set by _init_worker)
+_worker_db: DatabaseConnector | None = None
+_worker_verifier: VerifierAgent | None = None
+# Main-process DatabaseConnector.version() per domain as of this worker's last query
+_worker_seen_versions: dict[str, int] = {}
+
+
+def _init_worker(db_root: Path, store_dir: Path | None, warm_up: bool = False):
+    global _worker_db, _worker_verifier
+    _worker_db = DatabaseConnector(db_root, store_dir=store_dir)
+    _worker_verifier = VerifierAgent()
+    if warm_up:
+        _worker_db.warm_up()
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+def _worker_query(domain: str, query: str, top_k: int, version: int = 0) -> list[dict]:
+    # Each worker process owns its connector, so it checks for source changes itself.
+    # version is the main process's count of changes it has seen for the domain: when
+    # it moved, re-stat now instead of waiting out this worker's own rate limit.
+    force = _worker_seen_versions.get(domain, 0) != version
+    _worker_seen_versions[domain] = version
+    _worker_db.check_for_changes(domain, force=force)
+    return _worker_db.query(domain, query, top_k)
+
+
+def _worker_stats() -> dict:
+    return _worker_db.get_stats()
+
+
+def _worker_verify(output: str, domain: str) -> dict:
+    return _worker_verifier.verify(output, domain)
+
+
+class ToolExecutor:
+    """
+    Runs database lookups and verification off the event loop.
+
+    Work goes to a thread pool (shared connector) or a process pool (one
+    connector per worker process, loaded on first use; queries carry the
+    main connector's version() so workers re-check domains it saw change). Concurrent calls
+    with the same arguments are coalesced into a single computation.
+    """
+
+    def __init__(
+        self,
+        connector: DatabaseConnector,
+        verifier: VerifierAgent,
+        max_workers: int = MCP_WORKERS,
+        use_processes: bool = False,
+    ):
+        self.connector = connector
+        self.verifier = verifier
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._pool: concurrent.futures.Executor | None = None
+        self._warm_workers = False
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.stats = {"executed": 0, "coalesced": 0}
+
+    def _get_pool(self) -> concurrent.futures.Executor:
+        # Created lazily so importing this module never spawns workers
+        if self._pool is None:
+            if self.use_processes:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.connector.db_root, self.connector.store_dir, self._warm_workers),
+                )
+            else:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="mcp-worker"
+                )
+        return self._pool
+
+    def warm_up(self) -> list[concurrent.futures.Future]:
+        """
+        Preload every domain in the background. Thread mode warms the shared
+        connector; process mode starts the workers, each warming its own.
+        """
+        if not self.use_processes:
+            return list(self.connector.warm_up().values())
+        if self._pool is None:
+            self._warm_workers = True
+        pool = self._get_pool()
+        return [pool.submit(_worker_ping) for _ in range(self.max_workers)]
+
+    async def _coalesced(self, key: tuple, fn, *args, local: bool = False) -> Any:
+        """
+        Run fn(*args) in the pool, sharing one in-flight result per key.
+        local=True runs on the event loop's default thread pool instead, for
+        work on this process's own connector even when the pool uses processes.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            pool = None if local else self._get_pool()
+            future = asyncio.get_running_loop().run_in_executor(pool, partial(fn, *args))
+            self._inflight[key] = future
+            future.add_done_callback(
+                lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None
+            )
+            self.stats["executed"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one cancelled caller must not cancel the computation for the others
+        return await asyncio.shield(future)
+
+    async def query(self, domain: str, query: str, top_k: int = 3) -> list[dict]:
+        if not self.use_processes:
+            return await self._coalesced(("query", domain, query, top_k), self.connector.query, domain, query, top_k)
+        # Workers re-check the domain when the main process has seen a change since their last query
+        version = self.connector.version(domain)
+        return await self._coalesced(
+            ("query", domain, query, top_k, version), _worker_query, domain, query, top_k, version
+        )
+
+    async def check_for_changes(self, domain: str) -> bool:
+        """Rate-limited source change check; the file walk runs off the event loop."""
+        if not self.connector.change_check_due(domain):
+            return False
+        return await self._coalesced(
+            ("changed", domain), self.connector.check_for_changes, domain, local=self.use_processes
+        )
+
+    async def get_stats(self) -> dict:
+        fn = _worker_stats if self.use_processes else self.connector.get_stats
+        return await self._coalesced(("get_stats",), fn)
+
+    async def verify(self, output: str, domain: str) -> dict:
+        fn = _worker_verify if self.use_processes else self.verifier.verify
+        return await self._coalesced(("verify", output, domain), fn, output, domain)
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+async def call_tool(
+    name: str,
+    arguments: dict | None,
+    tools: ToolExecutor | None = None,
+    cache: ResultCache | None = None,
+) -> str:
+    """Execute one MCP tool call and return its JSON text payload."""
+    tools = tools or executor
+    cache = cache or result_cache
+    args = arguments or {}
+
+    if name == "query_expert_db":
+        domain = args.get("domain", "cybersecurity")
+        query = args.get("query", "")
+        top_k = args.get("top_k", 3)
+
+        # A running watcher reloads changed domains and drops their cached responses itself
+        if (watcher is None or not watcher.running) and await tools.check_for_changes(domain):
+            cache.invalidate(domain)
+        key = ResultCache.make_key(domain, query, top_k)
+        text = cache.get(key)
+        if text is None:
+            generation = cache.generation(domain)
+            results = await tools.query(domain, query, top_k)
+            text = json.dumps(cpo.resolve(query, results), indent=2)
+            cache.put(key, text, generation)
+        return text
+
+    if name == "get_db_stats":
+        stats = {**await tools.get_stats(), "result_cache": cache.stats()}
+        return json.dumps(stats, indent=2)
+
+    if name == "verify_output":
+        result = await tools.verify(args.get("output", ""), args.get("domain", ""))
+        return json.dumps(result, indent=2)
+
+    raise ValueError(f"Unknown tool: {name}")
+
+
 # ─── MCP Server Setup ───────────────────────────────────────────────────────
 
-db = DatabaseConnector(DB_ROOT)
+db = DatabaseConnector(DB_ROOT, store_dir=DB_STORE)
 cpo = CPOResolver()
 verifier = VerifierAgent()
+executor = ToolExecutor(db, verifier, max_workers=MCP_WORKERS, use_processes=MCP_POOL == "process")
+result_cache = ResultCache(max_entries=MCP_CACHE_SIZE, ttl_seconds=MCP_CACHE_TTL)
+watcher: DomainWatcher | None = None
+
+
+def start_background_tasks():
+    """Start MCP_WARMUP preloading and the MCP_WATCH_INTERVAL watcher, if enabled."""
+    global watcher
+    if MCP_WARMUP:
+        executor.warm_up()
+    if MCP_WATCH_INTERVAL > 0 and watcher is None:
+        watcher = DomainWatcher(
+            db, interval=MCP_WATCH_INTERVAL, on_change=result_cache.invalidate
+        ).start()
 
 if HAS_MCP:
     server = Server("expert-skill-connector")
@@ -238,29 +828,11 @@ if HAS_MCP:
     async def handle_call_tool(
         name: str, arguments: dict | None
     ) -> list[types.TextContent]:
-        args = arguments or {}
-
-        if name == "query_expert_db":
-            domain = args.get("domain", "cybersecurity")
-            query = args.get("query", "")
-            top_k = args.get("top_k", 3)
-
-            results = db.query(domain, query, top_k)
-            resolved = cpo.resolve(query, results)
-
-            return [types.TextContent(type="text", text=json.dumps(resolved, indent=2))]
-
-        if name == "get_db_stats":
-            stats = db.get_stats()
-            return [types.TextContent(type="text", text=json.dumps(stats, indent=2))]
-
-        if name == "verify_output":
-            result = verifier.verify(args.get("output", ""), args.get("domain", ""))
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-        raise ValueError(f"Unknown tool: {name}")
+        text = await call_tool(name, arguments)
+        return [types.TextContent(type="text", text=text)]
 
     async def main():
+        start_background_tasks()
         async with stdio_server() as (read_stream, write_stream):
             await server.run(
                 read_stream,
@@ -0,0 +1,264 @@
+"""
+Record Store — Memory-Mapped, Lazily-Decoded JSON Records
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Packs many JSON records into one file so they can be served through mmap:
+a query decodes only the records it returns, and resident memory stays flat
+as the databases grow past what fits comfortably in RAM.
+
+File layout (little-endian):
+    MAGIC (8 bytes)
+    record blobs (UTF-8 JSON, back to back)
+    offsets table: (count + 1) x uint64 — record i is blob[offsets[i]:offsets[i+1]]
+    meta blob (JSON: {"keys": [...] | null, "meta": {...}})
+    footer: offsets_pos, count, meta_pos, meta_len (4 x uint64) + MAGIC
+
+The footer is written last, so a store can be produced in a single streaming
+pass and a partially written file is never mistaken for a valid one.
+
+SELF-CORRECTION BLOCK:
+    What Could Break:
+      1. Store stale after source JSON edits — callers compare meta["sources"]
+      2. File truncated mid-write — writes go to a unique temp file + os.replace
+      3. Concurrent compiles of one store — each writer has its own temp file;
+         the last os.replace wins and the others reopen the result
+      4. Store open while being replaced — old mapping stays valid until closed
+      5. Many processes finding one store stale — compile_lock lets one compile
+      6. Store swapped out while queries read it — retire() defers close() until
+         every acquire() has been released
+    How to Test:
+      pytest tests/test_mcp_server.py -v -k RecordStore
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; concurrent compiles stay correct, just redundant
+    fcntl = None
+
+
+MAGIC = b"EDRSTOR1"
+FOOTER = struct.Struct("<4Q")
+
+
+class RecordStoreError(ValueError):
+    """Raised when a file is not a valid record store."""
+
+
+@contextmanager
+def compile_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on <path>.lock across processes.
+
+    Callers compiling a store re-check open_if_fresh inside the lock, so when
+    many processes find the same store stale only the first one compiles it.
+    """
+    if fcntl is None:
+        yield
+        return
+    path = Path(path)
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class RecordStore(Sequence):
+    """Read-only, mmap-backed sequence of JSON records with optional string keys."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise RecordStoreError(f"Empty record store: {self.path}")
+
+        tail = len(MAGIC) + FOOTER.size
+        if len(self._mm) < len(MAGIC) + tail or self._mm[:len(MAGIC)] != MAGIC \
+                or self._mm[-len(MAGIC):] != MAGIC:
+            self.close()
+            raise RecordStoreError(f"Not a record store: {self.path}")
+
+        self._offsets_pos, self._count, meta_pos, meta_len = FOOTER.unpack_from(
+            self._mm, len(self._mm) - tail
+        )
+        header = json.loads(self._mm[meta_pos:meta_pos + meta_len])
+        self.meta: dict = header.get("meta") or {}
+        keys = header.get("keys")
+        self._key_index: Optional[dict[str, int]] = (
+            {key: i for i, key in enumerate(keys)} if keys is not None else None
+        )
+        # Readers in flight (acquire/release) and whether retire() is waiting on them
+        self._readers = 0
+        self._retired = False
+        self._reader_lock = threading.Lock()
+
+    # ─── Writing ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def write_blobs(
+        cls,
+        path: Path,
+        blobs: Iterable[bytes],
+        keys: Optional[Iterable[str]] = None,
+        meta: Optional[dict] = None,
+    ) -> "RecordStore":
+        """Write pre-encoded JSON blobs to a new store and open it.
+
+        Safe to call from several processes at once: each writes its own temp
+        file, and a writer whose os.replace loses the race opens the store
+        another writer put in place, provided it was built from the same sources.
+        """
+        path = Path(path)
+        offsets = array("Q", [len(MAGIC)])
+
+        fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC)
+                position = len(MAGIC)
+                for blob in blobs:
+                    f.write(blob)
+                    position += len(blob)
+                    offsets.append(position)
+
+                if sys.byteorder == "big":
+                    offsets.byteswap()
+                offsets_pos = position
+                f.write(offsets.tobytes())
+
+                header = json.dumps({
+                    "keys": list(keys) if keys is not None else None,
+                    "meta": meta or {},
+                }).encode()
+                meta_pos = offsets_pos + len(offsets) * 8
+                f.write(header)
+                f.write(FOOTER.pack(offsets_pos, len(offsets) - 1, meta_pos, len(header)))
+                f.write(MAGIC)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            store = cls.open_if_fresh(path, (meta or {}).get("sources"))
+            if store is None:
+                raise
+            return store
+        return cls(path)
+
+    @classmethod
+    def write(
+        cls,
+        path: Path,
+        records: Iterable[Any],
+        keys: Optional[Iterable[str]] = None,
+        meta: Optional[dict] = None,
+    ) -> "RecordStore":
+        """Encode records as JSON, write them to a new store and open it."""
+        return cls.write_blobs(path, (json.dumps(r).encode() for r in records), keys, meta)
+
+    @classmethod
+    def open_if_fresh(cls, path: Path, sources: dict) -> Optional["RecordStore"]:
+        """Open an existing store only if it was built from exactly these sources."""
+        try:
+            store = cls(path)
+        except (OSError, RecordStoreError, json.JSONDecodeError, struct.error):
+            return None
+        if store.meta.get("sources") != sources:
+            store.close()
+            return None
+        return store
+
+    # ─── Reading ──────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+        return json.loads(self.raw(index))
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._count):
+            yield self[i]
+
+    def raw(self, index: int) -> bytes:
+        """Return the undecoded JSON bytes of one record."""
+        start, end = struct.unpack_from("<2Q", self._mm, self._offsets_pos + 8 * index)
+        return self._mm[start:end]
+
+    def keys(self) -> list[str]:
+        return list(self._key_index or ())
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """Undecoded JSON bytes of the record stored under key, or None."""
+        if self._key_index is None or key not in self._key_index:
+            return None
+        return self.raw(self._key_index[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Decode the record stored under key (stores written with keys only)."""
+        if self._key_index is None or key not in self._key_index:
+            return default
+        return self[self._key_index[key]]
+
+    def close(self):
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    # ─── Sharing with concurrent readers ─────────────────────────────────
+
+    def acquire(self) -> bool:
+        """Register a reader; False if the store was retired and must not be read."""
+        with self._reader_lock:
+            if self._retired:
+                return False
+            self._readers += 1
+            return True
+
+    def release(self):
+        with self._reader_lock:
+            self._readers -= 1
+            close = self._retired and self._readers == 0
+        if close:
+            self.close()
+
+    def retire(self):
+        """Close now if no reader holds the store, else when the last one releases it."""
+        with self._reader_lock:
+            self._retired = True
+            close = self._readers == 0
+        if close:
+            self.close()
+
+    def __enter__(self) -> "RecordStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,193 @@
+"""
+Tests for algorithms/anomaly_stream.py
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Run: pytest tests/test_anomaly_stream.py -v
+"""
+
+import pytest
+import io
+import json
+import os
+import select
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algorithms.anomaly_stream import AnomalyStreamPipeline, batched, follow, read_lines, read_stream
+from algorithms.anomaly_to_signature import SIGNATURES_DIR, SignatureDatabase
+
+
+@pytest.fixture(autouse=True)
+def cleanup_signatures():
+    yield
+    if SIGNATURES_DIR.exists():
+        for f in SIGNATURES_DIR.glob("*"):
+            if f.is_file():
+                f.unlink()
+
+
+def falco_line(second: int, proc: str = "bash", syscall: str = "execve", minute: int = 0) -> str:
+    return f"2024-01-15 12:{minute:02d}:{second:02d} syscall={syscall} proc.name={proc} user.name=x"
+
+
+class TestLineSources:
+
+    def test_batched_sizes(self):
+        assert list(batched(["a", "b", "c"], 2)) == [["a", "b"], ["c"]]
+
+    def test_idle_marker_flushes_partial_batch(self):
+        assert list(batched(["a", None, "b", "c"], 10)) == [["a"], ["b", "c"]]
+
+    def test_max_latency_flushes_trickle(self):
+        clock = iter([0.0, 0.4, 1.2, 2.0, 2.1]).__next__
+        assert list(batched(["a", "b", "c", "d", "e"], 10, max_latency=1.0, clock=clock)) == \
+            [["a", "b", "c"], ["d", "e"]]
+
+    def test_read_stream_yields_idle_markers(self):
+        read_fd, write_fd = os.pipe()
+        with open(read_fd) as reader:
+            lines = read_stream(reader, poll_interval=0.01)
+            os.write(write_fd, b"one\ntw")
+            assert next(lines) == "one"
+            assert next(lines) is None  # incomplete line is held back
+            os.write(write_fd, b"o\nlast")
+            os.close(write_fd)
+            assert list(lines) == ["two", "last"]
+
+    def test_read_stream_without_fileno(self):
+        assert list(read_stream(io.StringIO("one\ntwo\n"))) == ["one", "two"]
+
+    def test_read_lines_file(self, tmp_path):
+        path = tmp_path / "log"
+        path.write_text("one\ntwo\n")
+        assert list(read_lines(str(path))) == ["one", "two"]
+
+    def test_follow_sees_appended_and_partial_lines(self, tmp_path):
+        path = tmp_path / "log"
+        path.write_text("one\n")
+        stop = threading.Event()
+        lines = follow(path, poll_interval=0.001, stop=stop)
+        assert next(lines) == "one"
+        assert next(lines) is None
+        with open(path, "a") as f:
+            f.write("tw")
+        assert next(lines) is None  # incomplete line is held back
+        with open(path, "a") as f:
+            f.write("o\n")
+        assert next(lines) == "two"
+        stop.set()
+
+    def test_follow_waits_for_missing_file(self, tmp_path):
+        path = tmp_path / "log"
+        stop = threading.Event()
+        lines = follow(path, poll_interval=0.001, stop=stop)
+        assert next(lines) is None
+        path.write_text("first\n")
+        assert [line for line in (next(lines), next(lines)) if line] == ["first"]
+        stop.set()
+        assert list(lines) == []
+
+    def test_follow_reopens_truncated_file(self, tmp_path):
+        path = tmp_path / "log"
+        path.write_text("old line one\nold line two\n")
+        lines = follow(path, poll_interval=0.001, from_end=True)
+        assert next(lines) is None
+        path.write_text("new\n")
+        assert [line for line in (next(lines), next(lines)) if line] == ["new"]
+
+
+class TestAnomalyStreamPipeline:
+
+    def test_emits_signature_at_min_support(self):
+        pipeline = AnomalyStreamPipeline(min_support=3)
+        assert pipeline.process_batch([falco_line(1), falco_line(2)]) == []
+        signatures = pipeline.process_batch([falco_line(3)])
+        assert len(signatures) == 1
+        assert signatures[0].rule_type == "falco"
+        assert "execve" in signatures[0].pattern
+
+    def test_cluster_emits_once_per_window(self):
+        pipeline = AnomalyStreamPipeline(min_support=2)
+        signatures = pipeline.process_batch([falco_line(s) for s in range(10)])
+        assert len(signatures) == 1
+        assert pipeline.clusters[next(iter(pipeline.clusters))].count == 10
+
+    def test_different_features_cluster_separately(self):
+        pipeline = AnomalyStreamPipeline(min_support=2)
+        lines = [falco_line(1, "bash"), falco_line(2, "nc"), falco_line(3, "bash"), falco_line(4, "nc")]
+        assert len(pipeline.process_batch(lines)) == 2
+
+    def test_window_expiry_splits_clusters(self):
+        pipeline = AnomalyStreamPipeline(min_support=2, window_seconds=30)
+        assert pipeline.process_batch([falco_line(0), falco_line(0, minute=1)]) == []
+        assert pipeline.stats["clusters_expired"] == 1
+
+    def test_max_clusters_bounds_memory(self):
+        pipeline = AnomalyStreamPipeline(min_support=5, max_clusters=3)
+        pipeline.process_batch([falco_line(1, f"proc{i}") for i in range(10)])
+        assert len(pipeline.clusters) == 3
+        assert pipeline.stats["clusters_evicted"] == 7
+
+    def test_lines_without_features_skipped(self):
+        pipeline = AnomalyStreamPipeline()
+        pipeline.process_batch(["nothing to see here", falco_line(1)])
+        assert pipeline.stats["skipped"] == 1
+        assert pipeline.stats["anomalies"] == 1
+        assert pipeline.lines_per_sec > 0
+
+    def test_falco_json_lines(self):
+        event = {
+            "time": "2024-01-15T12:00:01.123456789Z",
+            "rule": "Terminal shell in container",
+            "priority": "Critical",
+            "output": "shell spawned syscall=execve proc.name=bash",
+        }
+        pipeline = AnomalyStreamPipeline(min_support=1)
+        anomaly, _ = pipeline.parse_line(json.dumps(event))
+        assert anomaly.severity == 0.9
+        assert anomaly.features["rule"] == "Terminal_shell_in_container"
+        assert anomaly.timestamp.startswith("2024-01-15T12:00:01")
+
+    def test_parse_lines_matches_parse_line(self):
+        pipeline = AnomalyStreamPipeline(clock=lambda: 1_700_000_000.0)
+        lines = [falco_line(1), "nothing to see here", json.dumps({"rule": "x y", "output": "syscall=open"})]
+        assert pipeline.parse_lines(lines) == [pipeline.parse_line(l) for l in lines]
+
+    def test_missing_timestamp_uses_clock(self):
+        pipeline = AnomalyStreamPipeline(clock=lambda: 1_700_000_000.0)
+        _, event_time = pipeline.parse_line("syscall=execve proc.name=bash")
+        assert event_time == 1_700_000_000.0
+
+    def test_run_over_file_with_database(self, tmp_path):
+        path = tmp_path / "falco.log"
+        path.write_text("\n".join(falco_line(s) for s in range(6)) + "\n")
+        pipeline = AnomalyStreamPipeline(min_support=3, batch_size=2, database=SignatureDatabase())
+        signatures = list(pipeline.run(str(path)))
+        assert len(signatures) == 1
+        assert pipeline.stats["batches"] == 3
+        assert len(SignatureDatabase().load_all()) == 1
+
+    def test_network_source(self):
+        pipeline = AnomalyStreamPipeline(source="network", min_support=2)
+        lines = [f"2024-01-15 12:00:0{i} TCP 10.0.0.{i} port=4444" for i in range(2)]
+        signatures = pipeline.process_batch(lines)
+        assert [s.rule_type for s in signatures] == ["snort"]
+
+
+def test_cli_stdin_emits_before_eof():
+    script = Path(__file__).parent.parent / "algorithms" / "anomaly_stream.py"
+    proc = subprocess.Popen([sys.executable, str(script), "-", "--min-support", "3"],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        proc.stdin.write("".join(falco_line(s) + "\n" for s in range(4)).encode())
+        proc.stdin.flush()
+        ready, _, _ = select.select([proc.stdout], [], [], 10)
+        assert ready, "no signature emitted while stdin was still open"
+        assert json.loads(proc.stdout.readline())["signature_id"]
+    finally:
+        proc.stdin.close()
+        proc.wait(10)
@@ -7,14 +7,15 @@ Run: pytest tests/test_anomaly_to_signature.py -v
 
 import pytest
 import json
+import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from algorithms.anomaly_to_signature import (
-    AnomalyParser, SignatureGenerator, SignatureDatabase,
-    Anomaly, Signature, SIGNATURES_DIR
+    AnomalyParser, FeatureCounts, SignatureGenerator, SignatureDatabase, SignatureIndex,
+    Anomaly, Signature, SIGNATURES_DIR, pattern_tokens
 )
 
 
@@ -76,6 +77,25 @@ class TestAnomalyParser:
         features = self.parser.parse(log, "falco")
         assert features["rule"] is None
 
+    def test_parse_ip_not_matched_inside_longer_token(self):
+        features = self.parser.parse("id=x1.2.3.4 ver 1.2.3.45678 from 1.2.3.4", "network")
+        assert features["ips"] == ["1.2.3.4"]
+
+    def test_extract_protocol_priority(self):
+        assert self.parser.parse("HTTPS request", "network")["protocol"] == "HTTP"
+        assert self.parser.parse("udp then tcp", "network")["protocol"] == "TCP"
+        assert self.parser.parse("no transport", "network")["protocol"] is None
+
+    @pytest.mark.parametrize("source", ["falco", "network", "system"])
+    def test_parse_batch_matches_parse(self, source):
+        logs = [
+            "rule=Shell syscall=execve proc.name=bash port=22 connection=10.0.0.1",
+            "udp from 192.168.1.1 port=53 port=5353",
+            "",
+            "syscall=open syscall=read proc.name=cat",
+        ]
+        assert self.parser.parse_batch(logs, source) == [self.parser.parse(l, source) for l in logs]
+
 
 class TestSignatureGenerator:
 
@@ -140,6 +160,39 @@ class TestSignatureGenerator:
         if sigs:
             assert len(sigs[0].source_anomalies) > 0
 
+    def random_features(self, n, seed=3):
+        rng = random.Random(seed)
+        return [{
+            "syscalls": rng.sample(["execve", "open", "read", "connect", "ptrace"], rng.randint(0, 3)),
+            "processes": rng.sample(["bash", "nc", "curl", "python"], rng.randint(0, 2)),
+            "ports": [str(rng.choice([22, 80, 4444]))] if rng.random() < 0.3 else [],
+        } for _ in range(n)]
+
+    def test_feature_counts_merge_matches_whole(self):
+        features = self.random_features(200)
+        merged = FeatureCounts()
+        for i in range(0, 200, 37):
+            merged.merge(FeatureCounts.from_features(features[i:i + 37]))
+        whole = FeatureCounts.from_features(features)
+        assert merged == whole
+        assert list(merged.syscalls) == list(whole.syscalls)  # first-seen order kept
+        assert merged.common() == self.generator._find_common_features(features)
+
+    def test_parallel_count_matches_serial(self):
+        features = self.random_features(500)
+        parallel = self.generator.count_features(features, workers=2, shards=7)
+        serial = self.generator.count_features(features)
+        assert parallel == serial
+        assert parallel.common() == serial.common()
+        assert list(parallel.processes) == list(serial.processes)
+
+    def test_parallel_generation_matches_serial(self):
+        anomalies = [self.create_anomaly(syscalls=f["syscalls"] or ["execve"], processes=f["processes"])
+                     for f in self.random_features(60)]
+        serial = self.generator.generate_from_anomalies(anomalies, min_support=3)
+        parallel = self.generator.generate_from_anomalies(anomalies, min_support=3, workers=2)
+        assert [s.pattern for s in parallel] == [s.pattern for s in serial]
+
 
 class TestSignatureDatabase:
 
@@ -174,6 +227,13 @@ class TestSignatureDatabase:
         assert len(loaded) == 1
         assert loaded[0].signature_id == "sig_001"
 
+    def test_iter_all_skips_corrupt_lines(self):
+        self.db.add(self.create_signature("sig_001"))
+        with open(self.db.db_file, "a") as f:
+            f.write("CORRUPT\n")
+            f.write('{"signature_id": "missing_fields"}\n')
+        assert [s.signature_id for s in self.db.iter_all()] == ["sig_001"]
+
     def test_conflict_detection_rejects_similar_patterns(self):
         # Use patterns with >70% word overlap to trigger conflict
         sig1 = self.create_signature("sig1", pattern="syscall execve process bash user attacker")
@@ -186,6 +246,50 @@ class TestSignatureDatabase:
         assert result2["added"] is False
         assert result2["reason"] == "conflict"
 
+    def test_no_conflict_across_rule_types(self):
+        self.db.add(self.create_signature("sig1", pattern="syscall execve process bash"))
+        snort = self.create_signature("sig2", pattern="syscall execve process bash")
+        snort.rule_type = "snort"
+        assert self.db.add(snort)["added"] is True
+
+    def test_index_persisted_for_new_instance(self):
+        self.db.add(self.create_signature("sig1", pattern="syscall execve process bash user attacker"))
+        self.db.add(self.create_signature("sig2", pattern="open read write close"))
+        assert len(self.db.index_file.read_text().splitlines()) == 2
+
+        reopened = SignatureDatabase()
+        result = reopened.add(self.create_signature("sig3", pattern="syscall execve process bash user root"))
+        assert result["conflicts"] == ["sig1"]
+        assert reopened._indexed_bytes == self.db.db_file.stat().st_size
+
+    def test_external_appends_are_indexed(self):
+        self.db.add(self.create_signature("sig1", pattern="alpha beta gamma"))
+        other = SignatureDatabase()
+        other.add(self.create_signature("sig2", pattern="open read write close"))
+        result = self.db.add(self.create_signature("sig3", pattern="open read write close"))
+        assert result["conflicts"] == ["sig2"]
+
+    def test_truncated_store_reindexed(self):
+        self.db.add(self.create_signature("sig1", pattern="open read write close"))
+        self.db.db_file.write_text("")
+        assert self.db.add(self.create_signature("sig2", pattern="open read write close"))["added"] is True
+        assert len(self.db.load_all()) == 1
+
+    def test_index_matches_pairwise_check(self):
+        rng = random.Random(7)
+        vocab = [f"w{i}" for i in range(12)]
+        stored = [
+            self.create_signature(f"s{i}", pattern=" ".join(rng.sample(vocab, rng.randint(1, 8))))
+            for i in range(300)
+        ]
+        index = SignatureIndex()
+        for sig in stored:
+            index.add(sig.rule_type, sig.signature_id, pattern_tokens(sig.pattern))
+        for i in range(200):
+            new = self.create_signature(f"n{i}", pattern=" ".join(rng.sample(vocab, rng.randint(0, 10))))
+            expected = [c.signature_id for c in self.db._check_conflicts(new, stored)]
+            assert index.find_conflicts("falco", pattern_tokens(new.pattern)) == expected
+
     def test_export_rules_creates_file(self):
         sig = self.create_signature()
         self.db.add(sig)
@@ -8,13 +8,14 @@ Run: pytest tests/test_cot_verifier.py -v
 import pytest
 import json
 import sys
+from dataclasses import asdict
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from algorithms.cot_verifier import (
     CitationParser, DatabaseRuleChecker, CoTVerifier, CoTDatabase,
-    ReasoningStep, CoTAnswer
+    ReasoningStep, CoTAnswer, index_rules
 )
 
 
@@ -95,6 +96,70 @@ class TestDatabaseRuleChecker:
         assert result["verified"] is True
 
 
+class TestRuleRegistry:
+
+    def test_index_rules_covers_keys_nested_and_named_items(self):
+        data = {
+            "valuation": {"tech_pe_threshold": 30, "banks": {"name": "bank_pb_rule", "value": 1.2}},
+            "rules": [{"name": "debt_rule", "max": 2.0}],
+            "pe_ratio": 28.5,
+        }
+        rules = index_rules(data)
+        assert rules["pe_ratio"] == {"pe_ratio": 28.5}
+        assert rules["valuation"] == {"valuation": data["valuation"]}
+        assert rules["tech_pe_threshold"] is data["valuation"]
+        assert rules["bank_pb_rule"] is data["valuation"]
+        assert rules["debt_rule"] == {"name": "debt_rule", "max": 2.0}
+        assert index_rules([{"name": "a"}, {"name": "a", "v": 2}, "x"]) == {"a": {"name": "a"}}
+
+    def test_values_are_not_rule_names(self, tmp_path):
+        (tmp_path / "r.json").write_text(json.dumps({"pe": {"description": "pe_threshold is 30"}}))
+        checker = DatabaseRuleChecker(tmp_path)
+        assert not checker.verify_citation({"source_file": "r.json", "rule_name": "pe_threshold"})["verified"]
+
+    def test_preload_indexes_every_json_file(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.json").write_text(json.dumps({"rule_a": 1}))
+        (tmp_path / "sub" / "b.json").write_text(json.dumps([{"name": "rule_b"}]))
+        (tmp_path / "broken.json").write_text("{not json")
+        checker = DatabaseRuleChecker(tmp_path, preload=True)
+        assert len(checker._registry) == 3
+        assert checker.verify_citation({"source_file": "./sub/../sub/b.json", "rule_name": "rule_b"})["verified"]
+        broken = checker.verify_citation({"source_file": "broken.json", "rule_name": "x"})
+        assert broken["note"].startswith("Error loading")
+
+    def test_repeated_citation_skips_filesystem(self, tmp_path, monkeypatch):
+        (tmp_path / "a.json").write_text(json.dumps({"rule_a": 1}))
+        checker = DatabaseRuleChecker(tmp_path, check_interval=3600)
+        citation = {"source_file": "a.json", "rule_name": "rule_a"}
+        assert checker.verify_citation(citation)["verified"]
+        monkeypatch.setattr("algorithms.cot_verifier.os.stat", lambda *a: pytest.fail("stat called"))
+        result = checker.verify_citation(citation)
+        assert result["verified"]
+        result["verified"] = False  # callers get a copy
+        assert checker.verify_citation(citation)["verified"]
+
+    def test_changed_file_reindexed(self, tmp_path):
+        rules = tmp_path / "a.json"
+        rules.write_text(json.dumps({"old_rule": 1}))
+        checker = DatabaseRuleChecker(tmp_path, check_interval=0)
+        assert checker.verify_citation({"source_file": "a.json", "rule_name": "old_rule"})["verified"]
+        rules.write_text(json.dumps({"new_rule": 1, "padding": "changes the size"}))
+        assert checker.verify_citation({"source_file": "a.json", "rule_name": "new_rule"})["verified"]
+        assert not checker.verify_citation({"source_file": "a.json", "rule_name": "old_rule"})["verified"]
+
+    def test_created_and_deleted_files_noticed(self, tmp_path):
+        checker = DatabaseRuleChecker(tmp_path, check_interval=3600)
+        citation = {"source_file": "late.json", "rule_name": "r"}
+        assert "not found" in checker.verify_citation(citation)["note"].lower()
+        (tmp_path / "late.json").write_text(json.dumps({"r": 1}))
+        assert checker.check_for_changes() == [str(tmp_path / "late.json")]
+        assert checker.verify_citation(citation)["verified"]
+        (tmp_path / "late.json").unlink()
+        checker.check_for_changes()
+        assert not checker.verify_citation(citation)["verified"]
+
+
 class TestCoTVerifier:
 
     @pytest.fixture
@@ -164,6 +229,54 @@ Final Answer: Done
             assert result.overall_verified is True
 
 
+class TestVerifyBatch:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        (tmp_path / "rules.json").write_text(json.dumps({"pe_limit": 30, "debt_limit": 2.0}))
+        return tmp_path
+
+    def batch_items(self, n=12):
+        outputs = [
+            "Step 1: PE is high [Source: rules.json | Rule: pe_limit]\n2. Debt ok [Source: rules.json | Rule: debt_limit]\nFinal Answer: Sell",
+            "Step 1: No source here\nFinal Answer: Hold",
+            "Step 1: Made up [Source: rules.json | Rule: invented]\nStep 2: [Source: gone.json | Rule: x]\nFinal Answer: Buy",
+            "No steps at all",
+        ]
+        return [(f"query {i}", "finance", outputs[i % len(outputs)]) for i in range(n)]
+
+    @staticmethod
+    def comparable(answer):
+        data = asdict(answer)
+        del data["timestamp"]
+        return data
+
+    @pytest.mark.parametrize("strict_mode", [True, False])
+    def test_batch_matches_verify(self, tmp_db, strict_mode):
+        verifier = CoTVerifier(tmp_db, strict_mode=strict_mode)
+        items = self.batch_items()
+        expected = [self.comparable(verifier.verify(*item)) for item in items]
+        assert [self.comparable(a) for a in verifier.verify_batch(items)] == expected
+
+    def test_identical_citations_checked_once(self, tmp_db, monkeypatch):
+        verifier = CoTVerifier(tmp_db)
+        calls = []
+        original = verifier.rule_checker.verify_citation
+        monkeypatch.setattr(verifier.rule_checker, "verify_citation", lambda c: calls.append(c) or original(c))
+        verifier.verify_batch(self.batch_items(40))
+        assert len(calls) == 4
+
+    def test_process_pool_keeps_order(self, tmp_db):
+        verifier = CoTVerifier(tmp_db)
+        items = self.batch_items(30)
+        expected = [self.comparable(a) for a in verifier.verify_batch(items)]
+        parallel = verifier.verify_batch(items, workers=2, chunk_size=4)
+        assert [self.comparable(a) for a in parallel] == expected
+
+    def test_empty_batch(self, tmp_db):
+        assert CoTVerifier(tmp_db).verify_batch([]) == []
+
+
 class TestCoTDatabase:
 
     @pytest.fixture(autouse=True)
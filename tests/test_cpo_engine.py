@@ -6,6 +6,7 @@ Run: pytest tests/test_cpo_engine.py -v
 """
 
 import pytest
+import csv
 import json
 import sys
 from pathlib import Path
@@ -159,6 +160,43 @@ class TestCPOEngine:
         stats = self.engine.get_stats()
         assert stats["total_triplets"] == 2
 
+    def test_buffered_records_visible_to_readers(self):
+        engine = CPOEngine(TEST_DOMAIN + "_buffered", buffer_lines=100, flush_interval=0)
+        try:
+            for i in range(5):
+                engine.record(f"q{i}", "g", [{"x": i}])
+            assert engine.get_stats()["total_triplets"] == 5
+            engine.record("q5", "generic", [{"x": 5}])
+            engine.flush()
+            with open(engine.conflict_file, newline="") as f:
+                assert len(list(csv.reader(f))) == 7  # header + 6 conflicts
+        finally:
+            engine.triplet_file.unlink(missing_ok=True)
+            engine.conflict_file.unlink(missing_ok=True)
+
+    def test_iter_triplets_streams(self):
+        for i in range(3):
+            self.engine.record(f"q{i}", "g", [{"x": i}])
+        stream = self.engine.iter_triplets()
+        assert not isinstance(stream, list)
+        assert [t.query for t in stream] == ["q0", "q1", "q2"]
+
+    def test_export_counts_every_triplet(self):
+        for i in range(4):
+            self.engine.record(f"q{i}", "g", [{"x": i}])
+        output = self.engine.export_for_finetuning()
+        with open(output) as f:
+            prompts = [json.loads(line)["prompt"] for line in f]
+        output.unlink()
+        assert prompts == ["q0", "q1", "q2", "q3"]
+
+    def test_get_stats_single_pass_values(self):
+        self.engine.record("q1", "g", [{"x": 1}])
+        self.engine.record("q2", "", [{"x": 1}, {"y": 2}])
+        stats = self.engine.get_stats()
+        assert stats["conflicts_logged"] == 2
+        assert stats["avg_confidence"] == 0.75
+
     def test_get_stats_empty_domain(self):
         stats = self.engine.get_stats()
         assert stats["total_triplets"] == 0
@@ -234,6 +272,23 @@ class TestActiveLearner:
         # Most recent are at the end of file, so returned last N
         assert gaps[-1]["query"] == "gap 4"
 
+    def test_get_top_gaps_skips_corrupt_lines(self):
+        for i in range(3):
+            self.learner.check(f"gap {i}", "finance", 0.1)
+        with open(self.GAP_FILE, "a") as f:
+            f.write("CORRUPT\n")
+        gaps = self.learner.get_top_gaps(n=2)
+        assert [g["query"] for g in gaps] == ["gap 1", "gap 2"]
+
+    def test_get_top_gaps_zero(self):
+        self.learner.check("gap", "finance", 0.1)
+        assert self.learner.get_top_gaps(n=0) == []
+
+    def test_iter_gaps_oldest_first(self):
+        for i in range(3):
+            self.learner.check(f"gap {i}", "finance", 0.1)
+        assert [g["query"] for g in self.learner.iter_gaps()] == ["gap 0", "gap 1", "gap 2"]
+
     def test_custom_threshold(self):
         strict_learner = ActiveLearner(confidence_threshold=0.8)
         result_lo = strict_learner.check("q", "video", 0.5)
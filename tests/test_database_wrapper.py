@@ -0,0 +1,178 @@
+"""
+Tests for mcp_server/database_wrapper.py
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Run: pytest tests/test_database_wrapper.py -v
+"""
+
+import pytest
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mcp_server.database_wrapper import DatabaseWrapper
+
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Create a small data/ tree using domains present in database_weights.json."""
+    electrical = tmp_path / "electrical"
+    electrical.mkdir()
+    (electrical / "nec_code_essentials.json").write_text(json.dumps({
+        "wire_sizing": {"description": "copper conductor ampacity table for branch circuit"},
+    }))
+    healthcare = tmp_path / "healthcare"
+    healthcare.mkdir()
+    (healthcare / "emergency_protocols.json").write_text(json.dumps({
+        "sepsis": {"steps": ["administer antibiotics", "monitor lactate"]},
+    }))
+    return tmp_path
+
+
+def make_wrapper(data_dir: Path) -> DatabaseWrapper:
+    return DatabaseWrapper(data_dir=str(data_dir), config_dir=str(CONFIG_DIR))
+
+
+def files_for(wrapper: DatabaseWrapper, keyword: str) -> set:
+    """Resolve a keyword's posting set to (domain, file_name) pairs."""
+    return {
+        (wrapper.indexed_files[i][0], wrapper.indexed_files[i][1].name)
+        for i in wrapper.keyword_index.get(keyword, ())
+    }
+
+
+class TestPersistentKeywordIndex:
+
+    def test_cold_start_writes_index_file(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.index_file.exists()
+        assert wrapper.index_stats["extracted"] == 2
+
+    def test_no_temp_files_left_behind(self, data_dir):
+        make_wrapper(data_dir)
+        assert list(make_wrapper(data_dir).index_file.parent.glob("*.tmp")) == []
+
+    def test_warm_start_reuses_index(self, data_dir):
+        make_wrapper(data_dir)
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.index_stats == {"reused": 2, "extracted": 0, "removed": 0}
+        assert ("healthcare", "emergency_protocols.json") in files_for(wrapper, "sepsis")
+
+    def test_changed_file_is_reextracted(self, data_dir):
+        make_wrapper(data_dir)
+        target = data_dir / "healthcare" / "emergency_protocols.json"
+        target.write_text(json.dumps({"anaphylaxis": {"steps": ["administer epinephrine"]}}))
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.index_stats["extracted"] == 1
+        assert "epinephrine" in wrapper.keyword_index
+        assert "sepsis" not in wrapper.keyword_index
+
+    def test_touched_but_unchanged_file_not_reextracted(self, data_dir):
+        make_wrapper(data_dir)
+        target = data_dir / "electrical" / "nec_code_essentials.json"
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.index_stats["extracted"] == 0
+
+    def test_deleted_file_removed_from_index(self, data_dir):
+        make_wrapper(data_dir)
+        (data_dir / "healthcare" / "emergency_protocols.json").unlink()
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.index_stats["removed"] == 1
+        assert "sepsis" not in wrapper.keyword_index
+
+    def test_corrupt_index_file_triggers_rebuild(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        wrapper.index_file.write_text("NOT VALID JSON {{{")
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.index_stats["extracted"] == 2
+
+    def test_refresh_index_picks_up_new_file(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        (data_dir / "electrical" / "troubleshooting_diagnostics.json").write_text(
+            json.dumps({"breaker_trips": "check ground fault"})
+        )
+        wrapper.refresh_index()
+        assert wrapper.index_stats["extracted"] == 1
+        assert ("electrical", "troubleshooting_diagnostics.json") in files_for(wrapper, "fault")
+
+
+
+class TestRecordStoreBackedQuery:
+
+    def test_query_reads_sources_from_record_store(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.store_file.exists()
+        assert wrapper.record_store.get("healthcare/emergency_protocols.json")["sepsis"]
+        result = wrapper.query("sepsis antibiotics")
+        assert result.sources[0]["data"] == {"sepsis": {"steps": ["administer antibiotics", "monitor lactate"]}}
+
+    def test_record_store_rebuilt_after_change(self, data_dir):
+        make_wrapper(data_dir)
+        target = data_dir / "healthcare" / "emergency_protocols.json"
+        target.write_text(json.dumps({"sepsis": {"steps": ["fluids"]}}))
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.query("sepsis").sources[0]["data"] == {"sepsis": {"steps": ["fluids"]}}
+
+    def test_each_file_read_once_and_only_changed_files_reread(self, data_dir, monkeypatch):
+        reads = []
+        read_bytes = Path.read_bytes
+        monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self.name) or read_bytes(self))
+        make_wrapper(data_dir)
+        assert sorted(reads) == ["emergency_protocols.json", "nec_code_essentials.json"]
+
+        reads.clear()
+        target = data_dir / "healthcare" / "emergency_protocols.json"
+        target.write_text(json.dumps({"sepsis": {"steps": ["fluids"]}}))
+        wrapper = make_wrapper(data_dir)
+        assert reads == ["emergency_protocols.json"]
+        assert wrapper.record_store.get("electrical/nec_code_essentials.json")["wire_sizing"]
+        assert wrapper.record_store.get("healthcare/emergency_protocols.json") == {"sepsis": {"steps": ["fluids"]}}
+
+    def test_refresh_index_updates_open_record_store(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        (data_dir / "electrical" / "troubleshooting_diagnostics.json").write_text(
+            json.dumps({"breaker_trips": "check ground fault"})
+        )
+        wrapper.refresh_index()
+        assert wrapper.record_store.get("electrical/troubleshooting_diagnostics.json") == {
+            "breaker_trips": "check ground fault"
+        }
+
+
+class TestRouteQuery:
+
+    def test_postings_are_sets_of_file_ids(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        postings = wrapper.keyword_index["sepsis"]
+        assert isinstance(postings, set)
+        assert all(0 <= i < len(wrapper.indexed_files) for i in postings)
+
+    def test_route_query_uses_index(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        matches = wrapper.route_query("sepsis antibiotics", top_k=3)
+        assert matches[0].domain == "healthcare"
+        assert sorted(matches[0].matched_keywords) == ["antibiotics", "sepsis"]
+
+    def test_route_query_skips_unmatched_files(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        matches = wrapper.route_query("sepsis", top_k=3)
+        assert [m.database_file for m in matches] == ["emergency_protocols.json"]
+
+    def test_route_query_no_match_returns_empty(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        assert wrapper.route_query("zzzznonexistentterm") == []
+
+    def test_safety_and_compliance_boosts_applied(self, data_dir):
+        wrapper = make_wrapper(data_dir)
+        base = wrapper.route_query("sepsis antibiotics lactate monitor")[0]
+        boosted = wrapper.route_query("sepsis antibiotics lactate monitor safety code")[0]
+        expected = min(4 / 6 * 1.15 * 1.10, 1.0)
+        assert base.confidence == pytest.approx(1.0)
+        assert boosted.confidence == pytest.approx(expected)
@@ -7,13 +7,16 @@ Run: pytest tests/test_latent_interpolation.py -v
 
 import pytest
 import numpy as np
+import json
+import multiprocessing
 import sys
+from dataclasses import asdict
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from algorithms.latent_interpolation import (
-    EmbeddingGenerator, LatentInterpolator, InterpolationDatabase,
+    EmbeddingGenerator, EmbeddingStore, LatentInterpolator, InterpolationDatabase,
     LatentEntry, InterpolationResult, EMBEDDINGS_DIR
 )
 
@@ -23,8 +26,9 @@ def cleanup_embeddings():
     """Clean up generated embeddings."""
     yield
     if EMBEDDINGS_DIR.exists():
-        for f in EMBEDDINGS_DIR.glob("*.jsonl"):
-            f.unlink()
+        for pattern in ("*.jsonl", "*.f32"):
+            for f in EMBEDDINGS_DIR.glob(pattern):
+                f.unlink()
 
 
 class TestEmbeddingGenerator:
@@ -129,6 +133,49 @@ class TestLatentInterpolator:
         mag_result = np.linalg.norm(result.embedding)
         assert abs(mag_result - mag_a) < mag_a * 0.3  # within 30%
 
+    def batch_pairs(self, n=20, dim=12, seed=0):
+        rng = np.random.default_rng(seed)
+        a = rng.normal(size=(n, dim))
+        b = rng.normal(size=(n, dim))
+        b[0] = a[0] * 2.0   # parallel: LERP fallback
+        b[1] = a[1]         # identical
+        return a, b
+
+    def pairwise(self, a, b, alpha, method="slerp"):
+        entry = lambda v: LatentEntry("e", "music", {}, list(v), "x.json")
+        return np.array(self.interpolator.interpolate(entry(a), entry(b), alpha, method).embedding)
+
+    @pytest.mark.parametrize("method", ["slerp", "lerp"])
+    def test_interpolate_batch_matches_pairwise(self, method):
+        a, b = self.batch_pairs()
+        alphas = np.linspace(0.0, 1.0, len(a))
+        out = self.interpolator.interpolate_batch(a, b, alphas, method=method)
+        assert out.shape == a.shape
+        assert out.dtype == np.float32 and out.flags["C_CONTIGUOUS"]
+        for i in range(len(a)):
+            assert np.allclose(out[i], self.pairwise(a[i], b[i], alphas[i], method), atol=1e-5)
+
+    def test_interpolate_batch_sweep(self):
+        a, b = self.batch_pairs(n=5)
+        sweep = np.array([[0.0, 0.25, 0.5, 0.75, 1.0]])
+        out = self.interpolator.interpolate_batch(a, b, sweep)
+        assert out.shape == (5, 5, a.shape[1])
+        assert out.flags["C_CONTIGUOUS"]
+        assert np.allclose(out[:, 0], a, atol=1e-5)
+        assert np.allclose(out[:, -1], b, atol=1e-5)
+        assert np.allclose(out[3, 2], self.pairwise(a[3], b[3], 0.5), atol=1e-5)
+
+    def test_interpolate_batch_scalar_alpha(self):
+        a, b = self.batch_pairs(n=4)
+        out = self.interpolator.interpolate_batch(a, b, 0.3)
+        assert np.allclose(out[2], self.pairwise(a[2], b[2], 0.3), atol=1e-5)
+
+    def test_interpolate_batch_rejects_mismatched_shapes(self):
+        with pytest.raises(ValueError):
+            self.interpolator.interpolate_batch(np.zeros((3, 4)), np.zeros((3, 5)))
+        with pytest.raises(ValueError):
+            self.interpolator.interpolate_batch(np.zeros((3, 4)), np.zeros((3, 4)), np.zeros((3, 2, 2)))
+
     def test_multi_interpolate_requires_2_or_more_entries(self):
         lofi = self.create_entry("lofi", "lo-fi", 80)
         with pytest.raises(ValueError, match="at least 2"):
@@ -147,6 +194,83 @@ class TestLatentInterpolator:
         assert isinstance(result, InterpolationResult)
 
 
+class TestEmbeddingStore:
+
+    def make_store(self, n=2000, dim=16, clusters=20, seed=0):
+        rng = np.random.default_rng(seed)
+        centers = rng.normal(size=(clusters, dim))
+        vectors = centers[rng.integers(0, clusters, n)] + 0.2 * rng.normal(size=(n, dim))
+        store = EmbeddingStore(capacity=8)
+        store.add_many(LatentEntry(f"e{i}", "music", {"i": i}, v.tolist(), "x.json")
+                       for i, v in enumerate(vectors))
+        return store, vectors
+
+    def brute_force(self, vectors, query, k):
+        sims = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+        return [f"e{i}" for i in np.argsort(-sims, kind="stable")[:k]]
+
+    def test_add_keeps_contiguous_float32_matrix(self):
+        store, vectors = self.make_store(n=100)
+        assert len(store) == 100
+        assert store.matrix.dtype == np.float32 and store.matrix.flags["C_CONTIGUOUS"]
+        assert np.allclose(store.matrix, vectors, atol=1e-6)
+        assert store.get("e7").metadata == {"i": 7}
+        assert "e99" in store and "e100" not in store
+
+    def test_add_existing_id_replaces_vector(self):
+        store, _ = self.make_store(n=10)
+        store.add(LatentEntry("e3", "music", {}, [1.0] * 16, "x.json"))
+        assert len(store) == 10
+        assert np.allclose(store.vector("e3"), 1.0)
+
+    def test_dimension_mismatch_rejected(self):
+        store, _ = self.make_store(n=10)
+        with pytest.raises(ValueError):
+            store.add(LatentEntry("bad", "music", {}, [1.0, 2.0], "x.json"))
+
+    def test_exact_search_matches_brute_force(self):
+        store, vectors = self.make_store()
+        query = np.random.default_rng(5).normal(size=16)
+        assert [i for i, _ in store.search(query, k=10)] == self.brute_force(vectors, query, 10)
+
+    def test_find_similar_excludes_query_entry(self):
+        store, vectors = self.make_store(n=200)
+        results = store.search("e0", k=5)
+        assert len(results) == 5
+        assert "e0" not in [i for i, _ in results]
+        assert [i for i, _ in results] == self.brute_force(vectors, vectors[0], 6)[1:]
+        assert all(a[1] >= b[1] for a, b in zip(results, results[1:]))
+
+    def test_approximate_search_recall(self):
+        store, vectors = self.make_store()
+        store.build_lsh(n_bits=10, n_tables=6)
+        rng = np.random.default_rng(9)
+        hits = 0
+        for row in rng.integers(0, len(vectors), 50):
+            query = vectors[row] + 0.05 * rng.normal(size=16)
+            exact = set(self.brute_force(vectors, query, 10))
+            hits += len(exact & {i for i, _ in store.search(query, k=10, approximate=True)})
+        assert hits / 500 >= 0.8
+
+    def test_approximate_index_covers_later_additions(self):
+        store, _ = self.make_store(n=300)
+        store.build_lsh()
+        store.add(LatentEntry("late", "music", {}, [5.0] * 16, "x.json"))
+        assert store.search(np.full(16, 5.0), k=1, approximate=True)[0][0] == "late"
+
+    def test_small_and_empty_stores(self):
+        assert EmbeddingStore().search([1.0, 0.0], k=3) == []
+        store, _ = self.make_store(n=3)
+        assert len(store.search("e1", k=10)) == 2
+
+
+def save_from_process(writer: int, count: int):
+    db = InterpolationDatabase("music")
+    for i in range(count):
+        value = float(writer * 1000 + i)
+        db.save(InterpolationResult(f"w{writer}_{i}", "a", "b", 0.5, [value] * 16, {}, "2024-01-15"))
+
+
 class TestInterpolationDatabase:
 
     def setup_method(self):
@@ -185,6 +309,14 @@ class TestInterpolationDatabase:
         assert loaded[0].result_id == "test_002"
         assert loaded[0].quality_score == 0.85
 
+    def test_iter_all_streams_and_skips_corrupt(self):
+        self.db.save(InterpolationResult("r1", "a", "b", 0.5, [1.0], {}, "2024-01-15"), quality_score=0.9)
+        with open(self.db.db_file, "a") as f:
+            f.write("CORRUPT\n")
+        stream = self.db.iter_all()
+        assert next(stream).result_id == "r1"
+        assert list(stream) == []
+
     def test_get_high_quality_filters_correctly(self):
         r1 = InterpolationResult("r1", "a", "b", 0.5, [1.0], {}, "2024-01-15")
         r2 = InterpolationResult("r2", "a", "b", 0.5, [1.0], {}, "2024-01-15")
@@ -193,3 +325,76 @@ class TestInterpolationDatabase:
         high_quality = self.db.get_high_quality(min_score=0.7)
         assert len(high_quality) == 1
         assert high_quality[0].result_id == "r1"
+
+    def test_embeddings_stored_outside_jsonl(self):
+        self.db.save(InterpolationResult("r1", "a", "b", 0.5, [0.25, -1.5, 3.0], {}, "2024-01-15"))
+        record = json.loads(self.db.db_file.read_text())
+        assert "embedding" not in record
+        assert (record["embedding_offset"], record["embedding_dim"]) == (0, 3)
+        assert self.db.vector_file.stat().st_size == 3 * 4
+        assert self.db.load_all()[0].embedding == [0.25, -1.5, 3.0]
+
+    def test_embeddings_matrix_and_refresh_after_save(self):
+        for i in range(3):
+            self.db.save(InterpolationResult(f"r{i}", "a", "b", 0.5, [float(i), 1.0], {}, "2024-01-15"))
+        matrix = self.db.embeddings()
+        assert matrix.shape == (3, 2) and matrix.dtype == np.float32
+        self.db.save(InterpolationResult("r3", "a", "b", 0.5, [3.0, 1.0], {}, "2024-01-15"))
+        assert self.db.embeddings()[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    def test_legacy_inline_embedding_lines_still_load(self):
+        legacy = InterpolationResult("old", "a", "b", 0.5, [1.0, 2.0], {}, "2024-01-15", quality_score=0.9)
+        EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
+        self.db.db_file.write_text(json.dumps(asdict(legacy)) + "\n")
+        self.db.save(InterpolationResult("new", "a", "b", 0.5, [3.0, 4.0], {}, "2024-01-15"), quality_score=0.8)
+        assert [(r.result_id, r.embedding) for r in self.db.load_all()] == [("old", [1.0, 2.0]), ("new", [3.0, 4.0])]
+        assert self.db.embeddings().tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+    def test_quality_scores_without_vectors(self):
+        self.db.save(InterpolationResult("r1", "a", "b", 0.5, [1.0], {}, "2024-01-15"), quality_score=0.9)
+        self.db.save(InterpolationResult("r2", "a", "b", 0.5, [1.0], {}, "2024-01-15"))
+        scores = self.db.quality_scores()
+        assert scores[0] == 0.9 and np.isnan(scores[1])
+        assert [r.result_id for r in self.db.get_high_quality(0.0)] == ["r1"]
+
+    def test_truncated_vector_file_skips_record(self):
+        self.db.save(InterpolationResult("r1", "a", "b", 0.5, [1.0, 2.0], {}, "2024-01-15"))
+        self.db.save(InterpolationResult("r2", "a", "b", 0.5, [3.0, 4.0], {}, "2024-01-15"))
+        with open(self.db.vector_file, "r+b") as f:
+            f.truncate(10)
+        assert [r.result_id for r in self.db.load_all()] == ["r1"]
+        with pytest.raises(ValueError):
+            self.db.embeddings()
+        matrix, rows = self.db.embeddings(with_index=True)
+        assert matrix.tolist() == [[1.0, 2.0]] and rows.tolist() == [0]
+
+    def test_embeddings_rows_align_with_quality_scores(self):
+        legacy = InterpolationResult("old", "a", "b", 0.5, [1.0, 2.0], {}, "2024-01-15", quality_score=0.3)
+        EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
+        self.db.db_file.write_text(json.dumps(asdict(legacy)) + "\n")
+        self.db.save(InterpolationResult("new", "a", "b", 0.5, [3.0, 4.0], {}, "2024-01-15"), quality_score=0.8)
+        matrix, rows = self.db.embeddings(with_index=True)
+        scores = self.db.quality_scores()
+        assert scores[rows].tolist() == [0.3, 0.8]
+        assert matrix[scores[rows] > 0.5].tolist() == [[3.0, 4.0]]
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+    def test_concurrent_process_saves_keep_offsets(self):
+        context = multiprocessing.get_context("fork")
+        writers = [context.Process(target=save_from_process, args=(w, 500)) for w in range(4)]
+        for p in writers:
+            p.start()
+        for p in writers:
+            p.join()
+        results = self.db.load_all()
+        assert len(results) == 2000
+        for r in results:
+            writer, i = map(int, r.result_id[1:].split("_"))
+            assert r.embedding == [float(writer * 1000 + i)] * 16
+
+    def test_save_realigns_after_torn_vector_write(self):
+        self.db.save(InterpolationResult("r1", "a", "b", 0.5, [1.0, 2.0], {}, "2024-01-15"))
+        with open(self.db.vector_file, "ab") as f:
+            f.write(b"\x00" * 6)  # crashed mid-save: vector bytes but no metadata line
+        self.db.save(InterpolationResult("r2", "a", "b", 0.5, [5.0, 6.0], {}, "2024-01-15"))
+        assert [(r.result_id, r.embedding) for r in self.db.load_all()] == [("r1", [1.0, 2.0]), ("r2", [5.0, 6.0])]
@@ -0,0 +1,198 @@
+"""
+Tests for algorithms/log_writer.py
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Run: pytest tests/test_log_writer.py -v
+"""
+
+import pytest
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algorithms.log_writer import BufferedLogWriter, csv_line, flush_all, iter_jsonl, iter_lines_reversed
+
+
+def _lines(path: Path) -> list[str]:
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def _append_from_process(path: str, worker: int, n: int):
+    writer = BufferedLogWriter(Path(path), max_lines=7, flush_interval=0, process_safe=True)
+    for i in range(n):
+        writer.write_json({"worker": worker, "i": i, "pad": "x" * 200})
+    writer.flush()
+
+
+class TestBufferedLogWriter:
+
+    def test_default_writes_through(self, tmp_path):
+        writer = BufferedLogWriter(tmp_path / "log.jsonl")
+        writer.write_json({"a": 1})
+        assert json.loads(_lines(tmp_path / "log.jsonl")[0]) == {"a": 1}
+        assert writer.pending == 0
+
+    def test_buffers_until_max_lines(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        writer = BufferedLogWriter(path, max_lines=3, flush_interval=0)
+        writer.write("one")
+        writer.write("two")
+        assert not path.exists()
+        assert writer.pending == 2
+        writer.write("three")
+        assert _lines(path) == ["one", "two", "three"]
+        assert writer.flushes == 1
+        assert writer.lines_written == 3
+
+    def test_flushes_at_max_bytes(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        writer = BufferedLogWriter(path, max_lines=1000, max_bytes=10, flush_interval=0)
+        writer.write("12345")
+        assert not path.exists()
+        writer.write("67890")
+        assert _lines(path) == ["12345", "67890"]
+
+    def test_explicit_flush(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        writer = BufferedLogWriter(path, max_lines=100, flush_interval=0)
+        writer.write("pending")
+        assert writer.flush() == 1
+        assert writer.flush() == 0
+        assert _lines(path) == ["pending"]
+
+    def test_periodic_flush(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        writer = BufferedLogWriter(path, max_lines=100, flush_interval=0.02)
+        writer.write("tick")
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.close()
+        assert _lines(path) == ["tick"]
+
+    def test_flush_all(self, tmp_path):
+        writers = [BufferedLogWriter(tmp_path / f"{i}.log", max_lines=100, flush_interval=0) for i in range(3)]
+        for writer in writers:
+            writer.write("x")
+        flush_all()
+        assert all(_lines(w.path) == ["x"] for w in writers)
+
+    def test_header_written_once_and_after_deletion(self, tmp_path):
+        path = tmp_path / "log.csv"
+        writer = BufferedLogWriter(path, header=csv_line(["a", "b"]))
+        writer.write_row([1, "x,y"])
+        writer.write_row([2, "z"])
+        assert path.read_bytes() == b'a,b\r\n1,"x,y"\r\n2,z\r\n'
+        path.unlink()
+        writer.write_row([3, "w"])
+        assert path.read_bytes() == b"a,b\r\n3,w\r\n"
+
+    def test_shared_returns_one_writer_per_path(self, tmp_path):
+        first = BufferedLogWriter.shared(tmp_path / "s.log", max_lines=5)
+        second = BufferedLogWriter.shared(tmp_path / "." / "s.log", max_lines=1)
+        assert first is second
+        assert second.max_lines == 5
+
+    def test_concurrent_threads_keep_lines_whole(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        writer = BufferedLogWriter(path, max_lines=50, flush_interval=0)
+
+        def append(worker):
+            for i in range(500):
+                writer.write_json({"worker": worker, "i": i})
+
+        threads = [threading.Thread(target=append, args=(w,)) for w in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.flush()
+        records = [json.loads(line) for line in _lines(path)]
+        assert len(records) == 4000
+        for w in range(8):
+            assert [r["i"] for r in records if r["worker"] == w] == list(range(500))
+
+    def test_process_safe_mode_across_processes(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        procs = [
+            multiprocessing.Process(target=_append_from_process, args=(str(path), w, 300))
+            for w in range(4)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+        records = [json.loads(line) for line in _lines(path)]
+        assert len(records) == 1200
+        assert sorted({r["worker"] for r in records}) == [0, 1, 2, 3]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+    def test_forked_child_does_not_rewrite_parent_buffer(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        writer = BufferedLogWriter(path, max_lines=100, flush_interval=0)
+        writer.write("parent")
+        pid = os.fork()
+        if pid == 0:
+            writer.write("child")
+            writer.flush()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        writer.flush()
+        assert sorted(_lines(path)) == ["child", "parent"]
+
+    def test_pending_lines_flushed_at_exit(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1])\n"
+            "from algorithms.log_writer import BufferedLogWriter\n"
+            "BufferedLogWriter(sys.argv[2], max_lines=100, flush_interval=0).write('at exit')\n"
+        )
+        root = str(Path(__file__).parent.parent)
+        subprocess.run([sys.executable, "-c", code, root, str(path)], check=True, cwd=tmp_path)
+        assert _lines(path) == ["at exit"]
+
+
+class TestStreamingReaders:
+
+    def test_iter_jsonl_skips_corrupt_and_blank_lines(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text('{"a": 1}\nnot json\n\n{"a": 2}\n')
+        assert list(iter_jsonl(path)) == [{"a": 1}, {"a": 2}]
+
+    def test_iter_jsonl_missing_file(self, tmp_path):
+        assert list(iter_jsonl(tmp_path / "missing.jsonl")) == []
+
+    def test_iter_jsonl_is_lazy(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text('{"a": 1}\n' * 1000)
+        records = iter_jsonl(path)
+        assert next(records) == {"a": 1}
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 16])
+    def test_reversed_lines_any_chunk_size(self, tmp_path, chunk_size):
+        path = tmp_path / "log.txt"
+        lines = [f"line {i} " + "x" * (i % 11) for i in range(50)]
+        path.write_text("\n".join(lines) + "\n")
+        assert list(iter_lines_reversed(path, chunk_size)) == lines[::-1]
+
+    def test_reversed_lines_without_trailing_newline(self, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_text("first\n\nsecond\nlast")
+        assert list(iter_lines_reversed(path, 4)) == ["last", "second", "first"]
+
+    def test_reversed_lines_missing_or_empty(self, tmp_path):
+        assert list(iter_lines_reversed(tmp_path / "missing")) == []
+        (tmp_path / "empty").write_text("")
+        assert list(iter_lines_reversed(tmp_path / "empty")) == []
+
+    def test_reversed_lines_multibyte_split_across_chunks(self, tmp_path):
+        path = tmp_path / "log.txt"
+        path.write_text("héllo wörld\nünïcode\n", encoding="utf-8")
+        assert list(iter_lines_reversed(path, 2)) == ["ünïcode", "héllo wörld"]
@@ -6,14 +6,21 @@ Run: pytest tests/test_mcp_server.py -v
 """
 
 import pytest
+import asyncio
 import json
 import sys
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from mcp_server.mcp_skill_server import DatabaseConnector, CPOResolver, VerifierAgent
+from mcp_server.mcp_skill_server import (
+    DatabaseConnector, CPOResolver, VerifierAgent, BM25Index, DomainWatcher, ResultCache, ToolExecutor,
+    call_tool, tokenize,
+)
+from mcp_server.record_store import RecordStore
 
 
 # ─── DatabaseConnector Tests ─────────────────────────────────────────────────
@@ -103,6 +110,175 @@ class TestDatabaseConnector:
         assert "records" in stats["test_domain"]
 
 
+# ─── RecordStore Tests ───────────────────────────────────────────────────────
+
+class TestRecordStore:
+
+    RECORDS = [{"title": "Malware"}, ["a", 1], "plain string", {"nested": {"x": [1, 2]}}]
+
+    def test_round_trip(self, tmp_path):
+        with RecordStore.write(tmp_path / "s.records", self.RECORDS) as store:
+            assert len(store) == 4
+            assert list(store) == self.RECORDS
+            assert store[-1] == {"nested": {"x": [1, 2]}}
+            assert store[1:3] == [["a", 1], "plain string"]
+
+    def test_index_out_of_range(self, tmp_path):
+        with RecordStore.write(tmp_path / "s.records", self.RECORDS) as store:
+            with pytest.raises(IndexError):
+                store[4]
+
+    def test_keyed_lookup(self, tmp_path):
+        path = tmp_path / "s.records"
+        with RecordStore.write(path, self.RECORDS[:2], keys=["first", "second"]) as store:
+            assert store.get("second") == ["a", 1]
+            assert store.get("missing") is None
+            assert store.keys() == ["first", "second"]
+
+    def test_empty_store(self, tmp_path):
+        with RecordStore.write(tmp_path / "s.records", []) as store:
+            assert len(store) == 0
+            assert list(store) == []
+
+    def test_open_if_fresh_checks_sources(self, tmp_path):
+        path = tmp_path / "s.records"
+        RecordStore.write(path, self.RECORDS, meta={"sources": {"a.json": [1, 2]}}).close()
+        fresh = RecordStore.open_if_fresh(path, {"a.json": [1, 2]})
+        assert fresh is not None and len(fresh) == 4
+        fresh.close()
+        assert RecordStore.open_if_fresh(path, {"a.json": [1, 3]}) is None
+
+    def test_open_if_fresh_rejects_garbage(self, tmp_path):
+        path = tmp_path / "s.records"
+        path.write_bytes(b"not a record store at all, just some bytes")
+        assert RecordStore.open_if_fresh(path, {}) is None
+        assert RecordStore.open_if_fresh(tmp_path / "missing.records", {}) is None
+
+    def test_retire_waits_for_readers(self, tmp_path):
+        store = RecordStore.write(tmp_path / "s.records", self.RECORDS)
+        assert store.acquire()
+        store.retire()
+        assert store[0] == {"title": "Malware"}  # still readable by the holder
+        assert not store.acquire()
+        store.release()
+        with pytest.raises(ValueError):
+            store[0]
+
+    def test_concurrent_writers_all_succeed(self, tmp_path):
+        path = tmp_path / "s.records"
+        meta = {"sources": {"a.json": [1, 2]}}
+        errors, barrier = [], threading.Barrier(4)
+
+        def write():
+            barrier.wait()
+            try:
+                RecordStore.write(path, self.RECORDS * 200, meta=meta).close()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert list(tmp_path.glob("*.tmp")) == []
+        with RecordStore.open_if_fresh(path, meta["sources"]) as store:
+            assert len(store) == 800
+
+
+class TestDatabaseConnectorRecordStore:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        domain_dir = tmp_path / "data" / "test_domain"
+        domain_dir.mkdir(parents=True)
+        (domain_dir / "record_0.json").write_text(json.dumps({"title": "Malware Detection"}))
+        (domain_dir / "list_records.json").write_text(json.dumps([
+            {"title": "NSL-KDD entry", "attack_type": "dos"},
+            {"title": "Zero-day exploit", "cve": "CVE-2024-9999"},
+        ]))
+        (domain_dir / "bad.json").write_text("NOT VALID JSON {{{")
+        return tmp_path
+
+    def test_store_mode_serves_same_results(self, tmp_db):
+        in_memory = DatabaseConnector(tmp_db / "data")
+        stored = DatabaseConnector(tmp_db / "data", store_dir=tmp_db / "store")
+        assert len(stored.load_domain("test_domain")) == 3
+        assert isinstance(stored.load_domain("test_domain"), RecordStore)
+        for query in ["malware detection", "zero-day exploit", "dos"]:
+            assert stored.query("test_domain", query) == in_memory.query("test_domain", query)
+
+    def test_store_reused_when_sources_unchanged(self, tmp_db):
+        DatabaseConnector(tmp_db / "data", store_dir=tmp_db / "store").load_domain("test_domain")
+        store_file = tmp_db / "store" / "test_domain.records"
+        mtime = store_file.stat().st_mtime_ns
+        DatabaseConnector(tmp_db / "data", store_dir=tmp_db / "store").load_domain("test_domain")
+        assert store_file.stat().st_mtime_ns == mtime
+
+    def test_store_rebuilt_when_source_changes(self, tmp_db):
+        DatabaseConnector(tmp_db / "data", store_dir=tmp_db / "store").load_domain("test_domain")
+        (tmp_db / "data" / "test_domain" / "record_1.json").write_text(json.dumps({"title": "Firewall"}))
+        connector = DatabaseConnector(tmp_db / "data", store_dir=tmp_db / "store")
+        assert len(connector.load_domain("test_domain")) == 4
+        assert connector.query("test_domain", "firewall")[0]["title"] == "Firewall"
+
+    def test_reload_and_invalidate_close_old_store(self, tmp_db):
+        connector = DatabaseConnector(tmp_db / "data", store_dir=tmp_db / "store")
+        first = connector.load_domain("test_domain")
+        connector.reload_domain("test_domain")
+        second = connector.load_domain("test_domain")
+        assert first._mm.closed and not second._mm.closed
+        connector.invalidate("test_domain")
+        assert second._mm.closed
+        assert connector.query("test_domain", "malware")[0]["title"] == "Malware Detection"
+
+
+# ─── BM25Index Tests ─────────────────────────────────────────────────────────
+
+class TestBM25Index:
+
+    RECORDS = [
+        {"title": "Malware Detection", "category": "threat"},
+        {"title": "Malware Malware Analysis", "notes": ["sandbox detonation"]},
+        {"title": "Firewall Rules", "category": "defense", "ports": [22, 443]},
+        {"title": "Phishing Patterns", "category": "social engineering threat"},
+    ]
+
+    def test_tokenize_splits_keys_and_punctuation(self):
+        assert tokenize("PE_ratio: 28.5") == ["pe", "ratio", "28", "5"]
+
+    def test_search_returns_only_candidates(self):
+        index = BM25Index(self.RECORDS)
+        doc_ids = [doc_id for _, doc_id in index.search("firewall", top_k=10)]
+        assert doc_ids == [2]
+
+    def test_search_ranks_rare_terms_higher(self):
+        index = BM25Index(self.RECORDS)
+        # "detection" appears once in the corpus, "threat" twice
+        best_score, best_id = index.search("detection threat", top_k=1)[0]
+        assert best_id == 0
+        assert best_score > 0
+
+    def test_term_frequency_boosts_score(self):
+        index = BM25Index(self.RECORDS)
+        results = index.search("malware", top_k=2)
+        assert [doc_id for _, doc_id in results] == [1, 0]
+
+    def test_search_indexes_nested_values(self):
+        index = BM25Index(self.RECORDS)
+        assert [doc_id for _, doc_id in index.search("443")] == [2]
+        assert [doc_id for _, doc_id in index.search("sandbox")] == [1]
+
+    def test_search_respects_top_k(self):
+        index = BM25Index(self.RECORDS)
+        assert len(index.search("malware threat firewall phishing", top_k=2)) == 2
+
+    def test_empty_index(self):
+        index = BM25Index([])
+        assert index.search("anything") == []
+
+
 # ─── CPOResolver Tests ───────────────────────────────────────────────────────
 
 class TestCPOResolver:
@@ -225,6 +401,418 @@ class TestVerifierAgent:
         assert result["passed"] is True
 
 
+# ─── ToolExecutor Tests ──────────────────────────────────────────────────────
+
+class SlowConnector(DatabaseConnector):
+    """Connector whose queries block long enough to overlap concurrent calls."""
+
+    def __init__(self, db_root):
+        super().__init__(db_root)
+        self.calls = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def query(self, domain, query, top_k=3):
+        with self._lock:
+            self.calls += 1
+            self.threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        return super().query(domain, query, top_k)
+
+
+class TestToolExecutor:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        domain_dir = tmp_path / "finance"
+        domain_dir.mkdir()
+        (domain_dir / "aapl.json").write_text(json.dumps({"ticker": "AAPL", "pe_ratio": 28.5}))
+        (domain_dir / "msft.json").write_text(json.dumps({"ticker": "MSFT", "pe_ratio": 33.1}))
+        return tmp_path
+
+    def test_identical_concurrent_queries_coalesced(self, tmp_db):
+        connector = SlowConnector(tmp_db)
+        tools = ToolExecutor(connector, VerifierAgent(), max_workers=4)
+
+        async def run():
+            return await asyncio.gather(*[tools.query("finance", "AAPL", 3) for _ in range(10)])
+
+        results = asyncio.run(run())
+        tools.shutdown()
+        assert connector.calls == 1
+        assert tools.stats == {"executed": 1, "coalesced": 9}
+        assert all(r == results[0] for r in results)
+        assert results[0][0]["ticker"] == "AAPL"
+
+    def test_distinct_queries_run_in_worker_threads(self, tmp_db):
+        connector = SlowConnector(tmp_db)
+        tools = ToolExecutor(connector, VerifierAgent(), max_workers=4)
+
+        async def run():
+            return await asyncio.gather(
+                tools.query("finance", "AAPL", 3),
+                tools.query("finance", "MSFT", 3),
+                tools.query("finance", "AAPL", 1),
+            )
+
+        aapl, msft, aapl_top1 = asyncio.run(run())
+        tools.shutdown()
+        assert connector.calls == 3
+        assert msft[0]["ticker"] == "MSFT"
+        assert len(aapl_top1) == 1
+        assert all(name.startswith("mcp-worker") for name in connector.threads)
+
+    def test_sequential_calls_not_coalesced(self, tmp_db):
+        tools = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2)
+
+        async def run():
+            await tools.query("finance", "AAPL", 3)
+            await tools.query("finance", "AAPL", 3)
+
+        asyncio.run(run())
+        tools.shutdown()
+        assert tools.stats["executed"] == 2
+
+    def test_call_tool_query_returns_resolved_json(self, tmp_db):
+        tools = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2)
+        text = asyncio.run(call_tool("query_expert_db", {"domain": "finance", "query": "AAPL"}, tools, ResultCache()))
+        tools.shutdown()
+        resolved = json.loads(text)
+        assert resolved["source"] == "expert_database"
+        assert "AAPL" in resolved["answer"]
+
+    def test_call_tool_verify_output(self, tmp_db):
+        tools = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2)
+        text = asyncio.run(call_tool("verify_output", {"output": "rm -rf /", "domain": "finance"}, tools, ResultCache()))
+        tools.shutdown()
+        assert json.loads(text)["passed"] is False
+
+    def test_call_tool_unknown_tool_raises(self, tmp_db):
+        tools = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2)
+        with pytest.raises(ValueError):
+            asyncio.run(call_tool("no_such_tool", {}, tools, ResultCache()))
+
+    def test_process_pool_matches_thread_pool(self, tmp_db):
+        threads = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2)
+        processes = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2, use_processes=True)
+
+        async def run(tools):
+            return await tools.query("finance", "MSFT pe ratio", 2)
+
+        try:
+            assert asyncio.run(run(processes)) == asyncio.run(run(threads))
+        finally:
+            threads.shutdown()
+            processes.shutdown()
+
+    def test_process_pool_store_compiled_once_under_concurrent_queries(self, tmp_db):
+        for i in range(200):
+            (tmp_db / "finance" / f"t{i}.json").write_text(json.dumps({"ticker": f"T{i}", "pe_ratio": i}))
+        store_dir = tmp_db / "store"
+        expected = DatabaseConnector(tmp_db)
+        tools = ToolExecutor(DatabaseConnector(tmp_db, store_dir=store_dir), VerifierAgent(),
+                             max_workers=4, use_processes=True)
+        queries = [f"T{i} pe ratio" for i in range(8)]
+
+        async def run():
+            tools.warm_up()
+            return await asyncio.gather(*[tools.query("finance", q, 2) for q in queries])
+
+        try:
+            results = asyncio.run(run())
+        finally:
+            tools.shutdown()
+        assert results == [expected.query("finance", q, 2) for q in queries]
+        # No temp files left behind by writers that raced on the compile
+        assert sorted(p.name for p in store_dir.iterdir()) == ["finance.records", "finance.records.lock"]
+
+
+# ─── ResultCache Tests ───────────────────────────────────────────────────────
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResultCache:
+
+    def test_key_normalizes_query(self):
+        assert ResultCache.make_key("finance", "AAPL  PE ratio?", 3) == \
+            ResultCache.make_key("finance", "ratio pe aapl", 3)
+        assert ResultCache.make_key("finance", "AAPL", 3) != ResultCache.make_key("finance", "AAPL", 5)
+
+    def test_hit_and_miss_counters(self):
+        cache = ResultCache()
+        assert cache.get(("d", "q", 3)) is None
+        cache.put(("d", "q", 3), "text")
+        assert cache.get(("d", "q", 3)) == "text"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put(("d", "a", 3), "A")
+        cache.put(("d", "b", 3), "B")
+        cache.get(("d", "a", 3))          # a is now most recently used
+        cache.put(("d", "c", 3), "C")
+        assert cache.get(("d", "b", 3)) is None
+        assert cache.get(("d", "a", 3)) == "A"
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResultCache(ttl_seconds=10, clock=clock)
+        cache.put(("d", "q", 3), "text")
+        clock.now = 9.9
+        assert cache.get(("d", "q", 3)) == "text"
+        clock.now = 10.0
+        assert cache.get(("d", "q", 3)) is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_invalidate_domain_only(self):
+        cache = ResultCache()
+        cache.put(("a", "q", 3), "A")
+        cache.put(("b", "q", 3), "B")
+        cache.invalidate("a")
+        assert cache.get(("a", "q", 3)) is None
+        assert cache.get(("b", "q", 3)) == "B"
+
+    def test_stale_put_after_invalidation_dropped(self):
+        cache = ResultCache()
+        generation = cache.generation("a")
+        cache.invalidate("a")
+        cache.put(("a", "q", 3), "stale", generation)
+        assert cache.get(("a", "q", 3)) is None
+
+    def test_zero_size_disables_cache(self):
+        cache = ResultCache(max_entries=0)
+        cache.put(("d", "q", 3), "text")
+        assert cache.get(("d", "q", 3)) is None
+
+
+class TestCachedQueryTool:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        domain_dir = tmp_path / "finance"
+        domain_dir.mkdir()
+        (domain_dir / "aapl.json").write_text(json.dumps({"ticker": "AAPL", "pe_ratio": 28.5}))
+        return tmp_path
+
+    def _query(self, tools, cache, query="AAPL pe"):
+        args = {"domain": "finance", "query": query, "top_k": 3}
+        return json.loads(asyncio.run(call_tool("query_expert_db", args, tools, cache)))
+
+    def test_repeated_query_served_from_cache(self, tmp_db):
+        connector = SlowConnector(tmp_db)
+        tools = ToolExecutor(connector, VerifierAgent(), max_workers=2)
+        cache = ResultCache()
+        first = self._query(tools, cache)
+        second = self._query(tools, cache, query="pe  aapl")
+        tools.shutdown()
+        assert first == second
+        assert connector.calls == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_file_change_invalidates_domain(self, tmp_db):
+        connector = DatabaseConnector(tmp_db, change_check_interval=0.0)
+        tools = ToolExecutor(connector, VerifierAgent(), max_workers=2)
+        cache = ResultCache()
+        assert "28.5" in self._query(tools, cache)["answer"]
+        (tmp_db / "finance" / "aapl.json").write_text(json.dumps({"ticker": "AAPL", "pe_ratio": 131.25}))
+        answer = self._query(tools, cache)["answer"]
+        tools.shutdown()
+        assert "131.25" in answer
+        assert cache.stats()["invalidations"] == 1
+
+    def test_process_pool_query_tool(self, tmp_db):
+        tools = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2, use_processes=True)
+        try:
+            assert "28.5" in self._query(tools, ResultCache())["answer"]
+        finally:
+            tools.shutdown()
+
+    def test_process_pool_sees_change_detected_by_main_process(self, tmp_db):
+        # Workers rate-limit their own checks (1 s); the main process checks every call
+        tools = ToolExecutor(DatabaseConnector(tmp_db, change_check_interval=0.0), VerifierAgent(),
+                             max_workers=1, use_processes=True)
+        cache = ResultCache()
+        try:
+            assert "28.5" in self._query(tools, cache)["answer"]
+            (tmp_db / "finance" / "aapl.json").write_text(json.dumps({"ticker": "AAPL", "pe_ratio": 131.25}))
+            assert "131.25" in self._query(tools, cache)["answer"]
+            assert "131.25" in self._query(tools, cache)["answer"]  # and the cached copy is fresh too
+        finally:
+            tools.shutdown()
+
+    def test_process_pool_sees_watcher_reload(self, tmp_db):
+        connector = DatabaseConnector(tmp_db, change_check_interval=0.0)
+        tools = ToolExecutor(connector, VerifierAgent(), max_workers=1, use_processes=True)
+        watcher = DomainWatcher(connector, domains=["finance"])
+        try:
+            watcher.poll_once()
+            assert asyncio.run(tools.query("finance", "AAPL", 1))[0]["pe_ratio"] == 28.5
+            (tmp_db / "finance" / "aapl.json").write_text(json.dumps({"ticker": "AAPL", "pe_ratio": 131.25}))
+            assert watcher.poll_once() == ["finance"]
+            assert asyncio.run(tools.query("finance", "AAPL", 1))[0]["pe_ratio"] == 131.25
+        finally:
+            tools.shutdown()
+
+    def test_get_db_stats_reports_cache_counters(self, tmp_db):
+        import mcp_server.mcp_skill_server as srv
+        tools = ToolExecutor(DatabaseConnector(tmp_db), VerifierAgent(), max_workers=2)
+        cache = ResultCache()
+        self._query(tools, cache)
+        self._query(tools, cache)
+        original = srv.DOMAINS
+        srv.DOMAINS = ["finance"]
+        try:
+            stats = json.loads(asyncio.run(call_tool("get_db_stats", {}, tools, cache)))
+        finally:
+            srv.DOMAINS = original
+            tools.shutdown()
+        assert stats["result_cache"]["hits"] == 1
+        assert stats["result_cache"]["misses"] == 1
+        assert stats["finance"]["records"] == 1
+
+
+class TestDatabaseConnectorChangeDetection:
+
+    def test_unchanged_domain_not_invalidated(self, tmp_path):
+        (tmp_path / "d").mkdir()
+        (tmp_path / "d" / "a.json").write_text('{"k": "v"}')
+        connector = DatabaseConnector(tmp_path, change_check_interval=0.0)
+        records = connector.load_domain("d")
+        assert connector.check_for_changes("d") is False
+        assert connector.load_domain("d") is records
+
+    def test_added_file_detected(self, tmp_path):
+        (tmp_path / "d").mkdir()
+        (tmp_path / "d" / "a.json").write_text('{"k": "v"}')
+        connector = DatabaseConnector(tmp_path, change_check_interval=0.0)
+        connector.load_domain("d")
+        (tmp_path / "d" / "b.json").write_text('{"k": "w"}')
+        assert connector.check_for_changes("d") is True
+        assert len(connector.load_domain("d")) == 2
+
+    def test_checks_rate_limited(self, tmp_path):
+        (tmp_path / "d").mkdir()
+        (tmp_path / "d" / "a.json").write_text('{"k": "v"}')
+        connector = DatabaseConnector(tmp_path, change_check_interval=3600)
+        connector.load_domain("d")
+        connector.check_for_changes("d")
+        (tmp_path / "d" / "b.json").write_text('{"k": "w"}')
+        assert connector.check_for_changes("d") is False
+
+
+class SlowBuildConnector(DatabaseConnector):
+    """Connector whose domain builds block until released, to overlap a reload with queries."""
+
+    def __init__(self, db_root):
+        super().__init__(db_root, change_check_interval=0.0)
+        self.release = threading.Event()
+        self.building = threading.Event()
+        self.block = False
+
+    def _build_domain(self, domain):
+        if self.block:
+            self.building.set()
+            self.release.wait(5)
+        return super()._build_domain(domain)
+
+
+class TestWarmUpAndHotReload:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        for domain, ticker in [("finance", "AAPL"), ("music", "jazz"), ("video", "codec")]:
+            (tmp_path / domain).mkdir()
+            (tmp_path / domain / "a.json").write_text(json.dumps({"name": ticker, "value": 1}))
+        return tmp_path
+
+    def test_warm_up_loads_domains_concurrently(self, tmp_db):
+        connector = DatabaseConnector(tmp_db)
+        futures = connector.warm_up(["finance", "music", "video"])
+        assert [len(f.result(5)) for f in futures.values()] == [1, 1, 1]
+        assert connector.get_stats()["finance"]["loaded"]
+
+    def test_warm_up_tolerates_missing_domain(self, tmp_db):
+        futures = DatabaseConnector(tmp_db).warm_up(["finance", "nope"])
+        assert futures["nope"].result(5) == []
+
+    def test_reload_swaps_without_touching_old_records(self, tmp_db):
+        connector = DatabaseConnector(tmp_db)
+        old = connector.load_domain("finance")
+        (tmp_db / "finance" / "b.json").write_text(json.dumps({"name": "MSFT"}))
+        connector.reload_domain("finance")
+        assert len(old) == 1
+        assert connector.query("finance", "MSFT")[0]["name"] == "MSFT"
+
+    def test_queries_not_blocked_during_reload(self, tmp_db):
+        connector = SlowBuildConnector(tmp_db)
+        connector.load_domain("finance")
+        (tmp_db / "finance" / "a.json").write_text(json.dumps({"name": "AAPL", "value": 22}))
+        connector.block = True
+        reloader = threading.Thread(target=connector.check_for_changes, args=("finance", True))
+        reloader.start()
+        assert connector.building.wait(5)
+        start = time.perf_counter()
+        during = connector.query("finance", "AAPL")
+        elapsed = time.perf_counter() - start
+        connector.release.set()
+        reloader.join(5)
+        assert elapsed < 1.0
+        assert during[0]["value"] == 1
+        assert connector.query("finance", "AAPL")[0]["value"] == 22
+
+    def test_check_with_reload_keeps_domain_loaded(self, tmp_db):
+        connector = DatabaseConnector(tmp_db, change_check_interval=0.0)
+        connector.load_domain("finance")
+        (tmp_db / "finance" / "b.json").write_text(json.dumps({"name": "MSFT"}))
+        assert connector.check_for_changes("finance", reload=True) is True
+        assert connector.get_stats()["finance"]["loaded"]
+        assert len(connector.load_domain("finance")) == 2
+
+
+class TestDomainWatcher:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        (tmp_path / "finance").mkdir()
+        (tmp_path / "finance" / "a.json").write_text(json.dumps({"name": "AAPL"}))
+        return tmp_path
+
+    def test_poll_once_reports_changed_domains(self, tmp_db):
+        connector = DatabaseConnector(tmp_db, change_check_interval=0.0)
+        changed = []
+        watcher = DomainWatcher(connector, ["finance"], on_change=changed.append)
+        assert watcher.poll_once() == []
+        (tmp_db / "finance" / "b.json").write_text(json.dumps({"name": "MSFT"}))
+        assert watcher.poll_once() == ["finance"]
+        assert changed == ["finance"]
+        assert watcher.reloads == 1
+
+    def test_background_thread_swaps_in_changes(self, tmp_db):
+        connector = DatabaseConnector(tmp_db, change_check_interval=0.0)
+        connector.load_domain("finance")
+        cache = ResultCache()
+        watcher = DomainWatcher(connector, ["finance"], interval=0.01, on_change=cache.invalidate).start()
+        try:
+            assert watcher.running
+            (tmp_db / "finance" / "b.json").write_text(json.dumps({"name": "MSFT"}))
+            deadline = time.monotonic() + 5
+            while watcher.reloads == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop(5)
+        assert not watcher.running
+        assert connector.query("finance", "MSFT")[0]["name"] == "MSFT"
+        assert cache.generation("finance") == (0, 1)
+
+
 # ─── Integration Tests ───────────────────────────────────────────────────────
 
 class TestIntegration:
@@ -0,0 +1,152 @@
+"""
+Tests for algorithms/nsl_kdd.py
+DRAFT ALPHA — REQUIRES TESTING AND ITERATION
+
+Run: pytest tests/test_nsl_kdd.py -v
+"""
+
+import pytest
+import csv
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algorithms.nsl_kdd import (
+    KDD_FEATURES, KDD_TEST_FILE, NUMERIC_COLUMNS, load_kdd, anomaly_scores,
+    attack_profiles, profile_anomalies, profile_signature, signatures_from_dataset
+)
+
+
+KDD_FILE = Path(__file__).parent.parent / KDD_TEST_FILE
+
+
+def kdd_row(protocol="tcp", service="http", flag="SF", src_bytes=200, count=2, serror=0.0,
+            label="normal", difficulty=21):
+    values = [0, protocol, service, flag, src_bytes] + [0] * 17 + [count, count, serror] + [0.0] * 16
+    return ",".join(str(v) for v in values + [label, difficulty])
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    rows = [kdd_row(src_bytes=200 + i, count=2 + i % 3) for i in range(20)]
+    rows += [kdd_row(service="private", flag="S0", src_bytes=0, count=250, serror=1.0, label="neptune")
+             for _ in range(8)]
+    rows += [kdd_row(protocol="icmp", service="eco_i", src_bytes=8, count=1, label="ipsweep")] * 3
+    path = tmp_path / "kdd.txt"
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+class TestLoadKDD:
+
+    def test_columns_typed_and_encoded(self, sample_file):
+        kdd = load_kdd(sample_file)
+        assert len(kdd) == 31
+        assert kdd.numeric.shape == (31, len(NUMERIC_COLUMNS))
+        assert kdd.numeric.dtype == np.float64
+        assert list(kdd.vocab["label"]) == ["ipsweep", "neptune", "normal"]
+        assert kdd.codes["label"].dtype == np.int32
+        assert kdd.column("label")[0] == "normal"
+        assert kdd.column("src_bytes")[1] == 201.0
+        assert kdd.difficulty[0] == 21
+
+    def test_matches_csv_module(self, sample_file):
+        kdd = load_kdd(sample_file)
+        with open(sample_file) as f:
+            rows = list(csv.reader(f))
+        for i, name in enumerate(KDD_FEATURES):
+            expected = [r[i] for r in rows]
+            if name in kdd.codes:
+                assert list(kdd.column(name)) == expected
+            else:
+                assert np.array_equal(kdd.column(name), np.array(expected, dtype=float))
+
+    def test_row_text_roundtrip(self, sample_file):
+        kdd = load_kdd(sample_file)
+        fields = kdd.row_text(21).split(",")
+        assert fields[1:4] == ["tcp", "private", "S0"]
+        assert fields[-2:] == ["neptune", "21"]
+        assert [float(v) for v in fields[22:25]] == [250.0, 250.0, 1.0]
+
+    def test_row_text_keeps_large_and_fractional_values(self, tmp_path):
+        path = tmp_path / "kdd.txt"
+        path.write_text(kdd_row(src_bytes=1234567, serror=0.05) + "\n")
+        fields = load_kdd(path).row_text(0).split(",")
+        assert fields[4] == "1234567"
+        assert fields[24] == "0.05"
+
+    def test_kdd99_format_without_difficulty(self, tmp_path):
+        path = tmp_path / "kdd99.txt"
+        path.write_text(kdd_row(label="normal.").rsplit(",", 1)[0] + "\n")
+        kdd = load_kdd(path)
+        assert kdd.difficulty is None
+        assert list(kdd.vocab["label"]) == ["normal"]
+
+    def test_wrong_width_rejected(self, tmp_path):
+        path = tmp_path / "bad.txt"
+        path.write_text("1,2,3\n")
+        with pytest.raises(ValueError):
+            load_kdd(path)
+
+
+class TestProfiles:
+
+    def test_attacks_score_above_normal(self, sample_file):
+        kdd = load_kdd(sample_file)
+        scores = anomaly_scores(kdd)
+        labels = kdd.column("label")
+        assert scores.min() >= 0.0 and scores.max() <= 1.0
+        assert scores[labels == "neptune"].min() > scores[labels == "normal"].max()
+
+    def test_scores_require_baseline(self, sample_file):
+        with pytest.raises(ValueError):
+            anomaly_scores(load_kdd(sample_file), baseline="missing")
+
+    def test_profiles_match_per_group_numpy(self, sample_file):
+        kdd = load_kdd(sample_file)
+        profiles = {p.label: p for p in attack_profiles(kdd)}
+        neptune_rows = kdd.numeric[kdd.column("label") == "neptune"]
+        profile = profiles["neptune"]
+        assert profile.count == 8
+        assert np.allclose(profile.mean, neptune_rows.mean(axis=0))
+        assert np.allclose(profile.std, neptune_rows.std(axis=0))
+        assert (profile.protocol, profile.service, profile.flag) == ("tcp", "private", "S0")
+        assert profile.attack_class == "dos"
+        assert profile.detection_rate == 1.0
+        assert "serror_rate" in profile.top_features(profiles["normal"])
+
+    def test_profiles_by_attack_class(self, sample_file):
+        profiles = {p.label: p for p in attack_profiles(load_kdd(sample_file), by="attack_class")}
+        assert set(profiles) == {"dos", "normal", "probe"}
+        assert profiles["probe"].protocol == "icmp"
+
+    def test_profile_anomalies_are_top_scoring_network_rows(self, sample_file):
+        kdd = load_kdd(sample_file)
+        scores = anomaly_scores(kdd)
+        profile = next(p for p in attack_profiles(kdd, scores=scores) if p.label == "neptune")
+        anomalies = profile_anomalies(kdd, profile, scores, limit=3)
+        assert len(anomalies) == 3
+        assert all(a.source == "network" and a.features["label"] == "neptune" for a in anomalies)
+        assert anomalies[0].features["protocol"] == "TCP"
+
+    def test_signatures_skip_normal_and_small_groups(self, sample_file):
+        kdd = load_kdd(sample_file)
+        signatures = signatures_from_dataset(kdd, min_count=5)
+        assert [s.name for s in signatures] == ["kdd_dos_neptune"]
+        assert signatures[0].rule_type == "snort"
+        assert "classtype:attempted-dos" in signatures[0].rule_text
+
+    def test_normal_profile_has_no_signature(self, sample_file):
+        normal = next(p for p in attack_profiles(load_kdd(sample_file)) if p.label == "normal")
+        assert profile_signature(normal, sid=1) is None
+
+
+@pytest.mark.skipif(not KDD_FILE.exists(), reason="NSL-KDD test set not present")
+def test_shipped_kdd_test_set():
+    kdd = load_kdd(KDD_FILE)
+    assert len(kdd) == 22544
+    assert "neptune" in kdd.vocab["label"]
+    signatures = signatures_from_dataset(kdd)
+    assert any(s.name == "kdd_dos_neptune" for s in signatures)
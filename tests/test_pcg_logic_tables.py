@@ -6,14 +6,19 @@ Run: pytest tests/test_pcg_logic_tables.py -v
 """
 
 import pytest
+import json
+import sqlite3
+import random
 import sys
+import numpy as np
+from dataclasses import asdict
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from algorithms.pcg_logic_tables import (
-    LogicTable, LogicRule, PlatformerLevelGenerator,
-    LootGenerator, PCGDatabase, GeneratedAsset, LOGIC_TABLES_DIR
+    LogicTable, LogicRule, IntervalIndex, PlatformerLevelGenerator,
+    LootGenerator, PCGDatabase, GeneratedAsset, LOGIC_TABLES_DIR, PLATFORM_DTYPE
 )
 
 
@@ -22,8 +27,9 @@ def cleanup_pcg():
     """Clean up generated PCG files."""
     yield
     if LOGIC_TABLES_DIR.exists():
-        for f in LOGIC_TABLES_DIR.glob("*.json*"):
-            f.unlink()
+        for pattern in ("*.json*", "*.sqlite*"):
+            for f in LOGIC_TABLES_DIR.glob(pattern):
+                f.unlink()
 
 
 class TestLogicTable:
@@ -80,6 +86,87 @@ class TestLogicTable:
         assert table2.rules[0].rule_id == "r1"
 
 
+def random_rules(n: int, seed: int = 0) -> list[LogicRule]:
+    rng = random.Random(seed)
+    conditions = [
+        lambda: ("difficulty", rng.choice(["easy", "medium", "hard"])),
+        lambda: ("biome", rng.choice(["forest", "cave", "desert", "sky"])),
+        lambda: ("level", {"min": (low := rng.randint(0, 40)), "max": low + rng.randint(0, 20)}),
+        lambda: ("score", {"min": rng.uniform(0, 1)}),
+        lambda: ("tags", rng.choice([["boss"], ["boss", "night"]])),  # unhashable: checked per rule
+        lambda: ("score", float("nan")),
+    ]
+    rules = []
+    for i in range(n):
+        condition = dict(rng.choice(conditions)() for _ in range(rng.randint(0, 3)))
+        rules.append(LogicRule(f"r{i}", "test", condition, {}, priority=rng.randint(0, 5)))
+    return rules
+
+
+class TestRuleIndex:
+
+    def brute_force(self, table, context):
+        return [r for r in table.rules if table._conditions_met(r.condition, context)]
+
+    def test_matches_per_rule_scan_in_priority_order(self):
+        table = LogicTable("test_domain")
+        table.add_rules(random_rules(500))
+        rng = random.Random(1)
+        for _ in range(300):
+            context = {"difficulty": rng.choice(["easy", "hard", "expert"]), "level": rng.randint(-5, 70)}
+            if rng.random() < 0.5:
+                context["biome"] = rng.choice(["forest", "cave", "ocean"])
+            if rng.random() < 0.5:
+                context["score"] = rng.choice([rng.random(), 1])
+            if rng.random() < 0.3:
+                context["tags"] = rng.choice([["boss"], ["night"]])
+            assert table.match(context) == self.brute_force(table, context)
+
+    def test_add_rules_equals_repeated_add_rule(self):
+        rules = random_rules(200, seed=3)
+        one_by_one, bulk = LogicTable("a"), LogicTable("b")
+        for rule in rules:
+            one_by_one.add_rule(rule)
+        bulk.add_rules(rules)
+        assert [r.rule_id for r in bulk.rules] == [r.rule_id for r in one_by_one.rules]
+
+    def test_equal_priority_keeps_insertion_order(self):
+        table = LogicTable("test_domain")
+        for i in range(3):
+            table.add_rule(LogicRule(f"r{i}", "test", {"x": 1}, {}, priority=5))
+        assert [r.rule_id for r in table.match({"x": 1})] == ["r0", "r1", "r2"]
+
+    def test_index_follows_rule_list_changes(self):
+        table = LogicTable("test_domain")
+        table.add_rule(LogicRule("r1", "test", {"x": 1}, {}))
+        assert len(table.match({"x": 1})) == 1
+        table.rules.append(LogicRule("r2", "test", {"x": 1}, {}))
+        assert len(table.match({"x": 1})) == 2
+        table.rules[1] = LogicRule("r3", "test", {"x": 1}, {})
+        assert [r.rule_id for r in table.match({"x": 1})] == ["r1", "r3"]
+        table.rules = [LogicRule("r4", "test", {"x": 1}, {})]
+        assert [r.rule_id for r in table.match({"x": 1})] == ["r4"]
+        table.rules.extend([LogicRule("r1", "test", {"x": 1}, {}), LogicRule("r2", "test", {"x": 1}, {})])
+        del table.rules[0]
+        table.rules[0].condition = {"x": 2}
+        table.invalidate()
+        assert [r.rule_id for r in table.match({"x": 1})] == ["r2"]
+
+    def test_non_numeric_value_never_in_numeric_range(self):
+        table = LogicTable("test_domain")
+        table.add_rule(LogicRule("r1", "test", {"score": {"min": 1, "max": 5}}, {}))
+        assert table.match({"score": "high"}) == []
+        assert len(table.match({"score": 5})) == 1
+
+    def test_interval_index_stab(self):
+        rng = random.Random(2)
+        spans = [(low := rng.uniform(0, 100), low + rng.uniform(0, 30), i) for i in range(400)]
+        spans.append((float("-inf"), 10.0, 400))
+        index = IntervalIndex(spans)
+        for x in [rng.uniform(-10, 140) for _ in range(200)] + [spans[0][0], spans[0][1]]:
+            assert sorted(index.stab(x)) == [i for low, high, i in spans if low <= x <= high]
+
+
 class TestPlatformerLevelGenerator:
 
     def setup_method(self):
@@ -125,6 +212,61 @@ class TestPlatformerLevelGenerator:
         assert len(level.properties["platforms"]) > 0
 
 
+class TestGenerateMany:
+
+    def setup_method(self):
+        self.gen = PlatformerLevelGenerator()
+
+    def test_levels_follow_rule_layout(self):
+        batch = self.gen.generate_many("hard", length=60, n=50, seed=3)
+        assert len(batch) == 50
+        assert batch.elements["platforms"].dtype == PLATFORM_DTYPE
+        for i in range(len(batch)):
+            level = batch.level(i)
+            platforms = level["platforms"]
+            assert platforms["x"][0] == 0 and platforms["x"][-1] < 60
+            gaps = np.diff(platforms["x"]) - platforms["length"][:-1]
+            assert gaps.min() >= 4 and gaps.max() <= 7  # hard platform_spacing
+            assert ((platforms["length"] >= 3) & (platforms["length"] <= 6)).all()
+            assert len(level["enemies"]) == int(60 * 0.6 / 10)
+            assert len(level["hazards"]) == 60 // 15
+            assert len(level["collectibles"]) == 0
+
+    def test_dict_format_matches_generate(self):
+        batch = self.gen.generate_many("hard", length=50, n=2, seed=1)
+        level = batch.to_dict(1)
+        expected = self.gen.generate("hard", length=50).properties
+        assert level.keys() == expected.keys()
+        for kind in ("platforms", "enemies", "hazards"):
+            assert level[kind][0].keys() == expected[kind][0].keys()
+            assert all(type(v) is type(expected[kind][0][k]) for k, v in level[kind][0].items())
+        assert level["requires_precise_jumps"] is True
+
+    def test_reproducible_per_level_and_across_workers(self):
+        full = self.gen.generate_many("easy", length=80, n=12, seed=42)
+        prefix = self.gen.generate_many("easy", length=80, n=5, seed=42)
+        parallel = self.gen.generate_many("easy", length=80, n=12, seed=42, workers=2)
+        assert [full.to_dict(i) for i in range(5)] == [prefix.to_dict(i) for i in range(5)]
+        assert all(np.array_equal(full.elements[k], parallel.elements[k]) for k in full.elements)
+        other = self.gen.generate_many("easy", length=80, n=12, seed=43)
+        assert not np.array_equal(full.elements["platforms"], other.elements["platforms"])
+
+    def test_unseeded_batch_records_its_seed(self):
+        batch = self.gen.generate_many("easy", length=40, n=3)
+        again = self.gen.generate_many("easy", length=40, n=3, seed=batch.seed)
+        assert np.array_equal(batch.elements["enemies"], again.elements["enemies"])
+
+    def test_unknown_difficulty_uses_default_layout(self):
+        batch = self.gen.generate_many("medium", length=30, n=4, seed=0)
+        assert batch.rules_applied == ["default"]
+        assert batch.to_dict(3) == self.gen.generate("medium", length=30).properties
+
+    def test_to_assets(self):
+        assets = self.gen.generate_many("hard", length=30, n=3, seed=7).to_assets()
+        assert len({a.asset_id for a in assets}) == 3
+        assert all(a.asset_type == "level" and "hard_platformer" in a.rules_applied for a in assets)
+
+
 class TestLootGenerator:
 
     def setup_method(self):
@@ -166,6 +308,9 @@ class TestPCGDatabase:
     def setup_method(self):
         self.db = PCGDatabase()
 
+    def teardown_method(self):
+        self.db.close()
+
     def test_save_creates_file(self):
         asset = GeneratedAsset(
             asset_id="test_001",
@@ -206,3 +351,56 @@ class TestPCGDatabase:
         high_quality = self.db.get_high_quality(min_score=0.7)
         assert len(high_quality) == 1
         assert high_quality[0].asset_id == "a1"
+
+    def test_save_many_and_filtered_queries(self, tmp_path):
+        db = PCGDatabase(tmp_path / "assets.sqlite")
+        assets = [GeneratedAsset(f"a{i}", "level" if i % 2 else "loot", "platformer" if i % 3 else "rpg",
+                                 {"i": i}, [f"rule{i}"], "2024-01-15", quality_score=i / 10 if i % 4 else None)
+                  for i in range(10)]
+        assert db.save_many(assets) == 10
+        assert db.count() == 10
+        assert [a.asset_id for a in db.iter_assets(asset_type="level", batch_size=2)] == ["a1", "a3", "a5", "a7", "a9"]
+        assert [a.asset_id for a in db.get_high_quality(0.5, genre="platformer")] == ["a5", "a7"]
+        assert db.count(asset_type="loot", min_score=0.0) == 2  # a2, a6 (a0, a4, a8 unrated)
+        assert db.load_all()[3].properties == {"i": 3}
+        assert [a.asset_id for a in db.best(3)] == ["a9", "a7", "a6"]
+
+    def test_page_walks_all_matches(self, tmp_path):
+        db = PCGDatabase(tmp_path / "assets.sqlite")
+        db.save_many(GeneratedAsset(f"a{i}", "level", "platformer", {}, [], "2024-01-15", quality_score=0.8)
+                     for i in range(7))
+        seen, cursor = [], 0
+        while cursor is not None:
+            page, cursor = db.page(min_score=0.7, limit=3, after=cursor)
+            seen += [a.asset_id for a in page]
+        assert seen == [f"a{i}" for i in range(7)]
+
+    def test_page_exact_multiple_has_no_empty_last_page(self, tmp_path):
+        with PCGDatabase(tmp_path / "assets.sqlite") as db:
+            db.save_many(GeneratedAsset(f"a{i}", "level", "platformer", {}, [], "2024-01-15") for i in range(6))
+            first, cursor = db.page(limit=3)
+            second, cursor2 = db.page(limit=3, after=cursor)
+            assert [a.asset_id for a in first + second] == [f"a{i}" for i in range(6)]
+            assert cursor is not None and cursor2 is None
+
+    def test_page_edges(self, tmp_path):
+        with PCGDatabase(tmp_path / "assets.sqlite") as db:
+            assert db.page() == ([], None)
+            db.save(GeneratedAsset("a0", "level", "platformer", {}, [], "2024-01-15"))
+            assert db.page(genre="rpg", limit=1) == ([], None)
+            with pytest.raises(ValueError):
+                db.page(limit=0)
+
+    def test_context_manager_closes_connection(self, tmp_path):
+        with PCGDatabase(tmp_path / "assets.sqlite") as db:
+            db.save(GeneratedAsset("a0", "level", "platformer", {}, [], "2024-01-15"))
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.count()
+
+    def test_imports_legacy_jsonl_once(self, tmp_path):
+        legacy = GeneratedAsset("old", "loot", "rpg", {"damage": 5}, ["boss_loot"], "2024-01-15", quality_score=0.9)
+        (tmp_path / "assets.jsonl").write_text(json.dumps(asdict(legacy)) + "\nCORRUPT\n")
+        db = PCGDatabase(tmp_path / "assets.sqlite")
+        assert db.load_all() == [legacy]
+        db.close()
+        assert PCGDatabase(tmp_path / "assets.sqlite").count() == 1
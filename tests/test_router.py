@@ -11,7 +11,9 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from algorithms.router_agent import RouterAgent, TemporalAttentionAgent, RouteDecision, DOMAIN_KEYWORDS
+from algorithms.router_agent import (
+    RouterAgent, TemporalAttentionAgent, RouteDecision, DOMAIN_KEYWORDS, KeywordAutomaton
+)
 
 
 class TestRouterAgent:
@@ -103,6 +105,57 @@ class TestRouterAgent:
         assert set(DOMAIN_KEYWORDS.keys()) == expected
 
 
+class TestKeywordAutomaton:
+
+    def test_scan_matches_substring_semantics(self):
+        automaton = KeywordAutomaton(DOMAIN_KEYWORDS)
+        queries = [
+            "detect a malware phishing attack via Falco intrusion log",
+            "jazz chord for a game soundtrack",
+            "blogging about stockings",
+            "",
+        ]
+        for query in queries:
+            q = query.lower()
+            expected = {
+                d: [kw for kw in kws if kw in q]
+                for d, kws in DOMAIN_KEYWORDS.items() if any(kw in q for kw in kws)
+            }
+            assert automaton.scan(query) == expected
+
+    def test_overlapping_and_prefix_keywords(self):
+        automaton = KeywordAutomaton({"a": ["stock", "st"], "b": ["tock", "ock"]})
+        assert automaton.scan("STOCK") == {"a": ["stock", "st"], "b": ["tock", "ock"]}
+
+    def test_shared_keyword_hits_every_domain(self):
+        automaton = KeywordAutomaton({"a": ["attack"], "b": ["sprite", "attack"]})
+        assert automaton.scan("sprite attack") == {"a": ["attack"], "b": ["sprite", "attack"]}
+
+    def test_empty_keyword_table(self):
+        assert KeywordAutomaton({}).scan("anything") == {}
+
+    def test_custom_keywords_router(self):
+        router = RouterAgent({"weather": ["rain", "snow"], "sports": ["goal"]})
+        assert router.route("will it snow or rain").domain == "weather"
+
+
+class TestRouteBatch:
+
+    def setup_method(self):
+        self.router = RouterAgent()
+
+    def test_batch_matches_single_route(self):
+        queries = ["malware attack", "PE ratio for AAPL stock", "malware attack", "xyzzy"]
+        assert self.router.route_batch(queries) == [self.router.route(q) for q in queries]
+
+    def test_batch_preserves_order_and_length(self):
+        decisions = self.router.route_batch(["jazz chord", "youtube hook", "jazz chord"])
+        assert [d.domain for d in decisions] == ["music", "video", "music"]
+
+    def test_empty_batch(self):
+        assert self.router.route_batch([]) == []
+
+
 class TestTemporalAttentionAgent:
 
     def setup_method(self):
@@ -6,14 +6,16 @@ Run: pytest tests/test_weak_to_strong.py -v
 """
 
 import pytest
+import json
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from algorithms.weak_to_strong import (
-    WeakModel, WeakLabelValidator, WeakToStrongPipeline,
-    WeakLabel, StrongTrainingExample, SupervisionStats, SUPERVISION_DIR
+    WeakModel, WeakLabelValidator, WeakToStrongPipeline, LabelingRules, RULES_FILENAME, LABELING_RULES_FILE,
+    load_labeling_rules,
+    WeakLabel, StrongTrainingExample, SupervisionStats, SupervisionCounters, SUPERVISION_DIR
 )
 
 
@@ -79,6 +81,73 @@ class TestWeakModel:
         assert clear.weak_confidence > unclear.weak_confidence
 
 
+class TestLabelingRules:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        return tmp_path
+
+    def test_label_batch_matches_label(self, tmp_db):
+        inputs = {
+            "finance": ["PE ratio is 50", "price 12.5 then 99", "Pe of 30", "no metrics here", "PRICE?",
+                        "two\nlines pe 45"],
+            "cybersecurity": ["unpatched updates", "EXPLOIT and Malware", "secure exploit", "", "scan\nmalware"],
+            "music": ["anything"],
+        }
+        for domain, texts in inputs.items():
+            model = WeakModel(domain, tmp_db)
+            expected = [model.label(t) for t in texts]
+            batch = model.label_batch(texts)
+            assert [(b.input_text, b.weak_prediction, b.weak_confidence, b.reasoning) for b in batch] == \
+                   [(e.input_text, e.weak_prediction, e.weak_confidence, e.reasoning) for e in expected]
+
+    def test_keywords_count_as_substrings(self, tmp_db):
+        label = WeakModel("cybersecurity", tmp_db).label("unpatched updates")
+        assert (label.weak_prediction, label.reasoning) == ("safe", "Safe keywords detected: 2")
+        assert label.weak_confidence == pytest.approx(0.8)
+
+    def test_rules_loaded_from_domain_json(self, tmp_db):
+        (tmp_db / "healthcare").mkdir()
+        (tmp_db / "healthcare" / RULES_FILENAME).write_text(json.dumps({
+            "keywords": {"vitals": ["heart rate", "bpm"]},
+            "numbers": r"\d+",
+            "thresholds": {"tachycardia": 100},
+            "rules": [
+                {"if": {"keywords": "vitals", "number_gt": "tachycardia"},
+                 "label": "tachycardia", "confidence": 0.9, "reasoning": "Rate {number} above {tachycardia}"},
+                {"if": {"keywords": "vitals"}, "label": "normal_rate",
+                 "confidence": {"base": 0.5, "per_match": 0.2, "keywords": "vitals", "max": 0.85},
+                 "reasoning": "{vitals} vitals terms"},
+            ],
+        }))
+        model = WeakModel("healthcare", tmp_db)
+        high, normal, other = model.label_batch(["Heart rate 130 bpm", "heart rate 70 BPM", "cough"])
+        assert (high.weak_prediction, high.reasoning) == ("tachycardia", "Rate 130.0 above 100")
+        assert (normal.weak_prediction, normal.weak_confidence) == ("normal_rate", 0.85)
+        assert (other.weak_prediction, other.reasoning) == ("unknown", "Generic labeling - no domain rules")
+
+    def test_shipped_rules_file_covers_existing_domains(self):
+        domains, generic = load_labeling_rules(LABELING_RULES_FILE)
+        assert {"finance", "cybersecurity"} <= set(domains)
+        for spec in [*domains.values(), generic]:
+            LabelingRules(spec)
+
+    def test_rules_attribute_keeps_original_shape(self, tmp_db):
+        model = WeakModel("cybersecurity", tmp_db)
+        assert model.rules["finance"]["pe_threshold"] == 30
+        assert model.rules["cybersecurity"]["threat_keywords"] == ["exploit", "malware", "vulnerability"]
+        assert model.rules["cybersecurity"]["safe_keywords"] == ["update", "patch", "secure"]
+
+    @pytest.mark.parametrize("rule", [
+        {"if": {"sentiment": "positive"}, "label": "x", "confidence": 0.5, "reasoning": ""},
+        {"if": {"keywords": "missing_group"}, "label": "x", "confidence": 0.5, "reasoning": ""},
+        {"if": {"number_gt": "missing_threshold"}, "label": "x", "confidence": 0.5, "reasoning": ""},
+    ])
+    def test_invalid_rules_rejected_at_load(self, rule):
+        with pytest.raises(ValueError):
+            LabelingRules({"keywords": {"g": ["a"]}, "rules": [rule]})
+
+
 class TestWeakLabelValidator:
 
     @pytest.fixture
@@ -196,3 +265,70 @@ class TestWeakToStrongPipeline:
         pipeline.process_batch(["test1"])
         pipeline.process_batch(["test2", "test3"])
         assert len(pipeline.training_examples) == 3
+
+
+STREAM_INPUTS = [
+    "PE ratio is 50", "unknown query xyz", "PE ratio is 12", "Should I buy?",
+    "price target 80", "PE is 31.5", "What is ROE?",
+] * 5
+
+
+class TestProcessStream:
+
+    @pytest.fixture
+    def tmp_db(self, tmp_path):
+        return tmp_path
+
+    def exported(self, path):
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_matches_process_batch_export(self, tmp_db):
+        batch = WeakToStrongPipeline("finance", tmp_db)
+        batch.process_batch(STREAM_INPUTS)
+        expected = self.exported(batch.export_training_set(min_quality=0.7))
+
+        stream = WeakToStrongPipeline("finance", tmp_db)
+        stats = stream.process_stream(iter(STREAM_INPUTS), output_file=tmp_db / "out.jsonl", chunk_size=3)
+        assert self.exported(tmp_db / "out.jsonl") == expected
+        expected_stats = batch.get_stats()
+        assert (stats.total_examples, stats.weak_labels_verified) == (35, expected_stats.weak_labels_verified)
+        assert stats.avg_quality_score == pytest.approx(expected_stats.avg_quality_score)
+        assert stream.training_examples == []
+
+    def test_reads_inputs_from_file(self, tmp_db):
+        source = tmp_db / "inputs.txt"
+        source.write_text("PE ratio is 50\n\nPE ratio is 40\n")
+        pipeline = WeakToStrongPipeline("finance", tmp_db)
+        stats = pipeline.process_stream(source, output_file=tmp_db / "out.jsonl")
+        assert stats.total_examples == 2
+        assert [r["input"] for r in self.exported(tmp_db / "out.jsonl")] == ["PE ratio is 50", "PE ratio is 40"]
+
+    def test_str_path_is_read_as_file(self, tmp_db):
+        source = tmp_db / "inputs.txt"
+        source.write_text("PE ratio is 50\nPE ratio is 40\n")
+        pipeline = WeakToStrongPipeline("finance", tmp_db)
+        stats = pipeline.process_stream(str(source), output_file=tmp_db / "out.jsonl")
+        assert stats.total_examples == 2
+
+    def test_process_pool_keeps_input_order(self, tmp_db):
+        serial = WeakToStrongPipeline("finance", tmp_db)
+        serial.process_stream(STREAM_INPUTS, output_file=tmp_db / "serial.jsonl", min_quality=0.0)
+        parallel = WeakToStrongPipeline("finance", tmp_db)
+        stats = parallel.process_stream(STREAM_INPUTS, output_file=tmp_db / "parallel.jsonl",
+                                        min_quality=0.0, workers=2, chunk_size=4)
+        assert self.exported(tmp_db / "parallel.jsonl") == self.exported(tmp_db / "serial.jsonl")
+        assert stats.total_examples == len(STREAM_INPUTS)
+
+    def test_get_stats_covers_batches_and_streams(self, tmp_db):
+        pipeline = WeakToStrongPipeline("finance", tmp_db)
+        pipeline.process_batch(["PE ratio is 50"])
+        stream_stats = pipeline.process_stream(["PE ratio is 40", "xyz"], output_file=tmp_db / "out.jsonl")
+        assert stream_stats.total_examples == 2
+        stats = pipeline.get_stats()
+        assert (stats.total_examples, stats.weak_labels_verified) == (3, 2)
+        assert stats.avg_weak_confidence == pytest.approx((0.85 + 0.85 + 0.30) / 3)
+
+    def test_empty_counters_give_zero_stats(self):
+        stats = SupervisionCounters().to_stats("finance")
+        assert (stats.total_examples, stats.verification_rate, stats.avg_quality_score) == (0, 0.0, 0.0)
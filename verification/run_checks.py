@@ -246,14 +246,16 @@ class VerificationRunner:
         try:
             from algorithms.router_agent import RouterAgent
             router = RouterAgent()
-            start = time.perf_counter()
+            query = "detect a malware phishing attack via Falco intrusion log"
             for _ in range(100):
-                router.route("detect a malware phishing attack via Falco intrusion log")
-            elapsed = (time.perf_counter() - start) * 1000  # ms for 100 calls
-            per_call = elapsed / 100
-            if per_call < 5:
-                return {"passed": True, "message": f"Router latency: {per_call:.2f}ms/call ✓"}
-            return {"passed": False, "message": f"Router latency: {per_call:.2f}ms/call — too slow (>5ms)"}
+                router.route(query)  # warm-up
+            start = time.perf_counter()
+            for _ in range(10000):
+                router.route(query)
+            per_call = (time.perf_counter() - start) * 1e6 / 10000  # µs per call
+            if per_call < 50:
+                return {"passed": True, "message": f"Router latency: {per_call:.1f}µs/call ✓"}
+            return {"passed": False, "message": f"Router latency: {per_call:.1f}µs/call — too slow (>50µs)"}
         except Exception as e:
             return {"passed": False, "message": str(e)}
 
@@ -357,7 +359,7 @@ class VerificationRunner:
                 ("JSON files loadable", self.check_data_files_loadable),
             ]),
             ("Performance", [
-                ("Router latency <5ms", self.check_cpo_latency),
+                ("Router latency <50µs", self.check_cpo_latency),
             ]),
         ]
 